@@ -9,9 +9,16 @@ from torch import nn, Tensor
 from torchvision import transforms  # type: ignore
 
 
-def read_keypoint_images(csv_name: str = "val.csv") -> List[ndarray]:
+def decode_portrait(img_str: str) -> ndarray:
+    """Decodes a portrait from its pixel string in the csv."""
+    img: ndarray = np.array([int(item) for item in img_str.split()]).reshape((96, 96))
+    return np.expand_dims(img, axis=2).astype(np.uint8)
+
+
+def read_portrait_strings(csv_name: str = "val.csv") -> List[str]:
     """
-    Reads portraits from supplied csv.
+    Reads the pixel strings of the portraits from supplied csv, see
+    decode_portrait.
 
     Parameters
     ----------
@@ -20,19 +27,12 @@ def read_keypoint_images(csv_name: str = "val.csv") -> List[ndarray]:
 
     Returns
     -------
-    list of portraits
+    list of pixel strings
     """
-    images: List[ndarray] = []
     csv_file = Path(__file__).parent / csv_name
     key_pts_frame = pd.read_csv(csv_file)
     key_pts_frame.dropna(inplace=True)
-    key_pts_frame.reset_index(drop=True, inplace=True)
-    for idx in range(key_pts_frame.shape[0]):
-        img_str = key_pts_frame.loc[idx]["Image"]
-        img: ndarray = np.array([int(item) for item in img_str.split()]).reshape((96, 96))
-        image: ndarray = np.expand_dims(img, axis=2).astype(np.uint8)
-        images.append(image)
-    return images
+    return key_pts_frame["Image"].tolist()
 
 
 class KeypointModel(nn.Module):
@@ -74,3 +74,11 @@ class KeypointModel(nn.Module):
         """Process the image with the neural network, and convert the result to coordinates of
         15 keypoints."""
         return torch.squeeze(self(img).detach()).view(15, 2)
+
+    def predict_batch(self, imgs: List[ndarray]) -> List[Tensor]:
+        """Process a batch of images with the neural network in a single forward pass, and
+        convert each result to coordinates of 15 keypoints."""
+        x: Tensor = torch.stack([self.transform(img) for img in imgs])
+        with torch.no_grad():
+            keypoints: Tensor = self.model(x).view(-1, 15, 2)
+        return list(keypoints)
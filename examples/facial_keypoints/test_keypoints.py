@@ -1,20 +1,21 @@
 import logging
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional
 import uuid
 import torch
 import numpy as np
 import cv2  # type: ignore
 import albumentations  # type: ignore
 import matplotlib.pyplot as plt  # type: ignore
-import pytest
 from numpy import ndarray
 from torch import Tensor
 from torchvision import transforms  # type: ignore
 
-from .keypoint_detection import read_keypoint_images, KeypointModel
+from .keypoint_detection import decode_portrait, read_portrait_strings, KeypointModel
 from metamorphic_test import transformation, relation, metamorphic, system, randomized
 from metamorphic_test.generators import RandInt, RandFloat
+from metamorphic_test.source import Dataset
+from metamorphic_test.visualization import VisualizationService
 
 contrast = metamorphic("contrast")
 brightness = metamorphic("brightness")
@@ -153,6 +154,10 @@ def error_is_small(x: Tensor, y: Tensor) -> bool:
     return loss < 0.002
 
 
+def save_gray_image(path: str, image: Tensor) -> None:
+    plt.imsave(path, image, cmap="gray")
+
+
 class KeypointVisualizer:
     """
     Visualizer class for the keypoint prediction.
@@ -174,6 +179,9 @@ class KeypointVisualizer:
         self.first_is_next: bool = True
         self.logger: logging.Logger = logging.getLogger(__name__)
         self.logger.addHandler(logging.StreamHandler())
+        # input images are named by their content and written in the background
+        self.report_images = VisualizationService("assets")
+        self.webapp_images = VisualizationService("assets/img", url_prefix="../img")
 
     def logexception_geterrorstring(self, e: Exception) -> str:
         self.logger.error(e)
@@ -193,9 +201,8 @@ class KeypointVisualizer:
         html string that refers to the saved image
         """
         image = self.prepare_input_visual(image)
-        path: str = str(Path("assets") / f"img{uuid.uuid4()}.png")
         try:
-            plt.imsave(path, image, cmap="gray")
+            path: str = self.report_images.submit(image, ".png", save_gray_image, name="img")
         except Exception as e:
             return self.logexception_geterrorstring(e)
         return f"<img src='{path}' width='100' height='100'>"
@@ -214,13 +221,9 @@ class KeypointVisualizer:
         html string that refers to the saved image
         """
         image = self.prepare_input_visual(image)
-        image_name: str = f"img{uuid.uuid4()}.png"
-        base_dir: Path = Path("assets/img")  # for web app
-        base_dir.mkdir(parents=True, exist_ok=True)
-        write_path: Path = base_dir / image_name
-        read_path: Path = Path("../img") / image_name
         try:
-            plt.imsave(write_path, image, cmap="gray")
+            read_path: str = self.webapp_images.submit(
+                image, ".png", save_gray_image, name="img")
         except Exception as e:
             return self.logexception_geterrorstring(e)
         return f"<img src='{read_path}' width='100' height='100'>"
@@ -315,13 +318,17 @@ class KeypointVisualizer:
 
 
 # setup
-test_images: List[ndarray] = read_keypoint_images()
+# each portrait is decoded when a test needs it
+test_images: Dataset[str, ndarray] = Dataset(read_portrait_strings(), decode_portrait)
 visualizer: KeypointVisualizer = KeypointVisualizer()
 predictor_under_test: KeypointModel = KeypointModel()
 
 
-@pytest.mark.parametrize("image", test_images)
-@system(visualize_input=visualizer.vis_input_app, visualize_output=visualizer.vis_output_app)
+@system(
+    source=test_images,
+    visualize_input=visualizer.vis_input_app,
+    visualize_output=visualizer.vis_output_app,
+)
 def test_keypoint_predictor(image: ndarray) -> Tensor:
     """Predict the facial keypoints of a portrait"""
     return predictor_under_test.predict(image)
@@ -1,5 +1,4 @@
 import numpy as np
-import pytest
 
 from metamorphic_test import (
     transformation,
@@ -9,6 +8,7 @@ from metamorphic_test import (
 )
 from metamorphic_test.generators import RandInt
 from metamorphic_test.relations import is_less_than, approximately, or_
+from metamorphic_test.source import Dataset
 
 from .house_pricing import (
     HousingPricePredictor,
@@ -37,11 +37,8 @@ def transform(x, increase_rooms_by: int) -> np.ndarray:
     return copy
 
 
-@pytest.mark.parametrize(
-    'x',
-    [test_set.iloc[n:n+1] for n in range(20)],
-)
-@system(HousePriceTest)
+# each row is sliced from the test set when its execution needs it
+@system(HousePriceTest, source=Dataset(range(20), lambda n: test_set.iloc[n:n+1]))
 def test_house_pricing_more_rooms(x) -> float:
     assert all(x["total_rooms"] % 1 == 0)
     return p.predict(x).item()
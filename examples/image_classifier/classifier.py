@@ -12,9 +12,11 @@ import torch.nn.functional as fun
 import torchvision as tv  # type: ignore
 
 
-def read_traffic_signs(rootpath: str = "data/") -> List[ndarray]:
+def read_traffic_sign_paths(rootpath: str = "data/") -> List[Path]:
     """
-    Reads traffic sign pictures for German Traffic Sign Recognition Benchmark.
+    Reads the paths of the traffic sign pictures for German Traffic Sign
+    Recognition Benchmark. The pictures themselves are not read, e.g. to decode
+    each one when a test needs it.
 
     Parameters
     ----------
@@ -23,9 +25,9 @@ def read_traffic_signs(rootpath: str = "data/") -> List[ndarray]:
 
     Returns
     -------
-    list of images
+    list of image paths
     """
-    images: List[ndarray] = []  # images
+    paths: List[Path] = []  # image files
 
     data_dir: Path = Path(__file__).parent / rootpath
     prefix: Path = data_dir / "GTSRB" / "Final_Test" / "Images"
@@ -37,8 +39,8 @@ def read_traffic_signs(rootpath: str = "data/") -> List[ndarray]:
         next(gt_reader)  # skip header
         # loop over all images in current annotations file
         for row in gt_reader:
-            images.append(plt.imread(prefix / row[0]))  # the 0th column is the filename
-    return images
+            paths.append(prefix / row[0])  # the 0th column is the filename
+    return paths
 
 
 class TrafficSignClassifier(nn.Module):
@@ -135,3 +137,15 @@ class TrafficSignClassifier(nn.Module):
         tensor_img: Tensor = self.input_preprocessing_pipeline(img)[None, :]
         logits: Tensor = self(tensor_img)
         return fun.softmax(logits, dim=1).max(dim=1)[1].item()
+
+    def evaluate_images(self, imgs: List[ndarray]) -> List[int]:
+        """
+        Process a batch of images with the neural network in a single forward pass,
+        and return the most likely class of each image.
+        """
+        tensor_imgs: Tensor = torch.stack(
+            [self.input_preprocessing_pipeline(img) for img in imgs]
+        )
+        with torch.no_grad():
+            logits: Tensor = self(tensor_imgs)
+        return fun.softmax(logits, dim=1).max(dim=1)[1].tolist()
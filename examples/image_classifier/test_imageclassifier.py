@@ -1,20 +1,18 @@
 import logging
 from pathlib import Path
-from typing import List, Dict
-import uuid
+from typing import Dict
 
 import numpy as np
 import cv2  # type: ignore
 import albumentations  # type: ignore
 import matplotlib.pyplot as plt  # type: ignore
-import pytest
 
 # mypy complains that cv2 (and torchvision) has no stubs / not PEP 561-compliant
 # thus is skipped. Same with matplotlib in classifier. Should we ignore?
 # more info: https://mypy.readthedocs.io/en/stable/running_mypy.html#missing-imports
 from numpy import ndarray
 
-from .classifier import read_traffic_signs, TrafficSignClassifier
+from .classifier import read_traffic_sign_paths, TrafficSignClassifier
 
 from metamorphic_test import (
     transformation,
@@ -25,6 +23,8 @@ from metamorphic_test import (
 )
 from metamorphic_test.generators import RandInt, RandFloat
 from metamorphic_test.relations import equality
+from metamorphic_test.source import Dataset
+from metamorphic_test.visualization import VisualizationService
 
 brightness = metamorphic("brightness", relation=equality)
 contrast = metamorphic("contrast", relation=equality)
@@ -150,8 +150,8 @@ def album_gamma(image: ndarray, limit: int = 101) -> ndarray:
     return image_transform(image=image)["image"]
 
 
-@transformation(equalize)
-@transformation(pair)
+@transformation(equalize, deterministic=True)
+@transformation(pair, deterministic=True)
 def album_equalize(image: ndarray) -> ndarray:
     image_transform = albumentations.Equalize(p=1)
     return image_transform.apply(image)
@@ -214,14 +214,14 @@ def album_blur(image: ndarray, kernel_size: int = 3) -> ndarray:
     return image_transform.apply(image)
 
 
-@transformation(horizontal_flip)
-@transformation(pair)
+@transformation(horizontal_flip, deterministic=True)
+@transformation(pair, deterministic=True)
 def album_horizonflip(image: ndarray) -> ndarray:
     image_transform = albumentations.HorizontalFlip(p=1)
     return image_transform.apply(image)
 
 
-@transformation(vertical_flip)
+@transformation(vertical_flip, deterministic=True)
 def album_verticalflip(image: ndarray) -> ndarray:
     image_transform = albumentations.VerticalFlip(p=1)
     return image_transform.apply(image)
@@ -247,9 +247,13 @@ class ExceptionLogger:
 
 
 # setup
-test_images: List[ndarray] = read_traffic_signs()
+# each image is decoded when a test needs it
+test_images: Dataset[Path, ndarray] = Dataset(read_traffic_sign_paths(), plt.imread)
 classifier_under_test: TrafficSignClassifier = TrafficSignClassifier()
 e_log: ExceptionLogger = ExceptionLogger()
+# images are named by their content and written in the background
+report_images = VisualizationService("assets")
+webapp_images = VisualizationService("assets/img", url_prefix="../img")  # for web app
 
 
 def visualize_input(image: ndarray) -> str:
@@ -265,9 +269,8 @@ def visualize_input(image: ndarray) -> str:
     -------
     html string that refers to the saved image
     """
-    path: str = str(Path("assets") / f"img{uuid.uuid4()}.png")
     try:
-        plt.imsave(path, image)
+        path: str = report_images.submit(image, ".png", plt.imsave, name="img")
     except Exception as e:
         return e_log.logexception_geterrorstring(e)
     return f"<img src='{path}' width='50' height='50'>"
@@ -286,13 +289,8 @@ def visualize_input_webapp(image: ndarray) -> str:
     -------
     html string that refers to the saved image
     """
-    image_name: str = f"img{uuid.uuid4()}.png"
-    base_dir: Path = Path("assets/img")  # for web app
-    base_dir.mkdir(parents=True, exist_ok=True)
-    write_path: Path = base_dir / image_name
-    read_path: Path = Path("../img") / image_name
     try:
-        plt.imsave(write_path, image)
+        read_path: str = webapp_images.submit(image, ".png", plt.imsave, name="img")
     except Exception as e:
         return e_log.logexception_geterrorstring(e)
     return f"<img src='{read_path}' width='50' height='50'>"
@@ -318,8 +316,12 @@ def visualize_output(label: int) -> str:
     return LABEL_NAMES.get(label, f"unknown: {label}")
 
 
-@pytest.mark.parametrize("image", test_images)
-@system(visualize_input=visualize_input_webapp, visualize_output=visualize_output)
+@system(
+    deterministic=True,
+    source=test_images,
+    visualize_input=visualize_input_webapp,
+    visualize_output=visualize_output,
+)
 def test_image_classifier(image: ndarray) -> int:
     """Predict the traffic sign in an image"""
     return classifier_under_test.evaluate_image(image)
@@ -3,10 +3,11 @@ from pathlib import Path
 import soundfile  # type: ignore
 import matplotlib.pyplot as plt  # type: ignore
 import numpy as np
-import uuid
 import torch
 from typing import Union
 
+from metamorphic_test.visualization import VisualizationService
+
 
 class AudioVisualizer:
     def __init__(self, sampling_rate, base_dir):
@@ -14,6 +15,9 @@ class AudioVisualizer:
         self.base_dir = base_dir
         self.task_name = self.base_dir.split(os.sep)[-1]  # to know whether task is stt or aec
         Path(self.base_dir).mkdir(parents=True, exist_ok=True)
+        # one worker thread, as the plots use the state of pyplot
+        self.assets = VisualizationService(
+            self.base_dir, url_prefix=os.path.join("..", self.task_name))
 
     def save_spectrogram_plot(self, audio: np.ndarray, path: str) -> None:
         """
@@ -109,21 +113,15 @@ class AudioVisualizer:
                 html code in string format to inject the audio related plots to the html report
 
         """
-        audio_id = str(uuid.uuid4())  # nosec
-        path_spec = os.path.join(self.base_dir, f"spec_{audio_id}.png")  # nosec
-        retrieve_path_spec = os.path.join("..", self.task_name, f"spec_{audio_id}.png")
-        path_waveform = os.path.join(self.base_dir, f"wavf_{audio_id}.png")  # nosec
-        retrieve_path_waveform = os.path.join(
-            "..", self.task_name, f"wavf_{audio_id}.png")  # nosec
-        path_audio = os.path.join(self.base_dir, f"aud_{audio_id}.wav")  # nosec
-        retrieve_path_audio = os.path.join(
-            "..", self.task_name, f"aud_{audio_id}.wav")  # nosec
-
         if torch.is_tensor(audio):
             audio = audio.squeeze().cpu().numpy()  # type: ignore
-        self.save_spectrogram_plot(audio, path_spec)  # type: ignore
-        self.save_waveform_plot(audio, path_waveform)  # type: ignore
-        self.save_audio(audio, path_audio)  # type: ignore
+        # the files are named by the content and written in the background
+        retrieve_path_spec = self.assets.submit(
+            audio, ".png", lambda path, a: self.save_spectrogram_plot(a, path), name="spec")
+        retrieve_path_waveform = self.assets.submit(
+            audio, ".png", lambda path, a: self.save_waveform_plot(a, path), name="wavf")
+        retrieve_path_audio = self.assets.submit(
+            audio, ".wav", lambda path, a: self.save_audio(a, path), name="aud")
 
         inner_html = f"""
             <table style="display: block">
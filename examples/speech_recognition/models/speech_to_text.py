@@ -1,6 +1,8 @@
+from collections import defaultdict
+
 import numpy as np
 import torch
-from typing import Union
+from typing import Dict, List, Union
 
 
 class SpeechToText:
@@ -23,7 +25,8 @@ class SpeechToText:
             device=self.device
         )
 
-    def recognize(self, audio: Union[torch.Tensor, np.ndarray]) -> str:
+    @staticmethod
+    def _prepare_audio(audio: Union[torch.Tensor, np.ndarray]) -> torch.Tensor:
         if audio.ndim == 1:
             audio = audio.reshape(1, -1)
         else:
@@ -36,9 +39,31 @@ class SpeechToText:
             assert isinstance(audio, np.ndarray), "input audio must be of type " \
                                                   "numpy.ndarray or torch.Tensor."
             audio = torch.from_numpy(audio)
+        return audio  # type: ignore
+
+    def recognize(self, audio: Union[torch.Tensor, np.ndarray]) -> str:
+        audio = self._prepare_audio(audio)
 
         intermediate = self.model(audio).squeeze(0)
 
         recognized_text = self.decoder(intermediate.cpu())
 
         return recognized_text
+
+    def recognize_batch(self, audios: List[Union[torch.Tensor, np.ndarray]]) -> List[str]:
+        """
+        Recognizes a batch of audios with one forward pass per audio length. Audios
+        are not padded, since padding changes the transcripts: the text of an audio
+        must not depend on the other audios of its batch.
+        """
+        prepared = [self._prepare_audio(audio).squeeze(0) for audio in audios]
+        by_length: Dict[int, List[int]] = defaultdict(list)
+        for index, audio in enumerate(prepared):
+            by_length[audio.shape[0]].append(index)
+        texts: List[str] = [''] * len(prepared)
+        with torch.no_grad():
+            for indices in by_length.values():
+                intermediate = self.model(torch.stack([prepared[i] for i in indices]))
+                for index, example in zip(indices, intermediate):
+                    texts[index] = self.decoder(example.cpu())
+        return texts
@@ -1,5 +1,22 @@
-from .decorator import transformation, relation, metamorphic, fixed, randomized, system
-from .report.pytest_plugin import pytest_runtest_makereport, pytest_configure
+from .decorator import (
+    transformation,
+    relation,
+    metamorphic,
+    fixed,
+    randomized,
+    system,
+    use_executor,
+)
+from .report.pytest_plugin import (
+    pytest_runtest_call,
+    pytest_runtest_makereport,
+    pytest_configure,
+    pytest_terminal_summary,
+    pytest_addoption,
+    pytest_unconfigure,
+    pytest_collection_modifyitems,
+    pytest_sessionfinish,
+)
 
 __version__ = '0.1.0'
 __all__ = [
@@ -9,7 +26,14 @@ __all__ = [
     'system',
     'fixed',
     'randomized',
+    'use_executor',
     # for pytest to pick up
+    'pytest_runtest_call',
     'pytest_runtest_makereport',
     'pytest_configure',
+    'pytest_terminal_summary',
+    'pytest_addoption',
+    'pytest_unconfigure',
+    'pytest_collection_modifyitems',
+    'pytest_sessionfinish',
 ]
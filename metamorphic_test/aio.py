@@ -0,0 +1,169 @@
+import asyncio
+import concurrent.futures
+from contextlib import AsyncExitStack
+import inspect
+from typing import Any, Callable, Coroutine, List, Optional, Sequence, TypeVar
+
+from .batch import check_batch_size, split_batch_outputs
+from .binding import Parameters, draw_parameters
+from .executor import FollowUpResult, FollowUpTask
+from .report.execution_report import SystemOutput, TransformOutput
+from .rng import use_rng
+from .system import System
+
+T = TypeVar('T')
+
+
+def is_async(function: Callable) -> bool:
+    """
+    Whether the function, the function wrapped by it (e.g. by decorator.fixed) or
+    the __call__ method of a callable object is a coroutine function.
+    """
+    function = inspect.unwrap(function)
+    if not inspect.isfunction(function) and not inspect.ismethod(function):
+        function = getattr(type(function), '__call__', function)
+    return inspect.iscoroutinefunction(function)
+
+
+def run(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a coroutine to completion from synchronous code, like asyncio.run.
+
+    asyncio.run cannot be called while an event loop is running in the thread,
+    e.g. in a Jupyter notebook or a pytest-asyncio test. Then the coroutine runs
+    in a new event loop on a separate thread, while the caller blocks. Await the
+    coroutine instead to run it in the event loop of the caller.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as thread:
+        return thread.submit(asyncio.run, coroutine).result()
+
+
+async def call(function: Callable, *args) -> Any:
+    """Calls a synchronous or asynchronous function and returns its result."""
+    result = function(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def _call_system(
+        system: System,
+        args: Sequence,
+        semaphore: Optional[asyncio.Semaphore]) -> Any:
+    async with AsyncExitStack() as stack:
+        if semaphore is not None:
+            await stack.enter_async_context(semaphore)
+        return await call(system, *args)
+
+
+async def _evaluate_one(
+        system: System,
+        x: tuple,
+        semaphore: Optional[asyncio.Semaphore]) -> SystemOutput:
+    output: SystemOutput = SystemOutput()
+    try:
+        output.output = await _call_system(system, x, semaphore)
+    except Exception as e:  # pylint: disable=broad-except
+        output.error = e
+    return output
+
+
+async def _evaluate_chunk(
+        system: System,
+        chunk: Sequence[tuple],
+        semaphore: Optional[asyncio.Semaphore]) -> List[SystemOutput]:
+    try:
+        columns = [list(column) for column in zip(*chunk)]
+        results = list(await _call_system(system, columns, semaphore))
+    except Exception as e:  # pylint: disable=broad-except
+        return split_batch_outputs(system, chunk, error=e)
+    return split_batch_outputs(system, chunk, results=results)
+
+
+async def evaluate_async(
+        system: System,
+        inputs: Sequence[tuple],
+        batch_size: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None) -> List[SystemOutput]:
+    """
+    Evaluates the (possibly asynchronous) system under test on all given inputs
+    concurrently.
+
+    Parameters
+    ----------
+    system : System
+        the system under test
+    inputs : Sequence[tuple]
+        the arguments of each evaluation
+    batch_size : Optional[int]
+        see batch.evaluate. Default: None
+    semaphore : Optional[asyncio.Semaphore]
+        bounds the number of concurrent calls of the system. Default: None
+
+    Returns
+    -------
+    outputs : List[SystemOutput]
+        the output or error of the system for each input, in the order of inputs
+    """
+    if batch_size is None:
+        return list(await asyncio.gather(
+            *[_evaluate_one(system, x, semaphore) for x in inputs]
+        ))
+    check_batch_size(batch_size)
+    chunks = await asyncio.gather(*[
+        _evaluate_chunk(system, inputs[start:start + batch_size], semaphore)
+        for start in range(0, len(inputs), batch_size)
+    ])
+    return [output for chunk in chunks for output in chunk]
+
+
+async def _apply_transforms(
+        task: FollowUpTask,
+        result: FollowUpResult) -> Optional[tuple]:
+    singular = len(task.x) == 1
+    y: Any = task.x[0] if singular else task.x
+    # each coroutine runs in its own task and context, so the stream stays local
+    with use_rng(task.rng):
+        for i, (transform, transform_result) in enumerate(
+                zip(task.transforms, result.transform_results)):
+            key = task.key(i)
+            drawn: Parameters = {}
+            try:
+                with draw_parameters(task.parameters.get(key)) as drawn:
+                    y = await call(transform, y) if singular else await call(transform, *y)
+            except Exception as e:  # pylint: disable=broad-except
+                transform_result.error = e
+                return None
+            finally:
+                if drawn:
+                    result.parameters[key] = drawn
+            transform_result.output = y
+    return (y,) if singular else tuple(y)
+
+
+async def follow_up_async(
+        system: System,
+        tasks: Sequence[FollowUpTask],
+        batch_size: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None) -> List[FollowUpResult]:
+    """
+    The asynchronous counterpart of executor.follow_up: applies the transforms
+    of all tasks and evaluates the system on the follow-up inputs concurrently.
+    """
+    results = [
+        FollowUpResult([TransformOutput() for _ in task.transforms]) for task in tasks
+    ]
+    follow_ups = await asyncio.gather(
+        *[_apply_transforms(task, result) for task, result in zip(tasks, results)]
+    )
+    pending = [i for i, y in enumerate(follow_ups) if y is not None]
+    outputs = await evaluate_async(
+        system, [y for y in follow_ups if y is not None], batch_size, semaphore
+    )
+    for i, output in zip(pending, outputs):
+        results[i].output_y = output
+    return results
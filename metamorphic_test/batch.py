@@ -0,0 +1,94 @@
+from typing import Callable, List, Optional, Sequence
+
+from metamorphic_test.report.execution_report import SystemOutput
+
+
+def check_batch_size(batch_size: int) -> None:
+    """Raises a ValueError if the batch size is not positive."""
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be positive, got {batch_size}.")
+
+
+def split_batch_outputs(
+        system: Callable,
+        chunk: Sequence[tuple],
+        results: Optional[List] = None,
+        error: Optional[Exception] = None) -> List[SystemOutput]:
+    """
+    Turns the results of a batched call of the system into one output per input
+    of the chunk. An error is recorded for all inputs, as is a wrong number of
+    results.
+    """
+    outputs: List[SystemOutput] = [SystemOutput() for _ in chunk]
+    if error is None and results is not None and len(results) != len(chunk):
+        error = ValueError(
+            f"Batched system {system.__name__} returned {len(results)} outputs "
+            f"for {len(chunk)} inputs."
+        )
+    if error is not None:
+        for output in outputs:
+            output.error = error
+        return outputs
+    assert results is not None
+    for output, result in zip(outputs, results):
+        output.output = result
+    return outputs
+
+
+def _evaluate_one(system: Callable, x: tuple) -> SystemOutput:
+    output: SystemOutput = SystemOutput()
+    try:
+        output.output = system(*x)
+    except Exception as e:  # pylint: disable=broad-except
+        output.error = e
+    return output
+
+
+def _evaluate_chunk(system: Callable, chunk: Sequence[tuple]) -> List[SystemOutput]:
+    """
+    Calls a batched system once for all inputs of the chunk. The system receives
+    one list per argument, e.g. system([x_0, x_1, ...], [y_0, y_1, ...]).
+    """
+    try:
+        columns = [list(column) for column in zip(*chunk)]
+        results = list(system(*columns))
+    except Exception as e:  # pylint: disable=broad-except
+        return split_batch_outputs(system, chunk, error=e)
+    return split_batch_outputs(system, chunk, results=results)
+
+
+def evaluate(
+        system: Callable,
+        inputs: Sequence[tuple],
+        batch_size: Optional[int] = None) -> List[SystemOutput]:
+    """
+    Evaluates the system under test on all given inputs.
+
+    Without a batch size the system is called once per input. With a batch size
+    the system is assumed to be batched: it is called once per chunk of at most
+    batch_size inputs with one list per argument and must return a sequence with
+    one output per input. An error raised by a batched call is recorded for all
+    inputs of the chunk.
+
+    Parameters
+    ----------
+    system : Callable
+        the system under test
+    inputs : Sequence[tuple]
+        the arguments of each evaluation
+    batch_size : Optional[int]
+        the maximum number of inputs passed to the system at once or None if
+        the system handles one input per call. Default: None
+
+    Returns
+    -------
+    outputs : List[SystemOutput]
+        the output or error of the system for each input, in the order of inputs
+    """
+    if batch_size is None:
+        return [_evaluate_one(system, x) for x in inputs]
+    check_batch_size(batch_size)
+    outputs: List[SystemOutput] = []
+    for start in range(0, len(inputs), batch_size):
+        outputs.extend(_evaluate_chunk(system, inputs[start:start + batch_size]))
+    return outputs
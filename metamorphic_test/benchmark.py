@@ -0,0 +1,91 @@
+"""
+Micro-benchmark of the per-item overhead of metamorphic tests.
+
+Run it with ``python -m metamorphic_test.benchmark [--number N]``. It reports the
+time per call, in microseconds, of
+
+- the adapter generated by helper.change_signature compared to a direct call,
+- a whole execution of a trivial metamorphic test through Suite.execute.
+"""
+import argparse
+import logging
+import timeit
+from typing import Callable, Dict
+
+from .helper import change_signature
+from .logger import logger
+from .report.store import RetentionPolicy
+from .suite import Suite
+
+
+def _system(x: int, y: int = 0) -> int:
+    return x + y
+
+
+def _negate(x: int) -> int:
+    return -x
+
+
+def _equal(x: int, y: int) -> bool:
+    return x == y
+
+
+def _per_call(function: Callable[[], object], number: int) -> float:
+    # the best of a few repetitions is the least disturbed one
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def run(number: int = 100_000) -> Dict[str, float]:
+    """
+    Runs the benchmark.
+
+    Parameters
+    ----------
+    number : int
+        the number of calls per measurement
+
+    Returns
+    -------
+    timings : Dict[str, float]
+        the time per call in microseconds, by measurement
+    """
+    def target(name, x, y):  # pylint: disable=unused-argument
+        return None
+
+    adapter = change_signature(_system)(target)
+    suite = Suite()
+    suite.set_retention(RetentionPolicy(keep_last=0))
+    test_id = suite.metamorphic('benchmark')
+    suite.add_transform(test_id, _negate)
+    suite.set_relation(test_id, lambda x, y: _equal(-x, y))
+    executions = max(number // 100, 1)
+    level = logger.level
+    logger.setLevel(logging.WARNING)  # measure the executions, not their logging
+    try:
+        return {
+            'direct call': _per_call(lambda: target('test', 1, 2), number),
+            'change_signature adapter': _per_call(
+                lambda: adapter('test', 1, y=2), number
+            ),
+            'Suite.execute': _per_call(
+                lambda: suite.execute(test_id, _system, 1),
+                executions
+            ),
+        }
+    finally:
+        logger.setLevel(level)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--number', type=int, default=100_000,
+        help="number of calls per measurement (default: 100000)"
+    )
+    args = parser.parse_args()
+    for name, microseconds in run(args.number).items():
+        print(f"{name:>26}: {microseconds:8.3f} us per call")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import update_wrapper
+from importlib import import_module
+import inspect
+from types import MethodType
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+from .generator import MetamorphicGenerator
+from .transform import Transform
+
+Parameters = Dict[str, Any]
+"""The randomized arguments of one transformation call, by argument name."""
+
+_drawn: ContextVar[Optional[Parameters]] = ContextVar('metamorphic_drawn', default=None)
+_replayed: ContextVar[Optional[Parameters]] = ContextVar('metamorphic_replayed', default=None)
+
+
+@contextmanager
+def draw_parameters(replayed: Optional[Parameters] = None) -> Iterator[Parameters]:
+    """
+    Records the randomized arguments drawn within the context, e.g. while applying
+    one transformation.
+
+    Parameters
+    ----------
+    replayed : Optional[Parameters]
+        values to use instead of drawing new ones, by argument name
+
+    Yields
+    ------
+    drawn : Parameters
+        the drawn (or replayed) arguments, filled while the context is active
+    """
+    drawn: Parameters = {}
+    drawn_token = _drawn.set(drawn)
+    replayed_token = _replayed.set(replayed)
+    try:
+        yield drawn
+    finally:
+        _replayed.reset(replayed_token)
+        _drawn.reset(drawn_token)
+
+
+class ParameterBinding:
+    """
+    A transformation with some of its arguments bound to fixed values or to values
+    drawn from generators, which looks like the wrapped transformation (name,
+    module, docstring, __wrapped__).
+
+    Stacked fixed and randomized decorators collapse into a single binding of the
+    original transformation: the signature is resolved once and all bound
+    arguments are filled in one step per call. If an argument is bound several
+    times, the binding closest to the transformation wins. Randomized arguments
+    are drawn in the order of the decorators, outermost first.
+
+    Unlike a closure, a binding can be pickled, e.g. to be sent to a worker process:
+    a module level transformation is pickled by its qualified name, any other
+    binding by its transformation, fixed values and generators.
+
+    Drawn values are recorded within draw_parameters(), which can also replay
+    previously drawn values.
+
+    See Also
+    --------
+    decorator.fixed : Fix the argument arg to the given value
+    decorator.randomized : Randomize the argument arg by the value generated by
+                           the generator
+    """
+    transform: Transform
+    __name__: str
+    __qualname__: str
+
+    def __init__(
+            self,
+            transform: Transform,
+            fixed: Optional[Mapping[str, Any]] = None,
+            randomized: Optional[Mapping[str, MetamorphicGenerator]] = None) -> None:
+        fixed = dict(fixed or {})
+        randomized = dict(randomized or {})
+        if isinstance(transform, ParameterBinding):
+            # collapse onto the inner binding, whose arguments take precedence
+            for arg in (*transform.fixed, *transform.randomized):
+                fixed.pop(arg, None)
+                randomized.pop(arg, None)
+            fixed.update(transform.fixed)
+            randomized.update(transform.randomized)
+            transform = transform.transform
+        update_wrapper(self, transform)
+        # update_wrapper copies the attributes of a wrapped binding, so set ours after
+        self.transform = transform
+        self.fixed: Dict[str, Any] = fixed
+        self.randomized: Dict[str, MetamorphicGenerator] = randomized
+        self._check_signature()
+
+    def _check_signature(self) -> None:
+        try:
+            parameters = inspect.signature(self.transform).parameters
+        except (TypeError, ValueError):
+            return  # e.g. some builtins, checked on call only
+        if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+            return
+        for arg in (*self.fixed, *self.randomized):
+            if arg not in parameters or \
+                    parameters[arg].kind is inspect.Parameter.POSITIONAL_ONLY:
+                raise ValueError(
+                    f"Cannot bind argument {arg!r}, {self.__name__} has no such "
+                    "keyword argument."
+                )
+
+    def draw(self) -> Dict[str, Any]:
+        """
+        Returns the values of the randomized arguments for one call, drawn from
+        their generators unless they are replayed.
+        """
+        replayed = _replayed.get()
+        values = {
+            arg: replayed[arg] if replayed is not None and arg in replayed
+            else generator.generate()
+            for arg, generator in self.randomized.items()
+        }
+        drawn = _drawn.get()
+        if drawn is not None:
+            drawn.update(values)
+        return values
+
+    def draw_batch(
+            self,
+            n: int,
+            rng: Optional[np.random.Generator] = None) -> List[Parameters]:
+        """
+        Returns the values of the randomized arguments for n calls, drawing all
+        values of an argument with one MetamorphicGenerator.generate_batch call.
+        The fixed arguments are filled in on call.
+
+        Parameters
+        ----------
+        n : int
+            the number of calls
+        rng : Optional[np.random.Generator]
+            the random stream to draw from. Defaults to rng.current_rng().
+
+        Returns
+        -------
+        values : List[Parameters]
+            the randomized arguments of each call, which can be replayed with
+            draw_parameters()
+        """
+        columns = {
+            arg: generator.generate_batch(n, rng).tolist()
+            for arg, generator in self.randomized.items()
+        }
+        return [{arg: values[i] for arg, values in columns.items()} for i in range(n)]
+
+    def __call__(self, *args, **kwargs):
+        kwargs.update(self.fixed)
+        if self.randomized:
+            kwargs.update(self.draw())
+        return self.transform(*args, **kwargs)
+
+    def __get__(self, instance, owner=None):
+        # behave like a function when used as a method
+        return self if instance is None else MethodType(self, instance)
+
+    def _is_global(self) -> bool:
+        try:
+            obj: Any = import_module(self.__module__)
+            for name in self.__qualname__.split('.'):
+                obj = getattr(obj, name)
+        except (ImportError, AttributeError):
+            return False
+        return obj is self
+
+    def __reduce__(self):
+        if self._is_global():
+            return self.__qualname__
+        return ParameterBinding, (self.transform, self.fixed, self.randomized)
+
+    def __repr__(self) -> str:
+        args = [f"{arg}={value!r}" for arg, value in self.fixed.items()]
+        args += [f"{arg}~{generator!r}" for arg, generator in self.randomized.items()]
+        return f"<{type(self).__name__} {', '.join(args)} of {self.transform!r}>"
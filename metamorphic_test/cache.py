@@ -0,0 +1,254 @@
+from collections import OrderedDict
+import copy
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .rng import content_digest
+from .transform import Transform
+
+CacheKey = Hashable
+
+_MISSING = object()
+
+
+def input_key(x: tuple, digest: Optional[int] = None) -> Optional[CacheKey]:
+    """
+    Computes a key identifying the given system input.
+
+    Hashable inputs are identified by their value (and type), which for objects
+    without a custom hash means their identity. Unhashable inputs such as numpy
+    arrays or DataFrames are identified by a digest of their pickled content.
+
+    Parameters
+    ----------
+    x : tuple
+        The actual arguments passed to the system under test.
+    digest : Optional[int]
+        The rng.content_digest of x if it was computed already, so that x is not
+        pickled again. Default: None
+
+    Returns
+    -------
+    out : Optional[CacheKey]
+        A hashable key for the input or None if the input can neither be hashed
+        nor pickled.
+    """
+    try:
+        hash(x)
+        return 'value', tuple(type(v) for v in x), x
+    except TypeError:
+        pass
+    if digest is None:
+        digest = content_digest(x)
+    if digest is None:
+        return None
+    return 'content', digest
+
+
+def cache_digest(x: tuple) -> Optional[int]:
+    """
+    Returns the rng.content_digest input_key needs to identify x, i.e. None for
+    hashable inputs, which are not pickled.
+    """
+    try:
+        hash(x)
+        return None
+    except TypeError:
+        return content_digest(x)
+
+
+class SourceOutputCache:
+    """
+    Caches the outputs of the system under test for source inputs.
+
+    All metamorphic tests listed for one system evaluate the system on the very
+    same source input. Caching the source output lets every test after the first
+    one reuse it instead of running the system again. The cache is bounded and
+    evicts the least recently used outputs first. It keeps and hands out copies of
+    the outputs, so that a relation which modifies its arguments in place does not
+    change the output seen by the other tests.
+
+    See Also
+    --------
+    suite.Suite.execute : executes a metamorphic test using the suite's cache
+    """
+
+    def __init__(self, max_size: int = 4096) -> None:
+        self.max_size = max_size
+        """
+        max_size : int
+            maximum number of source outputs kept in the cache
+        """
+        self.hits = 0
+        """
+        hits : int
+            number of lookups which could reuse a cached source output
+        """
+        self.misses = 0
+        """
+        misses : int
+            number of lookups which had to evaluate the system under test
+        """
+        self._outputs: 'OrderedDict[CacheKey, Any]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+    @staticmethod
+    def key(system: Callable, x: tuple, digest: Optional[int] = None) -> Optional[CacheKey]:
+        """
+        Returns the cache key for evaluating system on x or None if x cannot
+        be cached. digest is passed to input_key.
+        """
+        key = input_key(x, digest)
+        if key is None:
+            return None
+        return system, key
+
+    def lookup(self, key: Optional[CacheKey]) -> Tuple[bool, Any]:
+        """
+        Looks up a source output and updates the hit / miss counters.
+
+        Returns
+        -------
+        out : Tuple[bool, Any]
+            A flag indicating whether the output was found and a copy of the output.
+        """
+        output = _MISSING if key is None else self._outputs.get(key, _MISSING)
+        if output is _MISSING:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        self._outputs.move_to_end(key)
+        return True, copy.deepcopy(output)
+
+    def store(self, key: Optional[CacheKey], output: Any) -> None:
+        """Stores a copy of a source output, evicting the oldest ones if necessary."""
+        if key is None or self.max_size <= 0:
+            return
+        self._outputs[key] = copy.deepcopy(output)
+        self._outputs.move_to_end(key)
+        while len(self._outputs) > self.max_size:
+            self._outputs.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops all cached outputs and resets the counters."""
+        self._outputs.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class _TrieNode:
+    __slots__ = ('output', 'children')
+
+    def __init__(self, output: Any = None) -> None:
+        self.output = output
+        self.children: Dict[Transform, '_TrieNode'] = {}
+
+
+class TransformCache:
+    """
+    Caches the intermediate results of chains of deterministic transformations.
+
+    The results are kept in one trie per input: the path from the root follows
+    the transformations in the order they were applied and each node holds the
+    result of the chain up to it. A chain can then reuse the deepest prefix which
+    was already computed, e.g. by another metamorphic test applying only its
+    first transformation to the same input. The cache is bounded by the number
+    of inputs and evicts the least recently used inputs first.
+
+    Only transformations registered with deterministic=True may be cached. The
+    results are handed out as copies, so that a transformation or system which
+    modifies its input in place does not change the cached results. Deterministic
+    transformations must not modify their input in place though, as the result
+    of a chain is stored only after the rest of the chain was applied to it.
+
+    See Also
+    --------
+    decorator.transformation : registers a (deterministic) transformation
+    """
+
+    def __init__(self, max_inputs: int = 256) -> None:
+        self.max_inputs = max_inputs
+        """
+        max_inputs : int
+            maximum number of inputs whose intermediate results are kept
+        """
+        self.hits = 0
+        """
+        hits : int
+            number of transformation results reused from the cache
+        """
+        self._roots: 'OrderedDict[CacheKey, _TrieNode]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._roots)
+
+    def lookup(
+            self,
+            x: tuple,
+            transforms: Sequence[Transform],
+            digest: Optional[int] = None) -> List[Any]:
+        """
+        Returns the cached results of the longest prefix of transforms applied
+        to the input x.
+
+        Parameters
+        ----------
+        x : tuple
+            The arguments of the source input.
+        transforms : Sequence[Transform]
+            The deterministic transformations in the order they are applied.
+        digest : Optional[int]
+            The rng.content_digest of x, if computed already. Default: None
+
+        Returns
+        -------
+        outputs : List[Any]
+            A copy of the result of each transformation of the prefix, empty if
+            not even the first transformation is cached.
+        """
+        key = input_key(x, digest)
+        node = None if key is None else self._roots.get(key)
+        if node is None:
+            return []
+        self._roots.move_to_end(key)
+        outputs = []
+        for transform in transforms:
+            node = node.children.get(transform)
+            if node is None:
+                break
+            outputs.append(node.output)
+        self.hits += len(outputs)
+        # copied as a whole, so that results referring to each other still do
+        return copy.deepcopy(outputs)
+
+    def store(
+            self,
+            x: tuple,
+            transforms: Sequence[Transform],
+            outputs: Sequence[Any],
+            digest: Optional[int] = None) -> None:
+        """
+        Stores the result of each transformation of a chain applied to x.
+        outputs[i] is the result of applying transforms[:i + 1]. digest is the
+        rng.content_digest of x, if computed already.
+        """
+        key = input_key(x, digest)
+        if key is None or self.max_inputs <= 0 or not outputs:
+            return
+        node = self._roots.get(key)
+        if node is None:
+            node = self._roots[key] = _TrieNode()
+        self._roots.move_to_end(key)
+        for transform, output in zip(transforms, outputs):
+            child = node.children.get(transform)
+            if child is None:
+                child = node.children[transform] = _TrieNode(output)
+            node = child
+        while len(self._roots) > self.max_inputs:
+            self._roots.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops all cached results and resets the counter."""
+        self._roots.clear()
+        self.hits = 0
@@ -1,11 +1,17 @@
+from functools import update_wrapper
+import inspect
+
 import pytest
 from typing import Optional, TypeVar, Callable, Hashable
 
 from .helper import change_signature
+from .executor import Executor
 from .generator import MetamorphicGenerator
 from .suite import Suite, TestID
+from .system import SystemRegistration
 from .transform import Transform
 from .rel import Relation
+from .source import DataSource
 
 A = TypeVar('A')
 
@@ -31,7 +37,8 @@ suite = Suite()
 def metamorphic(
         name: str, *,
         transform: Optional[Transform] = None,
-        relation: Optional[Relation] = None) -> TestID:
+        relation: Optional[Relation] = None,
+        samples: int = 1) -> TestID:
     """
     Registers a new metamorphic test
 
@@ -46,6 +53,10 @@ def metamorphic(
         Optional transformation function. Defaults to None.
     relation : Optional[Relation]
         Optional relation function. Defaults to None.
+    samples : int
+        Optional number of follow-up inputs derived from each source input. Each one
+        uses newly drawn randomized arguments and is checked against the same source
+        output. Defaults to 1.
 
     Returns
     -------
@@ -67,7 +78,7 @@ def metamorphic(
     def test_function(input):
         func(input)
     """
-    test_id = suite.metamorphic(name)
+    test_id = suite.metamorphic(name, samples=samples)
     if transform is not None:
         suite.add_transform(test_id, transform, priority=0)
     if relation is not None:
@@ -165,7 +176,10 @@ def fixed(arg: str, value: A) -> TransformWrapper:
 # update the metamorphic test in the global suites variable by appending the
 # (transform, priority) pair to the already present transformations of the given
 # metamorphic test
-def transformation(test_id: TestID, *, priority: int = 0) -> TransformWrapper:
+def transformation(
+        test_id: TestID, *,
+        priority: int = 0,
+        deterministic: bool = False) -> TransformWrapper:
     """
     Registers the decorated function as a transformation for a pre-defined metamorphic test
     given by 'name' parameter.
@@ -181,6 +195,12 @@ def transformation(test_id: TestID, *, priority: int = 0) -> TransformWrapper:
         if order is important for a use case. The higher the value the earlier the
         transformation will be applied. Transformations with equal priority will be executed in
         a random order. Default: 0
+    deterministic : bool
+        Optional flag marking the transformation as deterministic, i.e. it always
+        returns the same output for the same input. The results of deterministic
+        transformations (and chains of them) are cached and shared by all metamorphic
+        tests applying them to the same input, so they must not modify their input
+        in place. Must not be set for randomized transformations. Default: False
 
     Returns
     -------
@@ -210,7 +230,9 @@ def transformation(test_id: TestID, *, priority: int = 0) -> TransformWrapper:
     """
 
     def wrapper(transform: Transform) -> Transform:
-        suite.add_transform(test_id, transform, priority=priority)
+        suite.add_transform(
+            test_id, transform, priority=priority, deterministic=deterministic
+        )
         return transform
 
     return wrapper
@@ -273,6 +295,16 @@ def relation(*test_ids: TestID) -> RelationWrapper:
     return wrapper
 
 
+def _named_like(function: Callable, test: System) -> Callable:
+    # keeps the signature of function, unlike functools.wraps
+    update_wrapper(
+        function, test,
+        assigned=('__module__', '__name__', '__qualname__', '__doc__'), updated=()
+    )
+    delattr(function, '__wrapped__')
+    return function
+
+
 # names: the names of the metamorphic tests to be run
 # test: the system under test function
 # name: the name of the metamorphic test to be run
@@ -292,7 +324,34 @@ def system(*names: Hashable, **kwargs) -> Callable[[System], Callable[..., None]
         as comma separated multiple arguments.
     kwargs: Any
         Optional key word arguments to pass some additional parameters to the
-        tests or transformations.
+        tests or transformations:
+        visualize_input / visualize_output : functions rendering inputs / outputs
+        in the HTML report.
+        deterministic : marks the system as deterministic, i.e. it always returns
+        the same output for the same input. The output on a source input is then
+        computed once and shared by all listed metamorphic tests instead of being
+        computed once per test. Default: False
+        batch_size : marks the system as batched. It then receives one list per
+        argument holding up to batch_size inputs (source and follow-up inputs are
+        passed in separate calls) and has to return a list with one output per
+        input. Default: None
+        samples : overrides the number of follow-up inputs derived from each source
+        input for all listed metamorphic tests. Default: None
+        concurrency : the maximum number of concurrent calls of an asynchronous
+        (async def) system. Source and follow-up inputs of an execution are
+        evaluated concurrently. Default: None, i.e. no limit
+        collapse : whether all listed metamorphic tests are executed in a single
+        pytest item per input instead of one item per test and input. Each test
+        is reported as a sub-result of the item, which fails if any test failed.
+        Default: False
+        source : the inputs of the system, instead of pytest.mark.parametrize. A
+        dataset with __len__ and __getitem__, e.g. a source.Dataset, whose items
+        are read when an execution needs them, or an iterable, which is read into
+        a list. The items are the argument of the system, or tuples of its
+        arguments if it takes several. The pytest items are parametrized by
+        'index', the index of the input. Default: None
+        prefetch : the number of inputs of source read ahead in a background
+        thread. Default: 4
 
     Returns
     -------
@@ -326,20 +385,108 @@ def system(*names: Hashable, **kwargs) -> Callable[[System], Callable[..., None]
         func(input)
     """
 
-    def wrapper(test: System) -> Callable[..., None]:
-        @change_signature(test)
-        def execute(name: str, *args, **kwargs):
-            if kwargs:
-                args = tuple(kwargs.values())
-            suite.execute(name, test, *args)
+    deterministic = kwargs.get('deterministic', False)
+    batch_size = kwargs.get('batch_size', None)
+    samples = kwargs.get('samples', None)
+    concurrency = kwargs.get('concurrency', None)
+    collapse = kwargs.get('collapse', False)
+    source = kwargs.get('source', None)
 
-        return pytest.mark.metamorphic(
+    def wrapper(test: System) -> Callable[..., None]:
+        data = None
+        if source is not None:
+            data = DataSource(
+                source,
+                arity=len(inspect.signature(test).parameters),
+                prefetch=kwargs.get('prefetch', 4),
+            )
+        mark = pytest.mark.metamorphic(
             visualize_input=kwargs.get('visualize_input', None),
             visualize_output=kwargs.get('visualize_output', None),
-        )(
-            pytest.mark.parametrize('name', names)(execute)
+            names=tuple(names) if collapse else None,
         )
+        if collapse:
+            # one item per input, running all tests
+            def execute_all(*args):
+                suite.execute_collapsed(
+                    names, test, *args,
+                    cache_source=deterministic,
+                    batch_size=batch_size,
+                    samples=samples,
+                    concurrency=concurrency
+                )
+
+            if data is None:
+                test_function = mark(change_signature(test, with_name=False)(execute_all))
+            else:
+                def execute_input(index: int):
+                    execute_all(*data.args(index))
+
+                test_function = mark(pytest.mark.parametrize('index', range(len(data)))(
+                    _named_like(execute_input, test)
+                ))
+        else:
+            # the adapter passes all arguments positionally, in the order of the system
+            def execute(name: str, *args):
+                suite.execute(
+                    name, test, *args,
+                    cache_source=deterministic,
+                    batch_size=batch_size,
+                    samples=samples,
+                    concurrency=concurrency
+                )
+
+            if data is None:
+                test_function = change_signature(test)(execute)
+            else:
+                # the index varies slowest, so the tests of an input run in a row
+                def execute_index(name: str, index: int):
+                    execute(name, *data.args(index))
+
+                test_function = pytest.mark.parametrize('index', range(len(data)))(
+                    _named_like(execute_index, test)
+                )
+            test_function = mark(pytest.mark.parametrize('name', names)(test_function))
+        suite.register_system(SystemRegistration(
+            test, tuple(names), test_function,
+            deterministic=deterministic,
+            batch_size=batch_size,
+            samples=samples,
+            concurrency=concurrency,
+            collapse=collapse,
+            source=data,
+            visualize_input=kwargs.get('visualize_input', None),
+            visualize_output=kwargs.get('visualize_output', None),
+        ))
+        return test_function
 
     if not names:
         names = suite.get_test_id()
     return wrapper
+
+
+def use_executor(executor: Executor) -> None:
+    """
+    Sets the executor which runs the transformations and evaluates the systems
+    under test on the follow-up inputs of all metamorphic tests.
+
+    Parameters
+    ----------
+    executor : Executor
+        the executor to use from now on. The previous one is shut down.
+
+    See Also
+    --------
+    executor.SerialExecutor : runs everything in the current process (default)
+    executor.ProcessPoolExecutor : runs the follow-ups in a pool of worker processes
+
+    Examples
+    --------
+    # content of conftest.py
+    def load_model():
+        global model
+        model = TrafficSignClassifier()
+
+    use_executor(ProcessPoolExecutor(max_workers=32, initializer=load_model))
+    """
+    suite.set_executor(executor)
@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from itertools import groupby
+from typing import List, Sequence, Tuple
+
+from .prioritized_transform import PrioritizedTransform
+from .rng import RandomStream, resolve
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """
+    The immutable order in which the transformations of a metamorphic test are
+    applied: buckets of transformations with equal priority, the highest priority
+    first. Only the order within a bucket is drawn anew for each execution.
+
+    A plan is built once from the registered transformations and can be shared
+    by concurrent executions, since ordering never modifies it.
+
+    See Also
+    --------
+    metamorphic.MetamorphicTest.plan : the plan of a metamorphic test
+    """
+    buckets: Tuple[Tuple[PrioritizedTransform, ...], ...] = ()
+    """
+    buckets : Tuple[Tuple[PrioritizedTransform, ...], ...]
+        The transformations grouped by priority, in descending order of priority.
+    """
+
+    @classmethod
+    def build(cls, transforms: Sequence[PrioritizedTransform]) -> 'ExecutionPlan':
+        """Groups the given transformations into priority buckets."""
+        ordered = sorted(transforms, key=lambda tp: tp.priority, reverse=True)
+        return cls(tuple(
+            tuple(bucket) for _, bucket in groupby(ordered, key=lambda tp: tp.priority)
+        ))
+
+    def order(self, rng: RandomStream) -> List[PrioritizedTransform]:
+        """
+        Returns the transformations in the order of one execution: higher priority
+        first, equal priority in a random order drawn from rng. A LazyStream is
+        only created if a bucket holds several transformations.
+        """
+        transforms: List[PrioritizedTransform] = []
+        for bucket in self.buckets:
+            if len(bucket) == 1:
+                transforms.append(bucket[0])
+            else:
+                permutation = resolve(rng).permutation(len(bucket))
+                transforms.extend(bucket[i] for i in permutation)
+        return transforms
@@ -0,0 +1,359 @@
+from abc import ABCMeta, abstractmethod
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from importlib import import_module
+import math
+import os
+import pickle  # nosec
+import random
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence
+
+import numpy as np
+
+from .batch import evaluate
+from .binding import Parameters, draw_parameters
+from .logger import logger
+from .report.execution_report import SystemOutput, TransformOutput
+from .rng import RandomStream, use_rng
+from .system import System, SystemID, system_id
+from .transform import Transform
+
+
+@dataclass
+class FollowUpTask:
+    """
+    The work needed for one follow-up input: applying the transforms to the source
+    input one after the other and evaluating the system on the result.
+    """
+    transforms: Sequence[Transform]
+    """
+    transforms : Sequence[Transform]
+        The transformations in the order they are applied.
+    """
+    x: tuple
+    """
+    x : tuple
+        The arguments of the source input.
+    """
+    rng: Optional[RandomStream] = None
+    """
+    rng : Optional[RandomStream]
+        The random stream the randomized arguments of the transforms are drawn from,
+        see rng.current_rng.
+    """
+    parameters: Dict[str, Parameters] = field(default_factory=lambda: {})
+    """
+    parameters : Dict[str, Parameters]
+        Randomized arguments to use instead of drawing them, e.g. drawn for several
+        samples at once or replayed, by transform key.
+    """
+    keys: Sequence[str] = ()
+    """
+    keys : Sequence[str]
+        The key of each transform in its test, see PrioritizedTransform.key, by
+        which the parameters are given and recorded. Defaults to their names.
+    """
+
+    def key(self, index: int) -> str:
+        """Returns the key of the transform at index."""
+        return self.keys[index] if self.keys else self.transforms[index].__name__
+
+
+@dataclass
+class FollowUpResult:
+    """The outcome of a FollowUpTask."""
+    transform_results: List[TransformOutput] = field(default_factory=lambda: [])
+    """
+    transform_results : List[TransformOutput]
+        The result or error of each transformation. Transformations after a failed
+        one are left unset.
+    """
+    output_y: Optional[SystemOutput] = None
+    """
+    output_y : Optional[SystemOutput]
+        The output of the system on the follow-up input or None if a transformation
+        failed.
+    """
+    parameters: Dict[str, Parameters] = field(default_factory=lambda: {})
+    """
+    parameters : Dict[str, Parameters]
+        The randomized arguments drawn for each transformation, by transform key.
+    """
+
+
+def _apply_transforms(task: FollowUpTask, result: FollowUpResult) -> Optional[tuple]:
+    singular = len(task.x) == 1
+    y: Any = task.x[0] if singular else task.x
+    for i, (transform, transform_result) in enumerate(
+            zip(task.transforms, result.transform_results)):
+        key = task.key(i)
+        drawn: Parameters = {}
+        try:
+            with draw_parameters(task.parameters.get(key)) as drawn:
+                y = transform(y) if singular else transform(*y)
+        except Exception as e:  # pylint: disable=broad-except
+            transform_result.error = e
+            return None
+        finally:
+            if drawn:
+                result.parameters[key] = drawn
+        transform_result.output = y
+    return (y,) if singular else tuple(y)
+
+
+def follow_up(
+        system: System,
+        tasks: Sequence[FollowUpTask],
+        batch_size: Optional[int] = None) -> List[FollowUpResult]:
+    """
+    Runs the given follow-up tasks in the current process.
+
+    Parameters
+    ----------
+    system : System
+        the system under test
+    tasks : Sequence[FollowUpTask]
+        the follow-up inputs to compute and evaluate
+    batch_size : Optional[int]
+        see batch.evaluate. Default: None
+
+    Returns
+    -------
+    results : List[FollowUpResult]
+        the result of each task, in the order of tasks
+    """
+    results = [
+        FollowUpResult([TransformOutput() for _ in task.transforms]) for task in tasks
+    ]
+    pending, follow_ups = [], []
+    for i, (task, result) in enumerate(zip(tasks, results)):
+        with use_rng(task.rng):
+            y = _apply_transforms(task, result)
+        if y is not None:
+            pending.append(i)
+            follow_ups.append(y)
+    for i, output in zip(pending, evaluate(system, follow_ups, batch_size)):
+        results[i].output_y = output
+    return results
+
+
+class Executor(metaclass=ABCMeta):
+    """
+    Executes the follow-up part of metamorphic test executions.
+
+    The source outputs and the relations are always computed in the calling
+    process. An executor decides where and how the transformations and the
+    evaluation of the system on the follow-up inputs happen.
+
+    See Also
+    --------
+    suite.Suite.executor : the executor used by the suite
+    """
+
+    @abstractmethod
+    def run(
+            self,
+            system: System,
+            tasks: Sequence[FollowUpTask],
+            batch_size: Optional[int] = None) -> List[FollowUpResult]:
+        """
+        Runs the follow-up tasks and returns their results in the order of tasks.
+        """
+
+    def shutdown(self) -> None:
+        """Releases the resources held by the executor."""
+
+
+class SerialExecutor(Executor):
+    """Runs all follow-up tasks one after the other in the current process."""
+
+    def run(
+            self,
+            system: System,
+            tasks: Sequence[FollowUpTask],
+            batch_size: Optional[int] = None) -> List[FollowUpResult]:
+        return follow_up(system, tasks, batch_size)
+
+
+# systems resolved in a worker process, by id
+_resolved_systems: Dict[SystemID, System] = {}
+
+
+class _SystemReference:
+    """
+    A picklable stand-in for a registered system under test, which is looked up
+    in the suite of the worker process.
+
+    The decorated test function of a module wraps the actual system under test,
+    so the system itself cannot be pickled by its qualified name.
+    """
+
+    def __init__(self, system: System) -> None:
+        self.module = system.__module__
+        self.qualname = system.__qualname__
+        self.id = system_id(system)
+        self.__name__ = system.__name__
+
+    def _resolve(self) -> System:
+        if self.id not in _resolved_systems:
+            # pylint: disable=import-outside-toplevel,cyclic-import
+            from .decorator import suite
+            module = import_module(self.module)
+            if self.id in suite.systems:
+                system = suite.get_system(self.id)
+            else:
+                # not decorated with decorator.system, e.g. a plain function
+                obj: Any = module
+                for name in self.qualname.split('.'):
+                    obj = getattr(obj, name)
+                system = obj
+            _resolved_systems[self.id] = system
+        return _resolved_systems[self.id]
+
+    def __call__(self, *args):
+        return self._resolve()(*args)
+
+
+def _initialize_worker(initializer: Optional[Callable], initargs: tuple) -> None:
+    # forked workers inherit the random state of the parent process
+    random.seed()
+    np.random.seed()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+class ProcessPoolExecutor(Executor):
+    """
+    Runs the follow-up tasks in a pool of worker processes.
+
+    The workers are started on first use and kept alive between calls, so an
+    expensive setup like loading a model happens once per worker in the given
+    initializer. The tasks of one call are split into chunks (of batch_size for
+    batched systems) which the workers process in parallel. Results are always
+    returned in the order of the tasks.
+
+    Transformations are sent to the workers by their qualified name. If they
+    cannot be pickled, e.g. because they are lambdas, the tasks run in the
+    current process instead.
+
+    Examples
+    --------
+    # content of conftest.py
+    from metamorphic_test import use_executor
+    from metamorphic_test.executor import ProcessPoolExecutor
+
+    use_executor(ProcessPoolExecutor(max_workers=32, initializer=load_model))
+    """
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            initializer: Optional[Callable] = None,
+            initargs: tuple = (),
+            mp_context: Optional[Any] = None) -> None:
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self.mp_context = mp_context
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        # keyed by the transformations, which are kept alive by the keys
+        self._picklable: Dict[FrozenSet[Transform], bool] = {}
+
+    @property
+    def pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self.mp_context,
+                initializer=_initialize_worker,
+                initargs=(self.initializer, self.initargs),
+            )
+        return self._pool
+
+    def _can_send(self, tasks: Sequence[FollowUpTask]) -> bool:
+        key = frozenset(t for task in tasks for t in task.transforms)
+        if key not in self._picklable:
+            try:
+                pickle.dumps(list(key))
+                self._picklable[key] = True
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(
+                    "Transformations cannot be sent to worker processes (%s), "
+                    "running them in the current process.", e
+                )
+                self._picklable[key] = False
+        return self._picklable[key]
+
+    def _discard_pool(self) -> None:
+        # a pool with a crashed worker refuses all further submissions
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def _submit(
+            self,
+            reference: _SystemReference,
+            chunk: Sequence[FollowUpTask],
+            batch_size: Optional[int]) -> concurrent.futures.Future:
+        try:
+            return self.pool.submit(follow_up, reference, chunk, batch_size)
+        except BrokenProcessPool:
+            # a worker crashed since the last call, start a fresh pool once
+            self._discard_pool()
+        try:
+            return self.pool.submit(follow_up, reference, chunk, batch_size)
+        except BrokenProcessPool as e:
+            self._discard_pool()
+            # reported like a crash while running the chunk
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            future.set_exception(e)
+            return future
+
+    def _chunks(
+            self,
+            tasks: Sequence[FollowUpTask],
+            batch_size: Optional[int]) -> List[Sequence[FollowUpTask]]:
+        workers = self.max_workers or os.cpu_count() or 1
+        size = batch_size or math.ceil(len(tasks) / workers)
+        return [tasks[start:start + size] for start in range(0, len(tasks), size)]
+
+    def run(
+            self,
+            system: System,
+            tasks: Sequence[FollowUpTask],
+            batch_size: Optional[int] = None) -> List[FollowUpResult]:
+        if not tasks:
+            return []
+        if not self._can_send(tasks):
+            return follow_up(system, tasks, batch_size)
+        reference = _SystemReference(system)
+        chunks = self._chunks(tasks, batch_size)
+        futures = [self._submit(reference, chunk, batch_size) for chunk in chunks]
+        results: List[FollowUpResult] = []
+        for chunk, future in zip(chunks, futures):
+            try:
+                results.extend(future.result())
+            except BrokenProcessPool as e:
+                # the worker crashed, the chunk is not run again in this process
+                self._discard_pool()
+                for task in chunk:
+                    output_y: SystemOutput = SystemOutput()
+                    output_y.error = e
+                    results.append(FollowUpResult(
+                        [TransformOutput() for _ in task.transforms], output_y
+                    ))
+            except Exception as e:  # pylint: disable=broad-except
+                # follow_up records all errors, so the inputs or the outputs of the
+                # chunk could not be pickled. They can be run in this process.
+                logger.warning(
+                    "Follow-ups cannot be sent to worker processes (%s), "
+                    "running them in the current process.", e
+                )
+                results.extend(follow_up(system, chunk, batch_size))
+        return results
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -1,5 +1,10 @@
-from abc import ABCMeta
-from typing import TypeVar, Generic
+from abc import ABCMeta, abstractmethod
+from contextlib import nullcontext
+from typing import Any, List, Optional, TypeVar, Generic
+
+import numpy as np
+
+from .rng import use_rng
 
 A = TypeVar('A')
 
@@ -10,7 +15,41 @@ class MetamorphicGenerator(Generic[A], metaclass=ABCMeta):
     randomized inputs by drawing values from a pool of values.
 
     This class must be inherited to define a new random input generator and the
-    generate() method must be implemented.
+    generate() method must be implemented. Generators which can draw many values
+    at once should also override generate_batch().
+
+    To make executions reproducible, implementations should draw from
+    rng.current_rng(), the random stream of the current execution.
     """
+    @abstractmethod
     def generate(self) -> A:
-        ...
+        """Returns one value drawn from rng.current_rng()."""
+
+    def generate_batch(self, n: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Draws n values at once.
+
+        The default implementation calls generate() n times. It returns a
+        one-dimensional array of the values, with dtype object if they are not
+        scalars of a common type.
+
+        Parameters
+        ----------
+        n : int
+            the number of values to draw
+        rng : Optional[np.random.Generator]
+            the random stream to draw from. Defaults to rng.current_rng().
+
+        Returns
+        -------
+        values : np.ndarray
+            an array of n values
+        """
+        with use_rng(rng) if rng is not None else nullcontext():
+            values: List[Any] = [self.generate() for _ in range(n)]
+        array = np.asarray(values) if values else np.empty(0)
+        if array.shape != (n,):
+            array = np.empty(n, dtype=object)
+            for i, value in enumerate(values):
+                array[i] = value
+        return array
@@ -1,6 +1,9 @@
-import random
+from typing import Optional
+
+import numpy as np
 
 from metamorphic_test.generator import MetamorphicGenerator
+from metamorphic_test.rng import current_rng
 
 
 class RandFloat(MetamorphicGenerator[float]):
@@ -22,4 +25,12 @@ class RandFloat(MetamorphicGenerator[float]):
         Returns a random floating point value from the closed interval
         [self.min_value, self.max_value]
         """
-        return random.uniform(self.min_value, self.max_value)  # nosec
+        return float(current_rng().uniform(self.min_value, self.max_value))
+
+    def generate_batch(self, n: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Returns n random floating point values from the closed interval
+        [self.min_value, self.max_value], drawn with a single numpy call
+        """
+        rng = current_rng() if rng is None else rng
+        return rng.uniform(self.min_value, self.max_value, size=n)
@@ -1,6 +1,9 @@
-import random
+from typing import Optional
+
+import numpy as np
 
 from metamorphic_test.generator import MetamorphicGenerator
+from metamorphic_test.rng import current_rng
 
 
 class RandInt(MetamorphicGenerator[int]):
@@ -21,4 +24,12 @@ class RandInt(MetamorphicGenerator[int]):
         """
         Returns a random integer from the closed interval [self.min_value, self.max_value]
         """
-        return random.randint(self.min_value, self.max_value)  # nosec
+        return int(current_rng().integers(self.min_value, self.max_value, endpoint=True))
+
+    def generate_batch(self, n: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Returns n random integers from the closed interval
+        [self.min_value, self.max_value], drawn with a single numpy call
+        """
+        rng = current_rng() if rng is None else rng
+        return rng.integers(self.min_value, self.max_value, size=n, endpoint=True)
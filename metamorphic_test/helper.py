@@ -1,29 +1,104 @@
+from functools import update_wrapper
 import inspect
-import wrapt  # type: ignore
+from typing import Any, Callable, Dict
 
 
-def change_signature(adapt_func):
-    fullargspec = inspect.getfullargspec(adapt_func)
-    fullargspec.args.insert(0, 'name')
+class _Name:
+    """Renders as the given name in the source of a signature, e.g. for defaults."""
 
-    @wrapt.decorator(adapter=fullargspec)
-    def change(wrapped, instance, args, kwargs):
-        def _raise_runtime_err(applied_type):
-            raise RuntimeError(f"'change_signature' decorator should not"
-                               f" be applied to a {applied_type}.")
+    def __init__(self, name: str) -> None:
+        self.name = name
 
-        if instance is None:
-            if not inspect.isclass(wrapped):
-                # Decorator was applied to a function or staticmethod.
-                return wrapped(*args, **kwargs)
-            # Decorator was applied to a class.
-            return _raise_runtime_err('class')
+    def __repr__(self) -> str:
+        return self.name
 
-        if inspect.isclass(instance):
-            # Decorator was applied to a classmethod.
-            return _raise_runtime_err('classmethod')
 
-        # Decorator was applied to an instancemethod.
-        return _raise_runtime_err('instancemethod')
+def _raising(wrapped: Any, applied_type: str) -> Callable:
+    def raise_runtime_err(*args, **kwargs):  # pylint: disable=unused-argument
+        raise RuntimeError(f"'change_signature' decorator should not"
+                           f" be applied to a {applied_type}.")
+    return update_wrapper(raise_runtime_err, wrapped, updated=())
 
-    return change
+
+def _is_method(function: Callable) -> bool:
+    # functions defined in a class body have the class in their qualified name
+    parent = getattr(function, '__qualname__', '').rpartition('.')[0]
+    return bool(parent) and not parent.endswith('<locals>')
+
+
+def change_signature(adapt_func, with_name: bool = True):
+    """
+    Returns a decorator which gives a function the signature of adapt_func with an
+    additional first argument 'name', e.g. for pytest to pass the test id and the
+    arguments of the system under test.
+
+    The wrapper is generated once from the signature, so a call costs a single
+    extra frame which passes all arguments on positionally: keyword arguments are
+    passed in the order of the signature, extra keyword arguments last.
+
+    Parameters
+    ----------
+    adapt_func : Callable
+        the function whose signature is adopted
+    with_name : bool
+        whether the argument 'name' is added. Default: True
+
+    Returns
+    -------
+    decorator : Callable[[Callable], Callable]
+        a decorator for a function accepting the name (if with_name) and the
+        arguments of adapt_func positionally. It must not be applied to classes or
+        methods.
+    """
+    signature = inspect.signature(adapt_func)
+    params = list(signature.parameters.values())
+    kind = inspect.Parameter.POSITIONAL_ONLY \
+        if params and params[0].kind is inspect.Parameter.POSITIONAL_ONLY \
+        else inspect.Parameter.POSITIONAL_OR_KEYWORD
+    namespace: Dict[str, Any] = {}
+    adapted = [inspect.Parameter('name', kind)] if with_name else []
+    arguments = ['name'] if with_name else []
+    for i, param in enumerate(params):
+        if param.default is not param.empty:
+            namespace[f'__default_{i}'] = param.default
+            param = param.replace(default=_Name(f'__default_{i}'))
+        adapted.append(param.replace(annotation=param.empty))
+        if param.kind is param.VAR_POSITIONAL:
+            arguments.append(f'*{param.name}')
+        elif param.kind is param.VAR_KEYWORD:
+            arguments.append(f'*{param.name}.values()')
+        else:
+            arguments.append(param.name)
+    adapted_signature = inspect.Signature(
+        adapted, return_annotation=inspect.Signature.empty
+    )
+
+    def adapt(wrapped):
+        source = (
+            f"def adapter{adapted_signature}:\n"
+            f"    return __wrapped({', '.join(arguments)})\n"
+        )
+        scope: Dict[str, Any] = {**namespace, '__wrapped': wrapped}
+        exec(compile(source, f"<change_signature {wrapped.__qualname__}>", 'exec'),  # nosec
+             scope)
+        adapter = update_wrapper(scope['adapter'], wrapped)
+        # the generated signature is the one to use, not that of the wrapped function
+        del adapter.__wrapped__
+        adapter.__annotations__ = {
+            param.name: param.annotation for param in params
+            if param.annotation is not param.empty
+        }
+        return adapter
+
+    def decorator(wrapped):
+        if inspect.isclass(wrapped):
+            return _raising(wrapped, 'class')
+        if isinstance(wrapped, classmethod):
+            return _raising(wrapped.__func__, 'classmethod')
+        if isinstance(wrapped, staticmethod):
+            return staticmethod(adapt(wrapped.__func__))
+        if _is_method(wrapped):
+            return _raising(wrapped, 'instancemethod')
+        return adapt(wrapped)
+
+    return decorator
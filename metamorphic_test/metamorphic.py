@@ -1,15 +1,53 @@
+import asyncio
 from dataclasses import dataclass, field
-import random
-from typing import Callable, Optional, List
+import logging
+from typing import Any, Callable, Dict, Optional, List, Sequence, Tuple
 
-from metamorphic_test.report.execution_report import MetamorphicExecutionReport
+
+from metamorphic_test.report.execution_report import (
+    MetamorphicExecutionReport,
+    SystemOutput,
+    TransformOutput,
+)
+from metamorphic_test.report.store import ReportStore
 from metamorphic_test.report.string_generator import StringReportGenerator
+from .aio import call, evaluate_async, follow_up_async, is_async, run
+from .batch import evaluate
+from .binding import ParameterBinding, Parameters
+from .cache import SourceOutputCache, TransformCache, cache_digest
+from .execution_plan import ExecutionPlan
+from .executor import Executor, FollowUpResult, FollowUpTask, SerialExecutor
 from .prioritized_transform import PrioritizedTransform
+from .replay import Replay, ReplayEntry
+from .rng import (
+    LazyStream, RandomStream, current_input_index, get_seed, input_digest, parameter_stream,
+    stream_key
+)
 from .transform import Transform
 from .rel import Relation
 from .logger import logger
 
 
+class _ReportMessage:
+    """Renders a report with the StringReportGenerator when it is formatted."""
+    __slots__ = ('report',)
+
+    def __init__(self, report: MetamorphicExecutionReport) -> None:
+        self.report = report
+
+    def __str__(self) -> str:
+        return StringReportGenerator(self.report).generate()
+
+
+def _is_randomized(transform: Transform) -> bool:
+    function: Optional[Callable] = transform
+    while function is not None:
+        if isinstance(function, ParameterBinding) and function.randomized:
+            return True
+        function = getattr(function, '__wrapped__', None)
+    return False
+
+
 @dataclass
 class MetamorphicTest:
     """
@@ -46,16 +84,64 @@ class MetamorphicTest:
         output and returns True if the relation holds, False otherwise.
     """
 
-    reports: List[MetamorphicExecutionReport] = field(
-        default_factory=lambda: []
+    reports: ReportStore = field(default_factory=ReportStore)
+    """
+    reports : ReportStore
+        the objects of MetamorphicExecutionReport which hold the reports generation
+        and logging logics for corresponding metamorphic tests, retained according
+        to the policy of the store.
+    """
+
+    samples: int = 1
+    """
+    samples : int
+        the number of follow-up inputs derived from each source input. With randomized
+        transformations, each follow-up input uses newly drawn arguments.
+    """
+
+    test_id: Optional[str] = field(default=None, compare=False)
+    """
+    test_id : Optional[str]
+        the identifier of the test in its suite. Together with the id of the source
+        input and the sample it keys the random stream of an execution, see
+        rng.stream_key. Defaults to the name.
+    """
+
+    last_reports: List[MetamorphicExecutionReport] = field(
+        default_factory=lambda: [], compare=False, repr=False
     )
     """
-    reports : List[MetamorphicExecutionReport]
-        a list of objects of MetamorphicExecutionReport which hold the reports generation
-        and logging logics for corresponding metamorphic tests.
+    last_reports : List[MetamorphicExecutionReport]
+        the reports of the latest execution, one per sample.
     """
 
-    def add_transform(self, transform: Transform, priority: int = 0) -> None:
+    _plan: Optional[ExecutionPlan] = field(
+        default=None, init=False, compare=False, repr=False
+    )
+
+    # whether a transformation or the relation is asynchronous, reset on registration
+    _async: Optional[bool] = field(default=None, init=False, compare=False, repr=False)
+
+    # the latest system and whether it is asynchronous
+    _async_system: Optional[Tuple[Callable, bool]] = field(
+        default=None, init=False, compare=False, repr=False
+    )
+
+    @property
+    def plan(self) -> ExecutionPlan:
+        """
+        The execution plan of the registered transformations. It is built on first
+        use and rebuilt after registering another transformation.
+        """
+        if self._plan is None:
+            self._plan = ExecutionPlan.build(self.transforms)
+        return self._plan
+
+    def add_transform(
+            self,
+            transform: Transform,
+            priority: int = 0, *,
+            deterministic: bool = False) -> None:
         """
         Registers a transformation to a metamorphic test object
 
@@ -71,6 +157,10 @@ class MetamorphicTest:
             transformation of interest in a multiple transformation chain
             scenario. Default: 0
 
+        deterministic : bool
+            Optional keyword argument marking the transformation as deterministic,
+            so that its results can be reused from a TransformCache. Default: False
+
         See Also
         --------
         decorator.transformation : registers a decorated function as a
@@ -78,7 +168,21 @@ class MetamorphicTest:
         suite.Suite.add_transform : registers a function as a transformation
                                   to a metamorphic test
         """
-        self.transforms.append(PrioritizedTransform(transform, priority))
+        if deterministic and _is_randomized(transform):
+            raise ValueError(
+                f"Randomized transformation {transform.__name__} of {self.name} "
+                "cannot be deterministic."
+            )
+        # transformations of the same name, e.g. lambdas, are told apart by their
+        # position among them, so that their drawn parameters are not mixed up
+        name = transform.__name__
+        same_name = sum(p_transform.get_name() == name for p_transform in self.transforms)
+        key = name if same_name == 0 else f"{name}#{same_name + 1}"
+        if any(p_transform.key == key for p_transform in self.transforms):
+            raise ValueError(f"Transformation {key} of {self.name} registered twice.")
+        self.transforms.append(PrioritizedTransform(transform, priority, deterministic, key))
+        self._plan = None
+        self._async = None
 
     def set_relation(self, relation: Relation) -> None:
         """
@@ -98,26 +202,356 @@ class MetamorphicTest:
         if self.relation:
             raise ValueError(f"Relation to {self.name} already set ({self.relation}).")
         self.relation = relation
+        self._async = None
+
+    def _new_report(
+            self,
+            system: Callable,
+            x: tuple,
+            input_index: int,
+            sample: int = 0) -> MetamorphicExecutionReport:
+        assert self.relation is not None
+        report = MetamorphicExecutionReport(
+            x[0] if len(x) == 1 else x,
+            system,
+            self.relation,
+            sample=sample
+        )
+        report.seed = get_seed()
+        report.stream_key = stream_key(self.test_id or self.name or '', input_index, sample)
+        return report
+
+    def _new_reports(
+            self,
+            system: Callable,
+            inputs: Sequence[tuple],
+            samples: int,
+            replay: Optional[Replay],
+            input_ids: Sequence[Optional[int]],
+            digest: bool
+    ) -> Tuple[
+        List[MetamorphicExecutionReport], Sequence[tuple], List[int], List[Optional[int]]
+    ]:
+        """
+        Creates the reports of the executions, samples per input, their random
+        streams keyed by input_ids or, for None, by the rng.input_digest of the
+        input. With a replay, only the executions it holds are
+        created and only their inputs are kept.
+
+        Returns the reports, the inputs, the index of the input of each report and
+        the cache.cache_digest of each input. The digests key the caches, they are
+        only computed if digest is set, so that an input is pickled at most once.
+        """
+        if len(input_ids) != len(inputs):
+            raise ValueError(
+                f"Got {len(input_ids)} input ids for {len(inputs)} inputs."
+            )
+        digests = [cache_digest(x) if digest else None for x in inputs]
+        reports, sources = [], []
+        for i, x in enumerate(inputs):
+            input_index = input_ids[i]
+            if input_index is None:
+                input_index = input_digest(x, digests[i])
+            for sample in range(samples):
+                report = self._new_report(system, x, input_index, sample)
+                if replay is None or replay.get(self.test_id, report.stream_key):
+                    reports.append(report)
+                    sources.append(i)
+        if replay is None:
+            return reports, inputs, sources, digests
+        kept = sorted(set(sources))
+        index = {i: j for j, i in enumerate(kept)}
+        return (reports, [inputs[i] for i in kept], [index[i] for i in sources],
+                [digests[i] for i in kept])
+
+    def _uses_caches(
+            self,
+            cache: Optional[SourceOutputCache],
+            transform_cache: Optional[TransformCache]) -> bool:
+        """Whether an execution looks up its input in one of the caches."""
+        return cache is not None or (
+            transform_cache is not None
+            and any(pt.deterministic for pt in self.transforms)
+        )
+
+    def _order_transforms(
+            self,
+            rng: RandomStream,
+            entry: Optional[ReplayEntry] = None) -> List[PrioritizedTransform]:
+        # Idea: given transformations (t1, 0), (t2, 0), (t3, 1), (t4, 2) which have been
+        #       registered in any order we want to apply them either in order t4, t3, t2, t1
+        #       or t4, t3, t1, t2. In other words: higher priority means first, same priority
+        #       means random order.
+        # The plan holds the priority buckets, only the order within a bucket is drawn.
+        transforms = self.plan.order(rng)
+        if entry is not None:
+            # the order is drawn anyway so that the stream is at the same state
+            by_key = {p_transform.key: p_transform for p_transform in transforms}
+            if len(by_key) == len(transforms) and sorted(by_key) == sorted(entry.transforms):
+                transforms = [by_key[key] for key in entry.transforms]
+        return transforms
+
+    def _streams(
+            self,
+            reports: Sequence[MetamorphicExecutionReport],
+            replay: Optional[Replay]
+    ) -> Tuple[List[LazyStream], List[Optional[ReplayEntry]]]:
+        """
+        Returns the random stream of each execution and its replay entry, if any.
+        Replayed executions use the recorded seed. A stream is only created if the
+        execution draws from it.
+        """
+        entries = [
+            replay.get(self.test_id, report.stream_key) if replay is not None else None
+            for report in reports
+        ]
+        rngs = []
+        for report, entry in zip(reports, entries):
+            assert report.stream_key is not None
+            if entry is not None:
+                report.seed = entry.seed
+            rngs.append(LazyStream(report.stream_key, report.seed))
+        return rngs, entries
+
+    def _draw_parameters(
+            self,
+            reports: Sequence[MetamorphicExecutionReport],
+            entries: Sequence[Optional[ReplayEntry]]) -> List[Dict[str, Parameters]]:
+        """
+        Returns the randomized arguments of the bindings among the transforms for
+        each execution, by transform key. The arguments of all samples of an input
+        are drawn with one ParameterBinding.draw_batch call per binding, from the
+        parameter stream of the input, so the values do not depend on the other
+        inputs of a batch. Recorded values of replayed executions take precedence.
+        """
+        bindings = [
+            (pt.key, pt.transform) for pt in self.transforms
+            if isinstance(pt.transform, ParameterBinding) and pt.transform.randomized
+        ]
+        parameters: List[Dict[str, Parameters]] = [{} for _ in reports]
+        inputs: Dict[tuple, List[int]] = {}
+        for i, report in enumerate(reports):
+            if bindings and report.stream_key is not None:
+                inputs.setdefault((report.stream_key[:2], report.seed), []).append(i)
+        for (key, seed), executions in inputs.items():
+            n = max(reports[i].sample for i in executions) + 1
+            rng = parameter_stream(key, seed)
+            for transform_key, binding in bindings:
+                drawn = binding.draw_batch(n, rng)
+                for i in executions:
+                    parameters[i][transform_key] = drawn[reports[i].sample]
+        for values, entry in zip(parameters, entries):
+            if entry is not None:
+                for transform_key, recorded in entry.parameters.items():
+                    values[transform_key] = {**values.get(transform_key, {}), **recorded}
+        return parameters
+
+    def _relate(self, report: MetamorphicExecutionReport) -> None:
+        assert self.relation is not None
+        try:
+            with report.register_relation_result() as set_:
+                set_(self.relation(report.output_x.output, report.output_y.output))
+        except Exception:  # pylint: disable=broad-except
+            pass  # the error is recorded in the report
+
+    async def _relate_async(self, report: MetamorphicExecutionReport) -> None:
+        assert self.relation is not None
+        try:
+            with report.register_relation_result() as set_:
+                set_(await call(
+                    self.relation, report.output_x.output, report.output_y.output
+                ))
+        except Exception:  # pylint: disable=broad-except
+            pass  # the error is recorded in the report
+
+    def _is_async(self, system: Callable) -> bool:
+        """
+        Whether the system, a transformation or the relation is asynchronous. The
+        answers are kept until another transformation or relation is registered
+        or another system is executed.
+        """
+        if self._async is None:
+            functions = [pt.transform for pt in self.transforms]
+            if self.relation is not None:
+                functions.append(self.relation)
+            self._async = any(is_async(function) for function in functions)
+        if self._async_system is None or self._async_system[0] != system:
+            self._async_system = system, is_async(system)
+        return self._async or self._async_system[1]
+
+    @staticmethod
+    def _plan_follow_up(
+            transforms: Sequence[PrioritizedTransform],
+            x: tuple,
+            cache: Optional[TransformCache],
+            rng: Optional[RandomStream] = None,
+            parameters: Optional[Dict[str, Parameters]] = None,
+            digest: Optional[int] = None) -> Tuple[FollowUpTask, List]:
+        """
+        Creates the follow-up task for applying transforms to x, starting from the
+        deepest cached result of the leading deterministic transforms. The randomized
+        arguments of the transforms are drawn from rng, unless they are given in
+        parameters by the key of the transform. digest is the content digest of x.
+
+        Returns the task and the cached results of the skipped transforms.
+        """
+        prefix: List = []
+        deterministic = MetamorphicTest._deterministic_prefix(transforms)
+        if cache is not None and deterministic:
+            prefix = cache.lookup(x, deterministic, digest)
+        if prefix:
+            x = (prefix[-1],) if len(x) == 1 else tuple(prefix[-1])
+        task = FollowUpTask(
+            [pt.transform for pt in transforms[len(prefix):]], x, rng, dict(parameters or {}),
+            [pt.key for pt in transforms[len(prefix):]]
+        )
+        return task, prefix
+
+    @staticmethod
+    def _complete_follow_up(
+            transforms: Sequence[PrioritizedTransform],
+            x: tuple,
+            prefix: List,
+            result: FollowUpResult,
+            cache: Optional[TransformCache],
+            digest: Optional[int] = None) -> FollowUpResult:
+        """
+        Prepends the cached results to the result of a task created by
+        _plan_follow_up and caches the new results of deterministic transforms.
+        """
+        cached: List[TransformOutput] = [TransformOutput() for _ in prefix]
+        for transform_result, output in zip(cached, prefix):
+            transform_result.output = output
+        result.transform_results = cached + result.transform_results
+        if cache is not None:
+            outputs: List = []
+            deterministic = MetamorphicTest._deterministic_prefix(transforms)
+            for transform_result in result.transform_results[:len(deterministic)]:
+                if not transform_result.is_set or transform_result.error is not None:
+                    break
+                outputs.append(transform_result.output)
+            if len(outputs) > len(prefix):
+                cache.store(x, deterministic, outputs, digest)
+        return result
+
+    @staticmethod
+    def _deterministic_prefix(transforms: Sequence[PrioritizedTransform]) -> List[Transform]:
+        prefix = []
+        for p_transform in transforms:
+            if not p_transform.deterministic:
+                break
+            prefix.append(p_transform.transform)
+        return prefix
+
+    def _log(self, report: MetamorphicExecutionReport) -> None:
+        level = logging.INFO if report.holds else logging.ERROR
+        if logger.isEnabledFor(level):
+            # the report is only rendered if a handler emits the record
+            logger.log(level, "\n%s\n", _ReportMessage(report))
+
+    @staticmethod
+    def _source_outputs(
+            system: Callable,
+            inputs: Sequence[tuple],
+            cache: Optional[SourceOutputCache],
+            batch_size: Optional[int],
+            digests: Sequence[Optional[int]]) -> List[SystemOutput]:
+        """
+        Takes the source outputs from the cache and evaluates the system on the
+        remaining source inputs.
+        """
+        keys, source_outputs, pending = MetamorphicTest._lookup_sources(
+            system, inputs, cache, digests
+        )
+        outputs = evaluate(system, [inputs[i] for i in pending], batch_size)
+        MetamorphicTest._store_sources(cache, keys, source_outputs, pending, outputs)
+        return source_outputs
+
+    @staticmethod
+    async def _source_outputs_async(
+            system: Callable,
+            inputs: Sequence[tuple],
+            cache: Optional[SourceOutputCache],
+            batch_size: Optional[int],
+            semaphore: Optional[asyncio.Semaphore],
+            digests: Sequence[Optional[int]]) -> List[SystemOutput]:
+        """The asynchronous counterpart of _source_outputs."""
+        keys, source_outputs, pending = MetamorphicTest._lookup_sources(
+            system, inputs, cache, digests
+        )
+        outputs = await evaluate_async(
+            system, [inputs[i] for i in pending], batch_size, semaphore
+        )
+        MetamorphicTest._store_sources(cache, keys, source_outputs, pending, outputs)
+        return source_outputs
+
+    @staticmethod
+    def _lookup_sources(
+            system: Callable,
+            inputs: Sequence[tuple],
+            cache: Optional[SourceOutputCache],
+            digests: Sequence[Optional[int]]) -> Tuple[list, List[SystemOutput], List[int]]:
+        """
+        Returns the cache keys of the inputs, their source outputs (set for cached
+        inputs only) and the indices of the inputs the system must be evaluated on.
+        """
+        keys = [None if cache is None else cache.key(system, x, digest)
+                for x, digest in zip(inputs, digests)]
+        source_outputs: List[SystemOutput] = [SystemOutput() for _ in inputs]
+        pending = []
+        for i, key in enumerate(keys):
+            found, output = (False, None) if cache is None else cache.lookup(key)
+            if found:
+                source_outputs[i].output = output
+            else:
+                pending.append(i)
+        return keys, source_outputs, pending
+
+    @staticmethod
+    def _store_sources(
+            cache: Optional[SourceOutputCache],
+            keys: list,
+            source_outputs: List[SystemOutput],
+            pending: List[int],
+            outputs: List[SystemOutput]) -> None:
+        for i, output in zip(pending, outputs):
+            source_outputs[i] = output
+            if cache is not None and output.error is None:
+                cache.store(keys[i], output.output)
 
-    # x: the actual input
     # system: the system under test
-    # Idea: given transformations (t1, 0), (t2, 0), (t3, 1), (t4, 2) which have been registered
-    #       in any order we want to apply them either in order t4, t3, t2, t1 or t4, t3, t1,
-    #       t2. In other words: higher priority means first, same priority means random order.
-    # (1) shuffle all transforms
-    # (2) sort the transforms by priority
-    # Note: (1) + (2) implements the idea above
-    # (3) apply the transforms one after the other two the input 'x' to obtain the output 'y'
-    # (4) print some logging information
-    # (5) apply the system under test and assert the relation function
-    def execute(self, system: Callable, *x: tuple) -> None:
-        # pylint: disable-msg=too-many-locals
+    # inputs: the actual inputs, one tuple of arguments per execution
+    # (1) take the source outputs from the cache, evaluate the system on the rest
+    # (2) derive 'samples' follow-up tasks from each input whose source output could
+    #     be computed, each with its own transform order
+    # (3) let the executor apply the transforms (each time drawing new randomized
+    #     arguments) and evaluate the system on the follow-up inputs
+    # (4) check the relation and log the reports
+    # Note: a batched system is called once per chunk of inputs in (1) and (3)
+    def execute_batch(
+            self,
+            system: Callable,
+            inputs: Sequence[tuple], *,
+            cache: Optional[SourceOutputCache] = None,
+            batch_size: Optional[int] = None,
+            samples: Optional[int] = None,
+            executor: Optional[Executor] = None,
+            concurrency: Optional[int] = None,
+            transform_cache: Optional[TransformCache] = None,
+            replay: Optional[Replay] = None,
+            input_ids: Optional[Sequence[Optional[int]]] = None
+    ) -> List[MetamorphicExecutionReport]:
         """
-        Executes the metamorphic test defined in the object and generate
-        reports
+        Executes the metamorphic test on several inputs at once and generates one
+        report per input and sample.
 
-        Note: This method is internally called from suite.Suite.execute
-              with corresponding test_id
+        Errors of the system, the transforms or the relation do not propagate
+        but are recorded in the report of the affected input.
+
+        If the system, a transformation or the relation is a coroutine function,
+        the test is run by execute_batch_async in a new event loop, on a separate
+        thread if an event loop is running already (see aio.run). Await
+        execute_batch_async instead to run it in the running event loop.
 
         Parameters
         ----------
@@ -125,74 +559,339 @@ class MetamorphicTest:
             a function (or callable) which needs to be tested. This refers to the
             function decorated with decorator.system
 
-        x : tuple
-            actual inputs for the system under test
+        inputs : Sequence[tuple]
+            the actual inputs for the system under test, one tuple of arguments
+            per execution
+
+        cache : Optional[SourceOutputCache]
+            Optional cache for the outputs of the system on the source inputs.
+            Default: None
+
+        batch_size : Optional[int]
+            If given, the system is batched: it receives one list per argument
+            holding the arguments of up to batch_size evaluations and returns a
+            sequence of outputs. Default: None
+
+        samples : Optional[int]
+            The number of follow-up inputs per source input. Each follow-up input
+            is derived with newly drawn randomized arguments and checked against
+            the same source output. Defaults to the samples of the test.
+
+        executor : Optional[Executor]
+            The executor running the transformations and evaluating the system on
+            the follow-up inputs. Defaults to running them in the current process.
+
+        concurrency : Optional[int]
+            The maximum number of concurrent calls of an asynchronous system, see
+            execute_batch_async. Default: None
+
+        transform_cache : Optional[TransformCache]
+            Optional cache for the results of the leading deterministic transforms.
+            A follow-up input starts from the deepest cached result, e.g. of another
+            test applying the same first transform to the same input. Default: None
+
+        replay : Optional[Replay]
+            Failed executions to run again. An execution with an entry uses the
+            recorded seed, transform order and randomized arguments. Default: None
+
+        input_ids : Optional[Sequence[Optional[int]]]
+            The id of each input in the random stream keys of its executions, e.g.
+            its index in a dataset, or None to key it by its rng.input_digest, which
+            pickles the input. Executions draw the same transform orders and
+            randomized arguments whenever the test, the id and the seed are the
+            same. Defaults to the positions of the inputs.
+
+        Returns
+        -------
+        reports : List[MetamorphicExecutionReport]
+            the reports of the executions in the order of the inputs, the samples
+            of one input following each other
 
         See Also
         --------
-        decorator.system : Identifies the function decorated with this decorator as
-                           a SystemUnderTest and executes all the metamorphic tests
-        suite.Suite.execute : Execute a metamorphic test on a system under test
+        batch.evaluate : evaluates a (batched) system on several inputs
         """
-
         if not self.relation:
             raise ValueError(
                 f"No relation registered on {self.name}, cannot execute test."
             )
+        if self._is_async(system):
+            return run(self.execute_batch_async(
+                system, inputs,
+                cache=cache,
+                batch_size=batch_size,
+                samples=samples,
+                concurrency=concurrency,
+                transform_cache=transform_cache,
+                replay=replay,
+                input_ids=input_ids
+            ))
 
-        random.shuffle(self.transforms)
+        samples = self.samples if samples is None else samples
+        if samples < 1:
+            raise ValueError(f"Number of samples must be positive, got {samples}.")
+        reports, inputs, sources, digests = self._new_reports(
+            system, inputs, samples, replay,
+            range(len(inputs)) if input_ids is None else input_ids,
+            self._uses_caches(cache, transform_cache)
+        )
+        rngs, entries = self._streams(reports, replay)
+        parameters = self._draw_parameters(reports, entries)
+        try:
+            source_outputs = self._source_outputs(system, inputs, cache, batch_size, digests)
+            pending: List[int] = []
+            tasks: List[FollowUpTask] = []
+            prefixes: List[List] = []
+            for i, report in enumerate(reports):
+                report.output_x = source_outputs[sources[i]]
+                if report.output_x.error is None:
+                    entry = entries[i]
+                    report.transforms = self._order_transforms(rngs[i], entry)
+                    task, prefix = self._plan_follow_up(
+                        report.transforms, inputs[sources[i]], transform_cache, rngs[i],
+                        parameters[i], digests[sources[i]]
+                    )
+                    pending.append(i)
+                    tasks.append(task)
+                    prefixes.append(prefix)
+            results = (executor or SerialExecutor()).run(system, tasks, batch_size)
+            for i, prefix, result in zip(pending, prefixes, results):
+                result = self._complete_follow_up(
+                    reports[i].transforms, inputs[sources[i]], prefix, result,
+                    transform_cache, digests[sources[i]]
+                )
+                reports[i].transform_results = result.transform_results
+                reports[i].parameters = result.parameters
+                if result.output_y is not None:
+                    reports[i].output_y = result.output_y
+                    if result.output_y.error is None:
+                        self._relate(reports[i])
+        finally:
+            self.last_reports = reports
+            for report in reports:
+                self.reports.append(report)
+                self._log(report)
+        return reports
 
-        singular = len(x) == 1
+    # (1) evaluate the system on the source inputs and derive the follow-up inputs
+    #     and outputs concurrently, the calls of the system bounded by a semaphore
+    # (2) keep the follow-ups of the executions whose source output could be computed
+    # (3) check the relation and log the reports
+    async def execute_batch_async(
+            self,
+            system: Callable,
+            inputs: Sequence[tuple], *,
+            cache: Optional[SourceOutputCache] = None,
+            batch_size: Optional[int] = None,
+            samples: Optional[int] = None,
+            concurrency: Optional[int] = None,
+            transform_cache: Optional[TransformCache] = None,
+            replay: Optional[Replay] = None,
+            input_ids: Optional[Sequence[Optional[int]]] = None
+    ) -> List[MetamorphicExecutionReport]:
+        """
+        The asynchronous counterpart of execute_batch. Coroutine functions among
+        the system, the transformations and the relation are awaited, and all
+        evaluations of the system on source and follow-up inputs run concurrently.
 
-        report = MetamorphicExecutionReport(
-            x[0] if singular else x,
-            system,
-            self.relation
-        )
+        The follow-ups always run in the current event loop, the executor of the
+        suite is not used.
+
+        Parameters
+        ----------
+        system : Callable
+            the system under test, a function or coroutine function
+
+        inputs : Sequence[tuple]
+            the actual inputs, one tuple of arguments per execution
+
+        cache : Optional[SourceOutputCache]
+            see execute_batch. Default: None
+
+        batch_size : Optional[int]
+            see execute_batch. Default: None
+
+        samples : Optional[int]
+            see execute_batch. Defaults to the samples of the test.
 
-        successful_system_x = False
-        successful_system_y = False
-        successful_relation = False
+        concurrency : Optional[int]
+            The maximum number of concurrent calls of the system or None for no
+            limit. Default: None
 
+        transform_cache : Optional[TransformCache]
+            see execute_batch. Default: None
+
+        replay : Optional[Replay]
+            see execute_batch. Default: None
+
+        input_ids : Optional[Sequence[Optional[int]]]
+            see execute_batch. Defaults to the positions of the inputs.
+
+        Returns
+        -------
+        reports : List[MetamorphicExecutionReport]
+            the reports of the executions, see execute_batch
+        """
+        if not self.relation:
+            raise ValueError(
+                f"No relation registered on {self.name}, cannot execute test."
+            )
+
+        samples = self.samples if samples is None else samples
+        if samples < 1:
+            raise ValueError(f"Number of samples must be positive, got {samples}.")
+        if concurrency is not None and concurrency < 1:
+            raise ValueError(f"Concurrency must be positive, got {concurrency}.")
+        semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+        reports, inputs, sources, digests = self._new_reports(
+            system, inputs, samples, replay,
+            range(len(inputs)) if input_ids is None else input_ids,
+            self._uses_caches(cache, transform_cache)
+        )
+        rngs, entries = self._streams(reports, replay)
+        parameters = self._draw_parameters(reports, entries)
         try:
-            with report.register_output_x() as set_:
-                system_x = system(*x)
-                successful_system_x = True
-                set_(system_x)
-
-            y = x[0] if singular else x
-            prio_sorted_transforms = sorted(
-                self.transforms,
-                key=lambda tp: tp.priority,
-                reverse=True
+            orders = [
+                self._order_transforms(rng, entry) for rng, entry in zip(rngs, entries)
+            ]
+            tasks, prefixes = zip(*[
+                self._plan_follow_up(
+                    order, inputs[sources[i]], transform_cache, rngs[i], parameters[i],
+                    digests[sources[i]]
+                )
+                for i, order in enumerate(orders)
+            ]) if reports else ((), ())
+            source_outputs, results = await asyncio.gather(
+                self._source_outputs_async(
+                    system, inputs, cache, batch_size, semaphore, digests
+                ),
+                follow_up_async(system, tasks, batch_size, semaphore)
             )
-            report.transforms = prio_sorted_transforms
+            for i, (report, order, result) in enumerate(zip(reports, orders, results)):
+                result = self._complete_follow_up(
+                    order, inputs[sources[i]], prefixes[i], result, transform_cache,
+                    digests[sources[i]]
+                )
+                report.output_x = source_outputs[sources[i]]
+                if report.output_x.error is not None:
+                    continue
+                report.transforms = order
+                report.transform_results = result.transform_results
+                report.parameters = result.parameters
+                if result.output_y is not None:
+                    report.output_y = result.output_y
+                    if result.output_y.error is None:
+                        await self._relate_async(report)
+        finally:
+            self.last_reports = reports
+            for report in reports:
+                self.reports.append(report)
+                self._log(report)
+        return reports
 
-            for i, p_transform in enumerate(prio_sorted_transforms):
-                with report.register_transform_result(i) as set_:
-                    y = p_transform.transform(y) if singular else p_transform.transform(*y)
-                    set_(y)
+    # x: the actual input
+    # system: the system under test
+    # (1) execute the test on the single input x (once per sample)
+    # (2) raise if an execution failed
+    def execute(
+            self,
+            system: Callable,
+            *x: Any,
+            cache: Optional[SourceOutputCache] = None,
+            batch_size: Optional[int] = None,
+            samples: Optional[int] = None,
+            executor: Optional[Executor] = None,
+            concurrency: Optional[int] = None,
+            transform_cache: Optional[TransformCache] = None,
+            replay: Optional[Replay] = None) -> None:
+        """
+        Executes the metamorphic test defined in the object and generate
+        reports
 
-            with report.register_output_y() as set_:
-                system_y = system(y) if singular else system(*y)
-                successful_system_y = True
-                set_(system_y)
+        Note: This method is internally called from suite.Suite.execute
+              with corresponding test_id
 
-            with report.register_relation_result() as set_:
-                relation_result = self.relation(system_x, system_y)
-                successful_relation = True
-                set_(relation_result)
-
-            assert relation_result, \
-                f"{self.name} failed: " \
-                f"x: {x[0] if singular else x}, " \
-                f"transform: {', '.join([t.get_name() for t in prio_sorted_transforms])}, " \
-                f"relation: {self.relation.__name__}"
-        finally:
-            self.reports.append(report)
-            msg = f"\n{StringReportGenerator(report).generate()}\n"
-            if successful_system_x and successful_system_y and successful_relation and \
-                    relation_result:
-                logger.info(msg)
-            else:
-                logger.error(msg)
+        Parameters
+        ----------
+        system : Callable
+            a function (or callable) which needs to be tested. This refers to the
+            function decorated with decorator.system
+
+        x : tuple
+            actual inputs for the system under test. Its random streams are keyed
+            by the index of the pytest parameter set it was taken from, see
+            rng.use_input_index, or else by the rng.input_digest of x.
+
+        cache : Optional[SourceOutputCache]
+            Optional cache for the output of the system on the source input. If
+            given, the system is only evaluated on x if no other test evaluated
+            it on the same input before. Default: None
+
+        batch_size : Optional[int]
+            If given, the system is batched, see execute_batch. Default: None
+
+        samples : Optional[int]
+            The number of follow-up inputs derived from x, see execute_batch.
+            Defaults to the samples of the test.
+
+        executor : Optional[Executor]
+            The executor for the follow-up inputs, see execute_batch.
+            Default: None
+
+        concurrency : Optional[int]
+            The maximum number of concurrent calls of an asynchronous system, see
+            execute_batch_async. Default: None
+
+        transform_cache : Optional[TransformCache]
+            Optional cache for the results of deterministic transforms, see
+            execute_batch. Default: None
+
+        replay : Optional[Replay]
+            Failed executions to run again, see execute_batch. Default: None
+
+        See Also
+        --------
+        decorator.system : Identifies the function decorated with this decorator as
+                           a SystemUnderTest and executes all the metamorphic tests
+        suite.Suite.execute : Execute a metamorphic test on a system under test
+        """
+        reports = self.execute_batch(
+            system, [x],
+            cache=cache,
+            batch_size=batch_size,
+            samples=samples,
+            executor=executor,
+            concurrency=concurrency,
+            transform_cache=transform_cache,
+            replay=replay,
+            input_ids=[current_input_index()]
+        )
+        self.check(reports)
+
+    # (1) propagate the first error of the executions, if any
+    # (2) assert the relation for all samples
+    def check(self, reports: Sequence[MetamorphicExecutionReport]) -> None:
+        """
+        Raises if an execution of the test failed: the first error which occurred
+        during the executions, or an AssertionError if the relation does not hold.
+
+        Parameters
+        ----------
+        reports : Sequence[MetamorphicExecutionReport]
+            the reports of the executions on one input, one per sample
+        """
+        for report in reports:
+            if report.error is not None:
+                raise report.error
+        failed = [report for report in reports if not report.relation_result.output]
+        if failed:
+            report = failed[0]
+            failed_samples = '' if len(reports) == 1 else \
+                f" for {len(failed)} of {len(reports)} samples"
+            raise AssertionError(
+                f"{self.name} failed{failed_samples}: "
+                f"x: {report.input_x}, "
+                f"transform: {', '.join([t.get_name() for t in report.transforms])}, "
+                f"relation: {report.relation.__name__}, "
+                f"seed: {report.seed}"
+            )
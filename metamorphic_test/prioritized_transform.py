@@ -25,6 +25,23 @@ class PrioritizedTransform:
     priority : int
         The priority of the transformation function which defaults to 0.
     """
+    deterministic: bool = False
+    """
+    deterministic : bool
+        Whether the transformation always returns the same output for the same
+        input, so that its results may be reused. Defaults to False.
+    """
+    key: str = ''
+    """
+    key : str
+        The unique key of the transformation in its test, by which its drawn
+        parameters and its position in a replayed order are recorded. Defaults to
+        the name of the transformation.
+    """
+
+    def __post_init__(self) -> None:
+        if not self.key:
+            self.key = self.get_name()
 
     def get_name(self) -> str:
         """
@@ -0,0 +1,161 @@
+from dataclasses import asdict, dataclass, field
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from .binding import Parameters
+from .logger import logger
+from .report.execution_report import MetamorphicExecutionReport
+from .rng import StreamKey
+
+
+@dataclass
+class ReplayEntry:
+    """
+    Everything needed to run one failed execution again: where it ran, its random
+    stream and the randomized arguments it drew.
+    """
+    nodeid: str
+    """
+    nodeid : str
+        The pytest node id of the test which executed it.
+    """
+    test_id: str
+    """
+    test_id : str
+        The identifier of the metamorphic test.
+    """
+    seed: int
+    """
+    seed : int
+        The session seed of the execution.
+    """
+    stream_key: StreamKey
+    """
+    stream_key : StreamKey
+        The key of the random stream of the execution, see rng.stream_key.
+    """
+    transforms: List[str] = field(default_factory=lambda: [])
+    """
+    transforms : List[str]
+        The names of the transformations in the order they were applied.
+    """
+    parameters: Dict[str, Parameters] = field(default_factory=lambda: {})
+    """
+    parameters : Dict[str, Parameters]
+        The randomized arguments drawn for each transformation, by name. Arguments
+        which cannot be written as JSON are left out and drawn again from the stream.
+    """
+
+
+def _stream_key(key: Sequence[int]) -> StreamKey:
+    # read from JSON as a list
+    first, second, third = key
+    return first, second, third
+
+
+def _jsonable(parameters: Parameters) -> Parameters:
+    values = {}
+    for arg, value in parameters.items():
+        if hasattr(value, 'item') and callable(value.item):
+            try:
+                value = value.item()  # numpy scalars
+            except (TypeError, ValueError):
+                pass
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            logger.debug("Cannot record argument %s=%r for replay.", arg, value)
+            continue
+        values[arg] = value
+    return values
+
+
+def replay_entries(
+        nodeid: str,
+        test_id: str,
+        reports: Iterable[MetamorphicExecutionReport]) -> List[ReplayEntry]:
+    """Returns the replay entries of the failed executions among reports."""
+    return [
+        ReplayEntry(
+            nodeid=nodeid,
+            test_id=test_id,
+            seed=report.seed,
+            stream_key=report.stream_key,
+            transforms=[p_transform.key for p_transform in report.transforms],
+            parameters={
+                key: _jsonable(parameters)
+                for key, parameters in report.parameters.items()
+            },
+        )
+        for report in reports
+        if not report.holds and report.seed is not None and report.stream_key is not None
+    ]
+
+
+def write_entries(path: Union[str, Path], entries: Iterable[ReplayEntry]) -> None:
+    """Appends the entries to a replay file, one JSON object per line."""
+    with open(path, 'a', encoding='utf-8') as file:
+        for entry in entries:
+            file.write(json.dumps(asdict(entry)) + '\n')
+
+
+class Replay:
+    """
+    The failed executions to run again, read from a replay file.
+
+    When a metamorphic test executes an input which has an entry, the execution
+    uses the recorded seed, transform order and randomized arguments. Entries which
+    no execution matched, e.g. because the inputs changed since they were
+    recorded, are returned by unmatched().
+
+    See Also
+    --------
+    replay_entries : creates the entries of failed executions
+    """
+
+    def __init__(self, entries: Iterable[ReplayEntry]) -> None:
+        self._entries: Dict[Tuple[str, StreamKey], ReplayEntry] = {}
+        self._matched: Set[Tuple[str, StreamKey]] = set()
+        self._nodeids: Set[str] = set()
+        for entry in entries:
+            # systems listing the same test draw the same stream for the same input
+            self._entries[entry.test_id, _stream_key(entry.stream_key)] = entry
+            self._nodeids.add(entry.nodeid)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'Replay':
+        """Reads a replay file written by write_entries."""
+        entries = []
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    data: Dict[str, Any] = json.loads(line)
+                    entries.append(ReplayEntry(**data))
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def nodeids(self) -> Set[str]:
+        """The pytest node ids of the tests to run again."""
+        return set(self._nodeids)
+
+    def get(self, test_id: Optional[str], key: Optional[StreamKey]) -> Optional[ReplayEntry]:
+        """Returns the entry of an execution, if it is replayed."""
+        if test_id is None or key is None:
+            return None
+        entry = self._entries.get((test_id, _stream_key(key)))
+        if entry is not None:
+            self._matched.add((test_id, _stream_key(key)))
+        return entry
+
+    def unmatched(self, nodeid: Optional[str] = None) -> List[ReplayEntry]:
+        """
+        Returns the entries (of the given pytest node id) which no execution has
+        matched so far.
+        """
+        return [
+            entry for key, entry in self._entries.items()
+            if key not in self._matched and nodeid in (None, entry.nodeid)
+        ]
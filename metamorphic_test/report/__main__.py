@@ -0,0 +1,20 @@
+"""Converts a report stream, e.g. of a crashed run, to the session HTML report."""
+import argparse
+from pathlib import Path
+
+from .session_report import render_session_html
+from .stream import read_stream
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('stream', help="the JSON Lines file written by ReportStream")
+    parser.add_argument('html', help="the HTML file to write")
+    args = parser.parse_args()
+    rows, functions = read_stream(args.stream)
+    Path(args.html).write_text(render_session_html(rows, functions), encoding='utf-8')
+    print(f"{len(rows)} executions written to {args.html}")
+
+
+if __name__ == '__main__':
+    main()
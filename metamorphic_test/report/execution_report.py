@@ -1,5 +1,5 @@
 from contextlib import contextmanager
-from typing import Callable, Generic, List, TypeVar
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
 
 from metamorphic_test.prioritized_transform import PrioritizedTransform
 
@@ -37,6 +37,16 @@ class FunctionOutput(Generic[T]):
         self._set = True
         self._error = value
 
+    @property
+    def is_set(self) -> bool:
+        return self._set
+
+    def result(self) -> T:
+        """Returns the output or raises the error of the function."""
+        if self._error is not None:
+            raise self._error
+        return self._output
+
     def __str__(self):
         if self._set:
             if self.error:
@@ -64,12 +74,21 @@ class MetamorphicExecutionReport:
     | ...                                      |
     transform_result[-1] --- system ------> output_y
     """
-    def __init__(self,
-        input_x,
-        system: Callable,
-        relation: Callable
-    ):
+    def __init__(
+            self,
+            input_x,
+            system: Callable,
+            relation: Callable,
+            sample: int = 0):
         self.input_x = input_x
+        self.sample = sample
+        """Index of the follow-up input derived from input_x."""
+        self.seed: Optional[int] = None
+        """The session seed the random stream of the execution was derived from."""
+        self.stream_key: Optional[Tuple[int, int, int]] = None
+        """The key of the random stream of the execution, see rng.stream_key."""
+        self.parameters: Dict[str, Dict[str, Any]] = {}
+        """The randomized arguments drawn for each transformation, by name."""
         self._transforms: List[PrioritizedTransform] = []
         self.transform_results: List[TransformOutput] = []
         self.system = system
@@ -88,6 +107,20 @@ class MetamorphicExecutionReport:
         self._transforms = value
         self.transform_results = [TransformOutput() for _ in value]
 
+    @property
+    def error(self) -> Optional[Exception]:
+        """The first error which occurred during the execution, if any."""
+        outputs = [self.output_x, *self.transform_results, self.output_y, self.relation_result]
+        for output in outputs:
+            if output.error is not None:
+                return output.error
+        return None
+
+    @property
+    def holds(self) -> bool:
+        """Whether the execution succeeded and the relation holds."""
+        return self.error is None and self.relation_result.output is True
+
     @contextmanager
     def register_transform_result(self, i: int):
         """
@@ -1,6 +1,8 @@
+from functools import lru_cache
 import inspect
 from pathlib import Path
-from typing import Callable, List
+from types import CodeType
+from typing import Callable, Dict, List, Optional, Tuple
 import traceback
 import uuid
 
@@ -30,11 +32,29 @@ def _code_spaces(s: str) -> str:
     return s.replace(' ', '&nbsp;')
 
 
+# source fragments by code object (and name, which closures may change), so the
+# source of a function is only read once
+_function_fragments: Dict[Tuple[CodeType, str], str] = {}
+
+
 def _function_html(function: Callable) -> str:
     """Create HTML for a function which can be hovered for source code."""
-    source_code = inspect.getsource(function)
+    # show the source of the transformation, not of its fixed/randomized binding
+    function = inspect.unwrap(function)
+    code: Optional[CodeType] = getattr(function, '__code__', None)
+    if code is None:  # e.g. a callable object
+        return _render_function_html(function)
+    key = (code, function.__name__)
+    fragment = _function_fragments.get(key)
+    if fragment is None:
+        fragment = _function_fragments[key] = _render_function_html(function)
+    return fragment
+
+
+def _render_function_html(function: Callable) -> str:
+    lines, source_line = inspect.getsourcelines(function)
+    source_code = ''.join(lines)
     source_file = inspect.getsourcefile(function)
-    source_line = inspect.getsourcelines(function)[1]
     return f'''
     <div class="metamorphic__function">
         <span>
@@ -57,7 +77,9 @@ def error_html(error: Exception) -> str:
         return '<span class="metamorphic__error">does not hold</span>'
     full_error_str = ''.join(
         traceback.format_exception(type(error), error, error.__traceback__))
-    error_str = traceback.format_tb(error.__traceback__)[-1]
+    frames = traceback.format_tb(error.__traceback__)
+    # errors sent back by worker processes have no traceback
+    error_str = frames[-1] if frames else f"{type(error).__name__}: {error}"
     error_id = f'metamorphic_error_{uuid.uuid4()}'
     return f'''
     <span id="{error_id}" class="metamorphic__error">
@@ -78,6 +100,11 @@ def placeholder_html(s: str) -> str:
     return f'<i>{s}</i>'
 
 
+@lru_cache(maxsize=None)
+def _read_asset(name: str) -> str:
+    return (Path(__file__).parent / name).read_text(encoding='utf-8')
+
+
 class HTMLReportGenerator(ReportGenerator):
     """
     Produces an HTML table like this:
@@ -194,17 +221,26 @@ class HTMLReportGenerator(ReportGenerator):
         return f'<table class="metamorphic__table">{table_inner}</table>'
 
     def _get_js(self):
-        return (Path(__file__).parent / "js" / "report.js").read_text()
+        return _read_asset("js/report.js")
 
     def _get_css(self):
-        return (Path(__file__).parent / "css" / "report.css").read_text()
+        return _read_asset("css/report.css")
 
     def _get_inline_assets(self):
+        return self.inline_assets(self.include_js, self.include_css)
+
+    @staticmethod
+    def inline_assets(include_js: bool = True, include_css: bool = True) -> str:
+        """
+        Returns the script and style the tables rely on. They are only needed once
+        per HTML document, e.g. generate tables with include_js=False and
+        include_css=False and add these assets once.
+        """
         assets = ""
-        if self.include_js:
-            assets += f'<script type="text/javascript">{self._get_js()}</script>'
-        if self.include_css:
-            assets += f'<style type="text/css">{self._get_css()}</style>'
+        if include_js:
+            assets += f'<script type="text/javascript">{_read_asset("js/report.js")}</script>'
+        if include_css:
+            assets += f'<style type="text/css">{_read_asset("css/report.css")}</style>'
         return assets
 
     def generate(self) -> str:
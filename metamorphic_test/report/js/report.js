@@ -4,5 +4,169 @@ window.metamorphic = {
         const fullError = document.getElementById(`${errorId}_full`);
         normalError.classList.toggle('metamorphic__hidden');
         fullError.classList.toggle('metamorphic__hidden');
+    },
+
+    // Height of a row of the session table in pixels, see session.css.
+    ROW_HEIGHT: 28,
+
+    escape(s) {
+        return String(s)
+            .replace(/&/g, '&amp;')
+            .replace(/</g, '&lt;')
+            .replace(/>/g, '&gt;')
+            .replace(/"/g, '&quot;');
+    },
+
+    functionHtml(fn) {
+        const name = this.escape(fn.name);
+        if (fn.source === undefined) {
+            return `<div class="metamorphic__function"><span>${name}</span></div>`;
+        }
+        const source = this.escape(fn.source).replace(/ /g, '&nbsp;').replace(/\n/g, '<br>');
+        return `<div class="metamorphic__function"><span>${name}</span>`
+            + `<div class="metamorphic__function_src"><div>${this.escape(fn.file)}, line ${fn.line}:</div>`
+            + `<code>${source}</code></div></div>`;
+    },
+
+    errorHtml(error, id) {
+        const short = this.escape(error.short).replace(/\n/g, '<br>');
+        const full = this.escape(error.full).replace(/\n/g, '<br>');
+        return `<span id="${id}" class="metamorphic__error">${short}</span>`
+            + `<span id="${id}_full" class="metamorphic__error metamorphic__hidden">${full}</span>`
+            + `<button class="metamorphic__error_button" `
+            + `onclick="metamorphic.toggleFullError('${id}')">Toggle full error</button>`;
+    },
+
+    // Renders the diagram of one report of a session, like HTMLReportGenerator.
+    diagramHtml(row, functions, index) {
+        const skipped = '<i>(skipped)</i>';
+        const error = row.error ? this.errorHtml(row.error, `metamorphic_error_${index}`) : '';
+        const system = this.functionHtml(functions[row.system]);
+        const cells = [[row.x, `⇨ ${system} ⇨`, '|', row.fx === null ? error : row.fx]];
+        let failed = row.fx === null;
+        row.steps.forEach(([fn, output, parameters]) => {
+            let name = this.functionHtml(functions[fn]);
+            if (parameters) {
+                const args = Object.entries(parameters)
+                    .map(([arg, value]) => `${this.escape(arg)}=${this.escape(value)}`);
+                name += ` (${args.join(', ')})`;
+            }
+            cells.push([`⇩ ${name}`, '', '|', '']);
+            if (failed) {
+                cells.push([skipped, '', '|', '']);
+            } else if (output === null) {
+                cells.push([error, '', '|', '']);
+                failed = true;
+            } else {
+                cells.push([output, '', '|', '']);
+            }
+        });
+        if (row.fx !== null) {
+            if (cells.length === 1) {
+                cells.push(['', '', '|', '']);
+            }
+            const end = cells[cells.length - 1];
+            end[1] = `⇨ ${system}${failed ? ' <i>(skipped)</i>' : ''} ⇨`;
+            end[3] = failed ? skipped : (row.fy === null ? error : row.fy);
+            let holds = 'holds';
+            if (failed || row.fy === null) {
+                holds = skipped;
+            } else if (row.error) {
+                holds = `<br>${error}`;
+            } else if (!row.holds) {
+                holds = '<span class="metamorphic__error">does not hold</span>';
+            }
+            const middle = cells[Math.floor(cells.length / 2)];
+            middle[3] = `⇵ ${this.functionHtml(functions[row.relation])} ${holds}`;
+        }
+        const body = cells
+            .map(cell => `<tr>${cell.map(c => `<td class="metamorphic__td">${c}</td>`).join('')}</tr>`)
+            .join('');
+        return `<table class="metamorphic__table">${body}</table>`;
+    },
+
+    // Renders the reports of a session in a table which only creates the rows
+    // scrolled into view, filtered by metamorphic test, outcome and node id.
+    renderSession(root, data) {
+        const tests = [...new Set(data.rows.map(row => row.test))].sort();
+        root.innerHTML = `
+            <div class="metamorphic__filters">
+                <select class="metamorphic__filter_test">
+                    <option value="">all metamorphic tests</option>
+                    ${tests.map(t => `<option value="${this.escape(t)}">${this.escape(t)}</option>`).join('')}
+                </select>
+                <select class="metamorphic__filter_outcome">
+                    <option value="">all outcomes</option>
+                    <option value="failed">failed</option>
+                    <option value="passed">passed</option>
+                </select>
+                <input class="metamorphic__filter_node" type="search" placeholder="filter by test node">
+                <span class="metamorphic__count"></span>
+            </div>
+            <div class="metamorphic__viewport">
+                <div class="metamorphic__spacer"></div>
+            </div>
+            <div class="metamorphic__detail"></div>`;
+        const testFilter = root.querySelector('.metamorphic__filter_test');
+        const outcomeFilter = root.querySelector('.metamorphic__filter_outcome');
+        const nodeFilter = root.querySelector('.metamorphic__filter_node');
+        const count = root.querySelector('.metamorphic__count');
+        const viewport = root.querySelector('.metamorphic__viewport');
+        const spacer = root.querySelector('.metamorphic__spacer');
+        const detail = root.querySelector('.metamorphic__detail');
+        let visible = [];
+
+        const draw = () => {
+            const first = Math.floor(viewport.scrollTop / this.ROW_HEIGHT);
+            const last = Math.min(
+                visible.length, first + Math.ceil(viewport.clientHeight / this.ROW_HEIGHT) + 1
+            );
+            let rows = '';
+            for (let i = first; i < last; i++) {
+                const index = visible[i];
+                const row = data.rows[index];
+                const outcome = row.holds ? 'passed' : 'failed';
+                rows += `<div class="metamorphic__row metamorphic__${outcome}" `
+                    + `style="top: ${i * this.ROW_HEIGHT}px" data-index="${index}">`
+                    + `<span>${outcome}</span>`
+                    + `<span>${this.escape(row.test)}</span>`
+                    + `<span>${this.escape(row.node || '')}</span>`
+                    + `<span>sample ${row.sample + 1}</span></div>`;
+            }
+            spacer.innerHTML = rows;
+        };
+
+        const filter = () => {
+            const test = testFilter.value;
+            const outcome = outcomeFilter.value;
+            const node = nodeFilter.value;
+            visible = [];
+            data.rows.forEach((row, index) => {
+                if ((!test || row.test === test)
+                        && (!outcome || (outcome === 'passed') === row.holds)
+                        && (!node || (row.node || '').includes(node))) {
+                    visible.push(index);
+                }
+            });
+            count.textContent = `${visible.length} of ${data.rows.length} executions`;
+            spacer.style.height = `${visible.length * this.ROW_HEIGHT}px`;
+            viewport.scrollTop = 0;
+            draw();
+        };
+
+        viewport.addEventListener('scroll', () => window.requestAnimationFrame(draw));
+        [testFilter, outcomeFilter].forEach(f => f.addEventListener('change', filter));
+        nodeFilter.addEventListener('input', filter);
+        spacer.addEventListener('click', event => {
+            const target = event.target.closest('.metamorphic__row');
+            if (target) {
+                const index = Number(target.dataset.index);
+                const row = data.rows[index];
+                detail.innerHTML = `<b>${this.escape(row.node || row.test)}, `
+                    + `sample ${row.sample + 1}, seed ${row.seed}</b>`
+                    + this.diagramHtml(row, data.functions, index);
+            }
+        });
+        filter();
     }
-};
\ No newline at end of file
+};
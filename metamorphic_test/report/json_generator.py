@@ -0,0 +1,132 @@
+from html import escape
+import inspect
+import traceback
+from types import CodeType
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .execution_report import FunctionOutput, MetamorphicExecutionReport
+from .report_generator import ReportGenerator
+from .string_generator import summarize
+
+
+class FunctionTable:
+    """
+    The systems, transformations and relations referred to by JSON reports, each
+    stored once with its source and referred to by its index.
+    """
+
+    def __init__(self) -> None:
+        self.entries: List[Dict[str, Any]] = []
+        """
+        entries : List[Dict[str, Any]]
+            The name, source file, first line and source code of each function.
+        """
+        self._index: Dict[Hashable, int] = {}
+
+    def index(self, function: Callable) -> int:
+        """Returns the index of the function, adding it on first use."""
+        # show the source of the transformation, not of its fixed/randomized binding
+        function = inspect.unwrap(function)
+        code: Optional[CodeType] = getattr(function, '__code__', None)
+        name = getattr(function, '__name__', type(function).__name__)
+        key: Hashable = (code, name) if code is not None else id(function)
+        i = self._index.get(key)
+        if i is None:
+            i = self._index[key] = len(self.entries)
+            self.entries.append(_function_entry(function, name))
+        return i
+
+
+def _function_entry(function: Callable, name: str) -> Dict[str, Any]:
+    try:
+        lines, line = inspect.getsourcelines(function)
+        source_file = inspect.getsourcefile(function)
+    except (OSError, TypeError):  # e.g. builtins
+        return {'name': name}
+    return {'name': name, 'file': source_file, 'line': line, 'source': ''.join(lines)}
+
+
+def _error(error: Exception) -> Dict[str, str]:
+    frames = traceback.format_tb(error.__traceback__)
+    return {
+        # errors sent back by worker processes have no traceback
+        'short': frames[-1] if frames else f"{type(error).__name__}: {error}",
+        'full': ''.join(
+            traceback.format_exception(type(error), error, error.__traceback__)
+        ),
+    }
+
+
+class JSONReportGenerator(ReportGenerator):
+    """
+    Produces a compact, JSON serializable dictionary of a report, e.g. for the
+    session report, with these keys:
+
+    - test, node: the metamorphic test and the pytest node it ran in
+    - sample, seed, holds: the sample index, session seed and outcome
+    - system, relation: indices into the function table
+    - x, fx, fy: the HTML of input_x, output_x and output_y
+    - steps: [transform index, HTML of its result, drawn parameters] per transform
+    - error: the short and full traceback of the first error, if any
+
+    Values are rendered with visualize_input and visualize_output, or summarized
+    and escaped if these are not given.
+    """
+
+    def __init__(
+            self,
+            report: MetamorphicExecutionReport,
+            functions: Optional[FunctionTable] = None,
+            test: Optional[str] = None,
+            node: Optional[str] = None):
+        super().__init__(report)
+        self.functions = FunctionTable() if functions is None else functions
+        self.test = test
+        self.node = node
+
+    # a function to change how the inputs look, returning HTML
+    visualize_input: Optional[Callable[..., str]] = None
+    # a function to change how the outputs look, returning HTML
+    visualize_output: Optional[Callable[..., str]] = None
+
+    @staticmethod
+    def _html(value: Any, visualize: Optional[Callable[..., str]]) -> Optional[str]:
+        if isinstance(value, FunctionOutput):
+            if not value.is_set or value.error is not None:
+                return None
+            value = value.output
+        if visualize is not None:
+            return visualize(value)
+        return escape(summarize(value))
+
+    def generate(self) -> Dict[str, Any]:
+        report = self.report
+        steps = []
+        for p_transform, result in zip(report.transforms, report.transform_results):
+            key = p_transform.key
+            step: List[Any] = [
+                self.functions.index(p_transform.transform),
+                self._html(result, self.visualize_input),
+            ]
+            if report.parameters.get(key):
+                step.append({
+                    arg: summarize(value) for arg, value in report.parameters[key].items()
+                })
+            steps.append(step)
+        data: Dict[str, Any] = {
+            'test': self.test,
+            'node': self.node,
+            'sample': report.sample,
+            'seed': report.seed,
+            'holds': report.holds,
+            'system': self.functions.index(report.system),
+            'relation': self.functions.index(report.relation),
+            'x': self._html(report.input_x, self.visualize_input),
+            'fx': self._html(report.output_x, self.visualize_output),
+            'steps': steps,
+            'fy': self._html(report.output_y, self.visualize_output),
+        }
+        error = report.error
+        if error is not None:
+            data['error'] = _error(error)
+        return data
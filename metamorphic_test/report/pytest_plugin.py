@@ -1,9 +1,31 @@
-from typing import Callable
+from pathlib import Path
+from typing import Callable, Optional, Tuple
 import pytest
 
 from metamorphic_test.suite import TestID
 from metamorphic_test.decorator import suite
+from metamorphic_test.executor import ProcessPoolExecutor, SerialExecutor
+from metamorphic_test.replay import Replay, replay_entries, write_entries
+from metamorphic_test.report.store import RetentionPolicy
+from metamorphic_test.rng import get_seed, parameter_set_index, set_seed, use_input_index
 from metamorphic_test.report.html_generator import HTMLReportGenerator
+from metamorphic_test.report.session_report import SessionReportWriter
+from metamorphic_test.report.stream import ReportStream
+from metamorphic_test.visualization import wait_all
+
+
+# where the failed executions of the session are recorded for --metamorphic-replay
+record_path_key = pytest.StashKey[Optional[Path]]()
+recorded_key = pytest.StashKey[int]()
+record_started_key = pytest.StashKey[bool]()
+# whether the script and style of the diagrams are in the HTML report already
+assets_key = pytest.StashKey[bool]()
+session_report_key = pytest.StashKey[Optional[SessionReportWriter]]()
+report_stream_key = pytest.StashKey[Optional[ReportStream]]()
+# the passed and failed metamorphic tests of collapsed items
+sub_results_key = pytest.StashKey[Tuple[int, int]]()
+# whether a metamorphic test was executed in the session
+executed_key = pytest.StashKey[bool]()
 
 
 class NoMetamorphicMarkError(ValueError):
@@ -16,17 +38,45 @@ def find_metamorphic_mark(item):
     raise NoMetamorphicMarkError('No metamorphic mark found')
 
 
+def _input_index(item) -> Optional[int]:
+    # the executions of an item are keyed by its parameter set instead of a digest
+    # of the inputs, which would pickle each input. Hypothesis runs many inputs per
+    # parameter set, they are keyed by their digest.
+    if getattr(item.function, 'is_hypothesis_test', False):
+        return None
+    callspec = getattr(item, 'callspec', None)
+    if callspec is None:
+        return None
+    # the id of the input without the metamorphic test, like runner.system_inputs
+    set_id = callspec.id
+    if 'name' in callspec.params:
+        name = str(callspec.params['name'])
+        if set_id == name:
+            set_id = ''
+        elif set_id.startswith(f"{name}-"):
+            set_id = set_id[len(name) + 1:]
+        elif set_id.endswith(f"-{name}"):
+            set_id = set_id[:-len(name) - 1]
+    return parameter_set_index(set_id) if set_id else None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    try:
+        find_metamorphic_mark(item)
+    except NoMetamorphicMarkError:
+        yield
+        return
+    with use_input_index(_input_index(item)):
+        yield
+
+
 @pytest.hookimpl(hookwrapper=True)
 # call param is needed for the hook signature to be correct
 # pylint: disable=unused-argument
 def pytest_runtest_makereport(item: pytest.TestReport, call: pytest.CallInfo):
-    pytest_html = item.config.pluginmanager.getplugin("html")
-    if pytest_html is None:
-        yield  # needed for the hook
-        return  # skip if no HTML plugin is available
     outcome = yield
     report = outcome.get_result()
-    extra = getattr(report, "extra", [])
 
     if report.when == "call":
         try:
@@ -34,25 +84,276 @@ def pytest_runtest_makereport(item: pytest.TestReport, call: pytest.CallInfo):
         except NoMetamorphicMarkError:
             # This is a non-metamorphic test
             return
-        test_id: TestID = item.funcargs['name']
-        m_test = suite.get_test(test_id)
-        # generate report
-        generator = HTMLReportGenerator(m_test.reports[-1])
-        visualize_input: Callable = m_mark.kwargs["visualize_input"] or str
-        visualize_output: Callable = m_mark.kwargs["visualize_output"] or str
+        item.config.stash[executed_key] = True
+        # a collapsed item runs all listed tests, each one is a sub-result
+        collapsed = m_mark.kwargs.get("names")
+        test_ids = collapsed if collapsed is not None else (item.funcargs['name'],)
+        pytest_html = item.config.pluginmanager.getplugin("html")
+        extra = getattr(report, "extra", [])
+        sub_results = []
+        for test_id in test_ids:
+            m_test = suite.get_test(test_id)
+            _record_failures(item, test_id, m_test.last_reports)
+            for key in (session_report_key, report_stream_key):
+                writer = item.config.stash.get(key, None)
+                if writer is not None:
+                    writer.add(
+                        m_test.last_reports, str(test_id), item.nodeid,
+                        visualize_input=m_mark.kwargs["visualize_input"],
+                        visualize_output=m_mark.kwargs["visualize_output"],
+                    )
+            if collapsed is not None:
+                failed = sum(not m_report.holds for m_report in m_test.last_reports)
+                sub_results.append((test_id, failed, len(m_test.last_reports)))
+            if pytest_html is not None:
+                extra += _diagrams(
+                    item, m_mark, m_test.last_reports,
+                    test_id if collapsed is not None else None
+                )
+        if collapsed is not None:
+            _add_sub_results(item, report, sub_results)
+        if pytest_html is not None:
+            report.extra = extra
+        _check_replayed(item, report)
+
+
+def _diagrams(item, m_mark, reports, test_id: Optional[TestID]) -> list:
+    pytest_html = item.config.pluginmanager.getplugin("html")
+    visualize_input: Callable = m_mark.kwargs["visualize_input"] or str
+    visualize_output: Callable = m_mark.kwargs["visualize_output"] or str
+    samples = len(reports)
+    extra = []
+    for m_report in reports:
+        # generate report, with the assets only once per document
+        include_assets = not item.config.stash.get(assets_key, False)
+        item.config.stash[assets_key] = True
+        generator = HTMLReportGenerator(
+            m_report, include_js=include_assets, include_css=include_assets
+        )
         setattr(generator, "visualize_input", visualize_input)
         setattr(generator, "visualize_output", visualize_output)
         extra_html = generator.generate()
+        title = "Metamorphic Diagram"
+        if test_id is not None:
+            outcome = "passed" if m_report.holds else "failed"
+            title += f" of {test_id} ({outcome})"
+        if samples > 1:
+            title += f" (sample {m_report.sample + 1} of {samples})"
         # add report to pytest-html output
         extra.append(pytest_html.extras.html(f"""
-            <b>Metamorphic Diagram:</b><br>
+            <b>{title}:</b><br>
             {extra_html}
         """))
-        report.extra = extra
+    return extra
+
+
+def _add_sub_results(item, report, sub_results) -> None:
+    lines = []
+    for test_id, failed, total in sub_results:
+        outcome = f"failed ({failed} of {total} samples)" if failed else "passed"
+        lines.append(f"{test_id}: {outcome}")
+    report.sections.append(("metamorphic sub-results", "\n".join(lines)))
+    passed, failed = item.config.stash.get(sub_results_key, (0, 0))
+    failed_now = sum(1 for _, failed_samples, _ in sub_results if failed_samples)
+    item.config.stash[sub_results_key] = (
+        passed + len(sub_results) - failed_now, failed + failed_now
+    )
+
+
+def _check_replayed(item, report) -> None:
+    # a replayed item passes trivially if its recorded executions no longer exist
+    if suite.replay is None or not report.passed:
+        return
+    unmatched = suite.replay.unmatched(item.nodeid)
+    if unmatched:
+        report.outcome = "failed"
+        report.longrepr = (
+            f"{len(unmatched)} recorded executions of {item.nodeid} were not replayed, "
+            "the inputs or the tests changed since they were recorded: "
+            + ", ".join(f"{entry.test_id} {entry.stream_key}" for entry in unmatched)
+        )
+
+
+def _record_failures(item, test_id: TestID, reports) -> None:
+    path = item.config.stash.get(record_path_key, None)
+    if path is None:
+        return
+    if not item.config.stash.get(record_started_key, False):
+        # emptied once a metamorphic test ran, so that sessions without metamorphic
+        # tests keep the executions recorded before
+        path.write_text("", encoding="utf-8")
+        item.config.stash[record_started_key] = True
+    entries = replay_entries(item.nodeid, str(test_id), reports)
+    if entries:
+        write_entries(path, entries)
+        item.config.stash[recorded_key] += len(entries)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("metamorphic")
+    group.addoption(
+        "--metamorphic-workers",
+        type=int,
+        default=0,
+        help="number of worker processes computing the follow-up inputs and outputs "
+             "of metamorphic tests (default: 0, i.e. in the test process)"
+    )
+    group.addoption(
+        "--metamorphic-seed",
+        type=int,
+        default=None,
+        help="seed of the random streams of all metamorphic test executions "
+             "(default: a new seed per session, shown in the summary)"
+    )
+    group.addoption(
+        "--metamorphic-keep-last",
+        type=int,
+        default=None,
+        help="number of latest execution reports each metamorphic test keeps in memory"
+    )
+    group.addoption(
+        "--metamorphic-failures-only",
+        action="store_true",
+        default=False,
+        help="drop the execution reports of metamorphic tests which passed"
+    )
+    group.addoption(
+        "--metamorphic-spill-dir",
+        default=None,
+        help="directory for the execution reports which are not kept in memory"
+    )
+    group.addoption(
+        "--metamorphic-html",
+        default=None,
+        help="write the reports of all metamorphic test executions to one HTML file "
+             "with a filterable table, in addition to any pytest-html report"
+    )
+    group.addoption(
+        "--metamorphic-stream",
+        default=None,
+        help="append the report of every metamorphic test execution to the given "
+             "JSON Lines file as soon as its test finishes"
+    )
+    group.addoption(
+        "--metamorphic-record",
+        default=None,
+        help="file the failed executions of metamorphic tests are recorded to "
+             "(default: replay.jsonl in the pytest cache directory)"
+    )
+    group.addoption(
+        "--metamorphic-replay",
+        default=None,
+        help="run only the failed executions recorded in the given file, with "
+             "their recorded seed, transform order and randomized arguments"
+    )
 
 
 def pytest_configure(config):
     config.addinivalue_line(
         "markers",
         "metamorphic(name, module): mark test as metamorphic, adding report metadata to it"
-    )
\ No newline at end of file
+    )
+    seed = config.getoption("metamorphic_seed", None)
+    if seed is not None:
+        set_seed(seed)
+    workers = config.getoption("metamorphic_workers", 0)
+    if workers:
+        suite.set_executor(ProcessPoolExecutor(max_workers=workers))
+    policy = RetentionPolicy(
+        keep_last=config.getoption("metamorphic_keep_last", None),
+        keep_failures_only=config.getoption("metamorphic_failures_only", False),
+        spill_to=config.getoption("metamorphic_spill_dir", None),
+    )
+    if policy != RetentionPolicy():
+        suite.set_retention(policy)
+    replay = config.getoption("metamorphic_replay", None)
+    if replay is not None:
+        suite.replay = Replay.load(replay)
+    record = config.getoption("metamorphic_record", None)
+    if record is None and getattr(config, "cache", None) is not None:
+        record = config.cache.mkdir("metamorphic") / "replay.jsonl"
+    if record is not None:
+        # the replayed file is loaded already, so it may be recorded to again
+        record = Path(record)
+    config.stash[record_path_key] = record
+    config.stash[recorded_key] = 0
+    html = config.getoption("metamorphic_html", None)
+    config.stash[session_report_key] = None if html is None else SessionReportWriter(html)
+    stream = config.getoption("metamorphic_stream", None)
+    config.stash[report_stream_key] = None if stream is None else ReportStream(stream)
+
+
+def pytest_collection_modifyitems(config, items):
+    if suite.replay is None:
+        return
+    nodeids = suite.replay.nodeids()
+    selected = [item for item in items if item.nodeid in nodeids]
+    deselected = [item for item in items if item.nodeid not in nodeids]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    # the reports refer to the assets of visualizations, which are written in the background
+    wait_all()
+    writer = session.config.stash.get(session_report_key, None)
+    if writer is not None:
+        writer.write()
+
+
+def pytest_unconfigure(config):
+    suite.set_executor(SerialExecutor())
+    suite.replay = None
+    stream = config.stash.get(report_stream_key, None)
+    if stream is not None:
+        stream.close()
+    for m_test in suite.tests.values():
+        m_test.reports.close()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.stash.get(executed_key, False):
+        return
+    terminalreporter.write_sep("-", "metamorphic testing summary")
+    cache = suite.source_cache
+    if cache.hits or cache.misses:
+        # only deterministic systems use the cache
+        terminalreporter.write_line(
+            f"source output cache: {cache.hits} hits, {cache.misses} misses "
+            f"({cache.misses} source evaluations for {cache.hits + cache.misses} "
+            "executions)"
+        )
+    if suite.replay is not None:
+        terminalreporter.write_line(
+            f"replaying {len(suite.replay)} recorded executions with their own seeds"
+        )
+    else:
+        terminalreporter.write_line(f"random seed: {get_seed()} (--metamorphic-seed)")
+    if suite.transform_cache.hits:
+        terminalreporter.write_line(
+            f"{suite.transform_cache.hits} results of deterministic transformations reused"
+        )
+    recorded = config.stash.get(recorded_key, 0)
+    if recorded:
+        terminalreporter.write_line(
+            f"{recorded} failed executions recorded to "
+            f"{config.stash[record_path_key]} (--metamorphic-replay)"
+        )
+    sub_results = config.stash.get(sub_results_key, None)
+    if sub_results is not None:
+        terminalreporter.write_line(
+            f"collapsed items: {sum(sub_results)} metamorphic test results, "
+            f"{sub_results[1]} failed"
+        )
+    writer = config.stash.get(session_report_key, None)
+    if writer is not None:
+        terminalreporter.write_line(
+            f"metamorphic report of {len(writer.rows)} executions: {writer.path}"
+        )
+    stream = config.stash.get(report_stream_key, None)
+    if stream is not None:
+        terminalreporter.write_line(
+            f"{stream.count} execution reports streamed to {stream.path}"
+        )
@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from .execution_report import MetamorphicExecutionReport
+from .html_generator import _read_asset
+from .json_generator import FunctionTable, JSONReportGenerator
+
+
+def _embed_json(data: Any) -> str:
+    # "</" would end the script element the data is embedded in
+    return json.dumps(data, separators=(',', ':')).replace('</', '<\\/')
+
+
+def render_session_html(
+        rows: Iterable[Dict[str, Any]],
+        functions: List[Dict[str, Any]],
+        title: str = "Metamorphic testing report") -> str:
+    """
+    Returns a self-contained HTML document showing the given JSON reports in a
+    table which renders only the visible rows and can be filtered by metamorphic
+    test and outcome. The script and style are included once.
+
+    Parameters
+    ----------
+    rows : Iterable[Dict[str, Any]]
+        the reports, as generated by JSONReportGenerator
+    functions : List[Dict[str, Any]]
+        the entries of the function table the reports refer to
+    title : str
+        the title of the document
+
+    Returns
+    -------
+    html : str
+        the HTML document
+    """
+    data = {'functions': functions, 'rows': list(rows)}
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style type="text/css">{_read_asset('css/report.css')}</style>
+<style type="text/css">{_read_asset('css/session.css')}</style>
+</head>
+<body>
+<h1>{title}</h1>
+<div id="metamorphic_session"></div>
+<script type="application/json" id="metamorphic_data">{_embed_json(data)}</script>
+<script type="text/javascript">{_read_asset('js/report.js')}</script>
+<script type="text/javascript">
+metamorphic.renderSession(
+    document.getElementById('metamorphic_session'),
+    JSON.parse(document.getElementById('metamorphic_data').textContent)
+);
+</script>
+</body>
+</html>
+"""
+
+
+class SessionReportWriter:
+    """
+    Collects the reports of all metamorphic tests of a session as compact JSON
+    and writes them to one HTML file.
+
+    Unlike the diagrams added to pytest-html, which are complete HTML tables per
+    execution, the reports are stored as data: every function with its source
+    once, values as short summaries unless visualizers are given. The browser
+    only renders the rows which are scrolled into view.
+
+    See Also
+    --------
+    json_generator.JSONReportGenerator : the data stored per report
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.functions = FunctionTable()
+        self.rows: List[Dict[str, Any]] = []
+
+    def add(
+            self,
+            reports: Iterable[MetamorphicExecutionReport],
+            test: Optional[str] = None,
+            node: Optional[str] = None,
+            visualize_input: Optional[Callable[..., str]] = None,
+            visualize_output: Optional[Callable[..., str]] = None) -> None:
+        """
+        Adds the reports of executions, e.g. of one pytest item.
+
+        Parameters
+        ----------
+        reports : Iterable[MetamorphicExecutionReport]
+            the reports to add
+        test : Optional[str]
+            the id of the metamorphic test of the reports
+        node : Optional[str]
+            the pytest node id the reports belong to
+        visualize_input : Optional[Callable[..., str]]
+            renders inputs as HTML. Defaults to a short escaped summary.
+        visualize_output : Optional[Callable[..., str]]
+            renders outputs as HTML. Defaults to a short escaped summary.
+        """
+        for report in reports:
+            generator = JSONReportGenerator(report, self.functions, test, node)
+            generator.visualize_input = visualize_input
+            generator.visualize_output = visualize_output
+            self.rows.append(generator.generate())
+
+    def write(self) -> Path:
+        """Writes the HTML report and returns its path."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            render_session_html(self.rows, self.functions.entries), encoding='utf-8'
+        )
+        return self.path
@@ -0,0 +1,259 @@
+from collections import deque
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import pickle  # nosec
+import tempfile
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
+
+from metamorphic_test.logger import logger
+from metamorphic_test.prioritized_transform import PrioritizedTransform
+from .execution_report import MetamorphicExecutionReport
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    Decides which execution reports of a metamorphic test are kept and where.
+
+    The default policy keeps all reports in memory.
+
+    Examples
+    --------
+    # keep the 100 latest reports in memory and move older ones to disk
+    RetentionPolicy(keep_last=100, spill_to='reports')
+    """
+    keep_last: Optional[int] = None
+    """
+    keep_last : Optional[int]
+        The number of latest reports kept in memory. Older reports are spilled to
+        disk if spill_to is given and dropped otherwise. None keeps all reports in
+        memory unless spill_to is given.
+    """
+    keep_failures_only: bool = False
+    """
+    keep_failures_only : bool
+        Whether reports of executions which passed are dropped right away.
+    """
+    spill_to: Optional[Union[str, Path]] = None
+    """
+    spill_to : Optional[Union[str, Path]]
+        A directory for the reports which are not kept in memory. They are loaded
+        back whenever they are accessed.
+    """
+
+    def __post_init__(self):
+        if self.keep_last is not None and self.keep_last < 0:
+            raise ValueError(f"keep_last must not be negative, got {self.keep_last}.")
+
+
+class _SpilledReport:
+    """
+    The in-memory part of a report written to disk: where to find its data and
+    the (small) functions it refers to, which are not pickled.
+    """
+    __slots__ = (
+        'offset', 'size', 'holds', 'system', 'relation', 'transforms', 'sample',
+        'seed', 'stream_key', 'parameters',
+    )
+
+    def __init__(
+            self,
+            report: MetamorphicExecutionReport,
+            offset: int,
+            size: int) -> None:
+        self.offset = offset
+        self.size = size
+        self.holds = report.holds
+        self.system: Callable = report.system
+        self.relation: Callable = report.relation
+        self.transforms: List[PrioritizedTransform] = report.transforms
+        self.sample = report.sample
+        self.seed = report.seed
+        self.stream_key = report.stream_key
+        self.parameters = report.parameters
+
+
+def _payload(report: MetamorphicExecutionReport) -> tuple:
+    return (
+        report.input_x,
+        report.output_x,
+        report.transform_results,
+        report.output_y,
+        report.relation_result,
+    )
+
+
+_Entry = Union[MetamorphicExecutionReport, _SpilledReport]
+
+
+class ReportStore(Sequence[MetamorphicExecutionReport]):
+    """
+    The execution reports of a metamorphic test, retained according to a
+    RetentionPolicy.
+
+    Reports spilled to disk are stored one after the other in a single file per
+    store and only their functions stay in memory. Accessing such a report, e.g.
+    by indexing or iterating, loads it from disk without keeping it in memory.
+
+    See Also
+    --------
+    RetentionPolicy : decides which reports are kept and where
+    suite.Suite.set_retention : sets the policy of all metamorphic tests
+    """
+
+    def __init__(self, policy: Optional[RetentionPolicy] = None) -> None:
+        self._entries: Deque[_Entry] = deque()
+        self._in_memory: Deque[int] = deque()
+        self._file: Optional[BinaryIO] = None
+        self._path: Optional[Path] = None
+        self._policy = RetentionPolicy()
+        self.dropped = 0
+        """
+        dropped : int
+            The number of reports which were not retained.
+        """
+        if policy is not None:
+            self.policy = policy
+
+    @property
+    def policy(self) -> RetentionPolicy:
+        """The retention policy, applied from the next report on."""
+        return self._policy
+
+    @policy.setter
+    def policy(self, policy: RetentionPolicy) -> None:
+        self._policy = policy
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._in_memory = deque(
+            i for i, entry in enumerate(self._entries)
+            if isinstance(entry, MetamorphicExecutionReport)
+        )
+
+    def append(self, report: MetamorphicExecutionReport) -> None:
+        """Adds the report of an execution and evicts reports as per the policy."""
+        if self._policy.keep_failures_only and report.holds:
+            self.dropped += 1
+            return
+        self._entries.append(report)
+        if self._policy.spill_to is None:
+            if self._policy.keep_last is not None:
+                while len(self._entries) > self._policy.keep_last:
+                    self._entries.popleft()
+                    self.dropped += 1
+            return
+        self._in_memory.append(len(self._entries) - 1)
+        keep_last = self._policy.keep_last or 0
+        while len(self._in_memory) > keep_last:
+            i = self._in_memory.popleft()
+            self._entries[i] = self._spill(self._entries[i])
+
+    def _open(self) -> BinaryIO:
+        if self._file is None:
+            assert self._policy.spill_to is not None
+            directory = Path(self._policy.spill_to)
+            directory.mkdir(parents=True, exist_ok=True)
+            fd, path = tempfile.mkstemp(
+                dir=directory, prefix='metamorphic-', suffix='.reports'
+            )
+            self._path = Path(path)
+            self._file = os.fdopen(fd, 'w+b')
+        return self._file
+
+    def _spill(self, entry: _Entry) -> _Entry:
+        if not isinstance(entry, MetamorphicExecutionReport):
+            return entry
+        try:
+            data = pickle.dumps(_payload(entry), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Keeping report in memory, it cannot be pickled: %s", e)
+            return entry
+        file = self._open()
+        offset = file.seek(0, os.SEEK_END)
+        file.write(data)
+        return _SpilledReport(entry, offset, len(data))
+
+    def _load(self, entry: _Entry) -> MetamorphicExecutionReport:
+        if isinstance(entry, MetamorphicExecutionReport):
+            return entry
+        assert self._file is not None
+        self._file.seek(entry.offset)
+        input_x, output_x, transform_results, output_y, relation_result = \
+            pickle.loads(self._file.read(entry.size))  # nosec
+        report = MetamorphicExecutionReport(
+            input_x, entry.system, entry.relation, sample=entry.sample
+        )
+        report.seed = entry.seed
+        report.stream_key = entry.stream_key
+        report.parameters = entry.parameters
+        report.transforms = entry.transforms
+        report.transform_results = transform_results
+        report.output_x = output_x
+        report.output_y = output_y
+        report.relation_result = relation_result
+        return report
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @overload
+    def __getitem__(self, i: int) -> MetamorphicExecutionReport: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[MetamorphicExecutionReport]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._load(self._entries[j]) for j in range(*i.indices(len(self)))]
+        return self._load(self._entries[i])
+
+    def __iter__(self) -> Iterator[MetamorphicExecutionReport]:
+        for entry in list(self._entries):
+            yield self._load(entry)
+
+    def failures(self) -> Iterator[MetamorphicExecutionReport]:
+        """Iterates over the retained reports of failed executions only."""
+        for entry in list(self._entries):
+            if not entry.holds:
+                yield self._load(entry)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (ReportStore, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def clear(self) -> None:
+        """Drops all reports, including those on disk."""
+        self._entries.clear()
+        self._in_memory.clear()
+        self.close()
+
+    def close(self) -> None:
+        """Deletes the file of spilled reports, dropping the reports it holds."""
+        if self._file is not None:
+            assert self._path is not None
+            self._file.close()
+            self._path.unlink(missing_ok=True)
+            self._file = None
+            self._path = None
+            self._entries = deque(
+                entry for entry in self._entries
+                if isinstance(entry, MetamorphicExecutionReport)
+            )
+            self._reindex()
+
+    def __repr__(self) -> str:
+        return f"ReportStore({len(self)} reports, {self._policy})"
@@ -0,0 +1,103 @@
+"""
+An append-only JSON Lines file of the reports of a session, written as the
+tests finish.
+
+Convert a stream, also one of a crashed run, to the session HTML report with
+``python -m metamorphic_test.report STREAM.jsonl REPORT.html``.
+"""
+import json
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from metamorphic_test.logger import logger
+from .execution_report import MetamorphicExecutionReport
+from .json_generator import FunctionTable, JSONReportGenerator
+
+
+class ReportStream:
+    """
+    Appends the reports of finished executions to a JSON Lines file.
+
+    Each line is a complete JSON object: either a function of the function table,
+    written before the first report referring to it, or a report as generated by
+    JSONReportGenerator. The file is flushed after every batch of reports, so it
+    can be followed while the tests run and a crashed run leaves all reports
+    written so far. Only the function table is kept in memory.
+
+    See Also
+    --------
+    read_stream : reads the functions and reports of a stream
+    session_report.SessionReportWriter : writes all reports of a session at once
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: Optional[IO[str]] = open(self.path, 'w', encoding='utf-8')
+        self.functions = FunctionTable()
+        self.count = 0
+        """
+        count : int
+            The number of reports written.
+        """
+
+    def add(
+            self,
+            reports: Iterable[MetamorphicExecutionReport],
+            test: Optional[str] = None,
+            node: Optional[str] = None,
+            visualize_input: Optional[Callable[..., str]] = None,
+            visualize_output: Optional[Callable[..., str]] = None) -> None:
+        """
+        Appends the reports of executions, e.g. of one pytest item. See
+        SessionReportWriter.add for the parameters.
+        """
+        if self._file is None:
+            raise ValueError(f"Report stream {self.path} is closed.")
+        lines = []
+        for report in reports:
+            known = len(self.functions.entries)
+            generator = JSONReportGenerator(report, self.functions, test, node)
+            generator.visualize_input = visualize_input
+            generator.visualize_output = visualize_output
+            row = generator.generate()
+            for i in range(known, len(self.functions.entries)):
+                lines.append(json.dumps({'function': i, **self.functions.entries[i]}))
+            lines.append(json.dumps({'report': row}))
+            self.count += 1
+        if lines:
+            self._file.write('\n'.join(lines) + '\n')
+            self._file.flush()
+
+    def close(self) -> None:
+        """Closes the file, which stays a valid stream."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_stream(
+        path: Union[str, Path]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Reads a stream written by ReportStream. An incomplete last line, e.g. of a
+    crashed run, is skipped.
+
+    Returns
+    -------
+    rows, functions : Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+        the reports and the function table they refer to
+    """
+    rows: List[Dict[str, Any]] = []
+    functions: List[Dict[str, Any]] = []
+    with open(path, encoding='utf-8') as file:
+        for number, line in enumerate(file, 1):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning("Skipping incomplete line %d of %s.", number, path)
+                continue
+            if 'report' in entry:
+                rows.append(entry['report'])
+            else:
+                functions.append({k: v for k, v in entry.items() if k != 'function'})
+    return rows, functions
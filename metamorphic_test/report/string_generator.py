@@ -1,8 +1,50 @@
+import reprlib
+from typing import Any
+
+from .execution_report import FunctionOutput
 from .report_generator import ReportGenerator
 
+# bounds the work of summarizing containers: only their first items are formatted
+_repr = reprlib.Repr()
+_repr.maxlevel = 2
+_repr.maxstring = 60
+_repr.maxother = 60
+
+# arrays with up to this many elements are printed with their values
+_MAX_ARRAY_SIZE = 16
+
+
+def summarize(value: Any) -> str:
+    """
+    Returns a short description of value whose cost does not depend on its size.
+
+    Large arrays, tensors and data frames (anything with a shape) are described
+    by their type, shape and dtype, strings and containers are truncated before
+    they are formatted.
+    """
+    if isinstance(value, FunctionOutput):
+        if not value.is_set:
+            return "(unset)"
+        if value.error is not None:
+            return f"error: {summarize(value.error)}"
+        value = value.output
+    if isinstance(value, str):
+        return value[:_repr.maxstring]
+    shape = getattr(value, 'shape', None)
+    if isinstance(shape, tuple):
+        # numpy arrays and data frames have an int size, torch tensors a method
+        size = getattr(value, 'size', None)
+        if not isinstance(size, int) or size > _MAX_ARRAY_SIZE:
+            dims = 'x'.join(str(dim) for dim in shape)
+            dtype = getattr(value, 'dtype', None)
+            return f"{type(value).__name__}({dims}{'' if dtype is None else f', {dtype}'})"
+    if isinstance(value, (list, tuple, dict, set, frozenset)):
+        return _repr.repr(value)
+    return str(value)
+
 
 def shorten(value):
-    value = str(value)
+    value = summarize(value)
     if len(value) > 25:
         return value[:25] + "..."
     return value
@@ -14,6 +56,7 @@ class StringReportGenerator(ReportGenerator):
 
     input_x ---------------- system ------> output_x
     | (transform 0)                            |
+    |   (drawn parameters of transform 0)      |
     transform_result[0]                        |
     | (transform 1)                            | (relation) (holds?)
     transform_result[1]                        |
@@ -24,13 +67,18 @@ class StringReportGenerator(ReportGenerator):
     def generate(self) -> str:
         # This pretty much just builds the ASCII image above:
         output_lines = []
-        output_lines.append(f"{self.report.input_x} ")
+        output_lines.append(f"{shorten(self.report.input_x)} ")
         # add transform names
         for transform_index, transform_result in enumerate(self.report.transform_results):
-            output_lines.append(
-                f"| {shorten(self.report.transforms[transform_index].get_name())} "
-            )
-            output_lines.append(shorten(str(transform_result).replace("\n", "\\n")) + " ")
+            p_transform = self.report.transforms[transform_index]
+            output_lines.append(f"| {shorten(p_transform.get_name())} ")
+            # the drawn parameters on their own line, not cut off like the name
+            drawn = self.report.parameters.get(p_transform.key)
+            if drawn:
+                output_lines.append("|   " + ", ".join(
+                    f"{arg}={summarize(value)}" for arg, value in drawn.items()
+                ) + " ")
+            output_lines.append(shorten(transform_result).replace("\n", "\\n") + " ")
         chars_left_of_system = max(len(line) for line in output_lines) + 2
         # add "---" for system arrows
         output_lines[0] = output_lines[0].ljust(chars_left_of_system, "-")
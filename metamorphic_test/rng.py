@@ -0,0 +1,204 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import hashlib
+import pickle  # nosec
+import random
+from typing import Iterator, Optional, Tuple, Union
+import zlib
+
+import numpy as np
+
+StreamKey = Tuple[int, int, int]
+"""
+The key of the random stream of one execution: a checksum of the test id, the id
+of the source input, e.g. its index, and the index of the sample.
+"""
+
+_MASK_64 = (1 << 64) - 1
+
+_session_seed: int = random.SystemRandom().getrandbits(64)
+
+_current: ContextVar[Optional['RandomStream']] = ContextVar(
+    'metamorphic_rng', default=None
+)
+
+_input_index: ContextVar[Optional[int]] = ContextVar('metamorphic_input_index', default=None)
+
+
+def get_seed() -> int:
+    """Returns the session seed all random streams are derived from."""
+    return _session_seed
+
+
+def set_seed(seed: int) -> None:
+    """
+    Sets the session seed. Executions under the same seed draw the same transform
+    orders and randomized arguments, independent of the order or the process
+    they run in.
+
+    The draws only depend on this seed, random.seed() and numpy.random.seed() do
+    not affect them.
+    """
+    global _session_seed  # pylint: disable=global-statement
+    _session_seed = seed
+
+
+def content_digest(x: tuple) -> Optional[int]:
+    """
+    Returns a digest of the pickled source input, which is stable across
+    processes, or None if the input cannot be pickled.
+    """
+    try:
+        content = pickle.dumps(x, protocol=4)
+    except Exception:  # pylint: disable=broad-except
+        return None
+    return int.from_bytes(hashlib.blake2b(content, digest_size=8).digest(), 'little')
+
+
+def input_digest(x: tuple, digest: Optional[int] = None) -> int:
+    """
+    Returns the digest identifying the source input in random stream keys: the
+    given content_digest of x if it is not None, computed otherwise. Inputs which
+    cannot be pickled are identified by their hash or, if they are not hashable,
+    by the identity of their arguments. Their streams are not reproducible in
+    other processes.
+    """
+    if digest is None:
+        digest = content_digest(x)
+    if digest is not None:
+        return digest
+    try:
+        return hash(x) & _MASK_64
+    except TypeError:
+        return hash(tuple(id(value) for value in x)) & _MASK_64
+
+
+def parameter_set_index(set_id: str) -> int:
+    """
+    Returns the index keying the input of a pytest parameter set: a checksum of
+    the id of the set as in the node id, without the metamorphic test, e.g. '1-6'
+    or the index of an input of a source.
+    """
+    return zlib.crc32(set_id.encode())
+
+
+@contextmanager
+def use_input_index(index: Optional[int]) -> Iterator[None]:
+    """
+    Makes index the id of the inputs executed one at a time within the context,
+    e.g. the parameter_set_index of a pytest item.
+    """
+    token = _input_index.set(index)
+    try:
+        yield
+    finally:
+        _input_index.reset(token)
+
+
+def current_input_index() -> Optional[int]:
+    """Returns the index set by use_input_index, if any."""
+    return _input_index.get()
+
+
+def stream_key(test_id: str, input_index: int, sample: int) -> StreamKey:
+    """
+    Returns the key of the random stream for executing test_id on the input
+    identified by input_index, e.g. its index in the inputs or its input_digest.
+    """
+    return zlib.crc32(test_id.encode()), input_index, sample
+
+
+def stream(key: StreamKey, seed: Optional[int] = None) -> np.random.Generator:
+    """
+    Returns a new counter-based (Philox) random generator for the given key.
+
+    Parameters
+    ----------
+    key : StreamKey
+        the key of the execution, see stream_key
+    seed : Optional[int]
+        the session seed. Defaults to get_seed()
+
+    Returns
+    -------
+    rng : np.random.Generator
+        a generator whose draws only depend on the seed and the key
+    """
+    seed = _session_seed if seed is None else seed
+    return np.random.Generator(np.random.Philox(
+        np.random.SeedSequence(entropy=seed, spawn_key=key)
+    ))
+
+
+class LazyStream:
+    """
+    The random stream of one execution, which is only created when something
+    draws from it, see get. Most executions of tests without randomized
+    arguments or transformations of equal priority never do.
+    """
+    __slots__ = ('key', 'seed', '_rng')
+
+    def __init__(self, key: StreamKey, seed: Optional[int] = None) -> None:
+        self.key = key
+        self.seed = seed
+        self._rng: Optional[np.random.Generator] = None
+
+    def get(self) -> np.random.Generator:
+        """Returns the stream(key, seed), which is created on the first call."""
+        if self._rng is None:
+            self._rng = stream(self.key, self.seed)
+        return self._rng
+
+
+RandomStream = Union[np.random.Generator, LazyStream]
+"""A random stream or a stream created on first use."""
+
+
+def resolve(rng: RandomStream) -> np.random.Generator:
+    """Returns the generator of rng, creating it if it is a LazyStream."""
+    return rng.get() if isinstance(rng, LazyStream) else rng
+
+
+def parameter_stream(key: StreamKey, seed: Optional[int] = None) -> np.random.Generator:
+    """
+    Returns a new random generator for the randomized arguments of all samples of
+    one input, see MetamorphicTest. It only depends on the seed and the test and
+    input of the key, not on its sample.
+
+    Parameters
+    ----------
+    key : StreamKey
+        the key of any execution of the input, see stream_key
+    seed : Optional[int]
+        the session seed. Defaults to get_seed()
+
+    Returns
+    -------
+    rng : np.random.Generator
+        a generator distinct from the streams of the executions
+    """
+    seed = _session_seed if seed is None else seed
+    return np.random.Generator(np.random.Philox(
+        np.random.SeedSequence(entropy=seed, spawn_key=key[:2])
+    ))
+
+
+def current_rng() -> np.random.Generator:
+    """
+    Returns the random generator of the current execution. Outside of an execution
+    a new generator seeded from the global random state is returned.
+    """
+    rng = _current.get()
+    if rng is None:
+        return np.random.default_rng(random.getrandbits(64))
+    return resolve(rng)
+
+
+@contextmanager
+def use_rng(rng: Optional[RandomStream]) -> Iterator[None]:
+    """Makes rng the generator returned by current_rng() within the context."""
+    token = _current.set(rng)
+    try:
+        yield
+    finally:
+        _current.reset(token)
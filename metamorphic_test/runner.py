@@ -0,0 +1,407 @@
+"""
+Runs the metamorphic tests of modules without pytest.
+
+``python -m metamorphic_test.runner run MODULE...`` (or ``metamorphic run``
+when installed) imports the modules, expands the pytest.mark.parametrize marks
+of their @system functions to inputs and executes every listed metamorphic test
+on chunks of inputs with Suite.execute_batch. Unlike the pytest path, this
+creates no pytest item per metamorphic test and input, so there is no
+collection and no per-item hook overhead. The reports are written like with
+the plugin options --metamorphic-html, --metamorphic-stream and
+--metamorphic-record.
+"""
+import argparse
+import logging
+from dataclasses import dataclass, field
+import importlib
+import inspect
+import itertools
+import os
+from pathlib import Path
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from . import decorator
+from .executor import Executor, ProcessPoolExecutor
+from .logger import logger
+from .replay import Replay, ReplayEntry, replay_entries, write_entries
+from .report.execution_report import MetamorphicExecutionReport
+from .report.session_report import SessionReportWriter
+from .report.store import RetentionPolicy
+from .report.stream import ReportStream
+from .rng import get_seed, input_digest, parameter_set_index, set_seed
+from .source import DataSource
+from .system import SystemRegistration
+from .warm import import_tests
+
+
+class UnsupportedSystemError(ValueError):
+    pass
+
+
+def _idval(value: Any, argname: str, index: int) -> str:
+    # like the default ids of pytest
+    if isinstance(value, str):
+        return value.encode('unicode_escape').decode('ascii')
+    if value is None or isinstance(value, (bool, int, float, complex)):
+        return str(value)
+    if inspect.isclass(value) or inspect.isfunction(value):
+        return value.__name__
+    return f"{argname}{index}"
+
+
+def _parameter_sets(mark) -> Tuple[List[str], List[Tuple[str, Dict[str, Any]]]]:
+    argnames = mark.args[0] if mark.args else mark.kwargs['argnames']
+    argvalues = mark.args[1] if len(mark.args) > 1 else mark.kwargs['argvalues']
+    if isinstance(argnames, str):
+        argnames = [name.strip() for name in argnames.split(',') if name.strip()]
+    ids = mark.kwargs.get('ids')
+    sets = []
+    for index, value in enumerate(argvalues):
+        marks: Sequence[Any] = ()
+        set_id: Optional[Any] = None
+        if isinstance(value, tuple) and hasattr(value, 'marks') and hasattr(value, 'values'):
+            value, marks, set_id = value.values, value.marks, value.id  # pytest.param
+            if len(argnames) == 1:
+                value = value[0]
+        if any(m.name == 'skip' or (m.name == 'skipif' and m.args and m.args[0] is True)
+               for m in marks):
+            continue
+        values = (value,) if len(argnames) == 1 else tuple(value)
+        if set_id is None and isinstance(ids, (list, tuple)) and index < len(ids):
+            set_id = ids[index]
+        if set_id is None:
+            set_id = '-'.join(_idval(v, n, index) for v, n in zip(values, argnames))
+        sets.append((str(set_id), dict(zip(argnames, values))))
+    return argnames, sets
+
+
+class _SourceInputs(Sequence[tuple]):
+    # the inputs of a source, read when a chunk is sliced
+    def __init__(self, source: DataSource, with_index: bool) -> None:
+        self.source = source
+        self.with_index = with_index
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if self.with_index:
+            return str(index), parameter_set_index(str(index)), self.source.args(index)
+        return str(index), self.source.args(index)
+
+
+def system_inputs(
+        registration: SystemRegistration,
+        with_index: bool = False) -> Sequence[tuple]:
+    """
+    Expands the pytest.mark.parametrize marks of the test function of a system to
+    the inputs pytest would call it with. The inputs of a system with a source
+    are read from it when they are accessed.
+
+    Parameters
+    ----------
+    registration : SystemRegistration
+        the system
+    with_index : bool
+        whether to return the index keying the random streams of each input, like
+        the pytest plugin does, see rng.parameter_set_index. Default: False
+
+    Returns
+    -------
+    inputs : Sequence[tuple]
+        the id of each input as in the pytest node id, without the metamorphic
+        test, the index if with_index is set and the positional arguments of
+        the system
+
+    Raises
+    ------
+    UnsupportedSystemError
+        if the inputs are not given by parametrize, e.g. by fixtures or hypothesis
+    """
+    if registration.source is not None:
+        return _SourceInputs(registration.source, with_index)
+    function = registration.test_function
+    if getattr(function, 'is_hypothesis_test', False):
+        raise UnsupportedSystemError("inputs drawn by hypothesis are not supported")
+    marks = [m for m in getattr(function, 'pytestmark', []) if m.name == 'parametrize']
+    combinations: List[Tuple[str, Dict[str, Any]]] = [('', {})]
+    for mark in marks:
+        argnames, sets = _parameter_sets(mark)
+        if argnames == ['name']:
+            continue  # the metamorphic tests, parametrized by decorator.system
+        combinations = [
+            ('-'.join(filter(None, (left_id, right_id))), {**left, **right})
+            for left_id, left in combinations for right_id, right in sets
+        ]
+    parameters = inspect.signature(registration.system).parameters.values()
+    inputs: List[tuple] = []
+    for input_id, values in combinations:
+        args = []
+        for parameter in parameters:
+            if parameter.name in values:
+                args.append(values[parameter.name])
+            elif parameter.default is not inspect.Parameter.empty:
+                args.append(parameter.default)
+            else:
+                raise UnsupportedSystemError(
+                    f"argument '{parameter.name}' is not parametrized, "
+                    "fixtures are not supported"
+                )
+        if not with_index:
+            inputs.append((input_id, tuple(args)))
+        elif input_id:
+            inputs.append((input_id, parameter_set_index(input_id), tuple(args)))
+        else:
+            # an item without parameters is keyed by its input
+            inputs.append((input_id, input_digest(tuple(args)), tuple(args)))
+    return inputs
+
+
+def _nodeid(registration: SystemRegistration, test_id: Any, input_id: str) -> str:
+    module = sys.modules.get(registration.system.__module__)
+    file = getattr(module, '__file__', None) or registration.system.__module__
+    path = Path(os.path.relpath(file)).as_posix()
+    name = registration.system.__qualname__.replace('.', '::')
+    # the inputs of a source are parametrized before the metamorphic tests
+    test = str(test_id)
+    parts = (input_id, test) if registration.source is not None else (test, input_id)
+    ids = '-'.join(filter(None, parts))
+    return f"{path}::{name}[{ids}]" if ids else f"{path}::{name}"
+
+
+def _chunks(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@dataclass
+class RunResult:
+    """The outcome of Runner.run."""
+    executions: int = 0
+    """
+    executions : int
+        The number of executions.
+    """
+    failed: Dict[str, int] = field(default_factory=dict)
+    """
+    failed : Dict[str, int]
+        The number of failed executions per metamorphic test, if any.
+    """
+    skipped: Dict[str, str] = field(default_factory=dict)
+    """
+    skipped : Dict[str, str]
+        The reason per system which could not be run.
+    """
+    not_replayed: List[ReplayEntry] = field(default_factory=list)
+    """
+    not_replayed : List[ReplayEntry]
+        The recorded executions of the replay which no execution matched, e.g.
+        because the inputs changed since they were recorded.
+    """
+
+    @property
+    def passed(self) -> bool:
+        return not self.failed and not self.not_replayed
+
+
+class Runner:
+    """
+    Executes the metamorphic tests registered by @system functions of modules on
+    their parametrized inputs, without pytest.
+
+    The inputs are processed in chunks: for each chunk all metamorphic tests of a
+    system are executed with Suite.execute_batch, so they share the outputs on the
+    source inputs, and the reports are handed to the writers before the next chunk.
+
+    Examples
+    --------
+    runner = Runner(chunk_size=512, stream='reports.jsonl')
+    result = runner.run(runner.load(['examples/image_classifier']))
+    """
+
+    def __init__(
+            self,
+            chunk_size: int = 256,
+            executor: Optional[Executor] = None,
+            html: Optional[str] = None,
+            stream: Optional[str] = None,
+            record: Optional[str] = None,
+            tests: Optional[Sequence[str]] = None) -> None:
+        """
+        Parameters
+        ----------
+        chunk_size : int
+            the number of inputs executed at once
+        executor : Optional[Executor]
+            runs the follow-up part of the executions, see decorator.use_executor
+        html : Optional[str]
+            the path of the session HTML report, see --metamorphic-html
+        stream : Optional[str]
+            the path of the report stream, see --metamorphic-stream
+        record : Optional[str]
+            the path the failed executions are recorded to, see --metamorphic-record
+        tests : Optional[Sequence[str]]
+            the ids of the metamorphic tests to run. Defaults to all.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+        self.chunk_size = chunk_size
+        self.tests = None if tests is None else set(tests)
+        if executor is not None:
+            decorator.suite.set_executor(executor)
+        self.html = None if html is None else SessionReportWriter(html)
+        self.stream = None if stream is None else ReportStream(stream)
+        self.record = None if record is None else Path(record)
+        if self.record is not None:
+            self.record.write_text('', encoding='utf-8')
+
+    @staticmethod
+    def load(modules: Sequence[str]) -> List[SystemRegistration]:
+        """
+        Imports modules, given by name or as paths of files or directories, and
+        returns the systems they register.
+        """
+        names = []
+        for module in modules:
+            if os.path.exists(module):
+                names += import_tests([module])
+            else:
+                names.append(importlib.import_module(module).__name__)
+        return [registration for name in names
+                for registration in decorator.suite.module_systems.get(name, [])]
+
+    def run(self, registrations: Sequence[SystemRegistration]) -> RunResult:
+        """Executes the metamorphic tests of the systems and writes their reports."""
+        result = RunResult()
+        for registration in registrations:
+            names = [name for name in registration.names
+                     if self.tests is None or str(name) in self.tests]
+            if not names:
+                continue
+            try:
+                inputs = system_inputs(registration, with_index=True)
+            except UnsupportedSystemError as e:
+                result.skipped[_nodeid(registration, '', '')] = str(e)
+                continue
+            for chunk in _chunks(inputs, self.chunk_size):
+                for name in names:
+                    reports = decorator.suite.execute_batch(
+                        name, registration.system, [args for _, _, args in chunk],
+                        cache_source=registration.deterministic,
+                        batch_size=registration.batch_size,
+                        samples=registration.samples,
+                        concurrency=registration.concurrency,
+                        input_ids=[index for _, index, _ in chunk],
+                    )
+                    self._write(registration, name, chunk, reports, result)
+            if registration.source is not None:
+                registration.source.close()
+        if decorator.suite.replay is not None:
+            result.not_replayed = [
+                entry for entry in decorator.suite.replay.unmatched()
+                if self.tests is None or entry.test_id in self.tests
+            ]
+        self.close()
+        return result
+
+    @staticmethod
+    def _input_ids(
+            chunk: Sequence[Tuple[str, int, tuple]],
+            reports: List[MetamorphicExecutionReport]) -> List[str]:
+        # with a replay only some executions run, the stream key holds the index
+        ids = {index: input_id for input_id, index, _ in chunk}
+        return [ids.get(report.stream_key[1], '') if report.stream_key is not None else ''
+                for report in reports]
+
+    def _write(
+            self,
+            registration: SystemRegistration,
+            name: Any,
+            chunk: Sequence[Tuple[str, int, tuple]],
+            reports: List[MetamorphicExecutionReport],
+            result: RunResult) -> None:
+        test = str(name)
+        failed = sum(not report.holds for report in reports)
+        result.executions += len(reports)
+        if failed:
+            result.failed[test] = result.failed.get(test, 0) + failed
+        input_ids = self._input_ids(chunk, reports)
+        for input_id, group in itertools.groupby(zip(input_ids, reports), key=lambda p: p[0]):
+            # collapsed systems have one pytest item per input for all tests
+            node = _nodeid(registration, '' if registration.collapse else name, input_id)
+            node_reports = [report for _, report in group]
+            for writer in (self.html, self.stream):
+                if writer is not None:
+                    writer.add(node_reports, test, node,
+                               visualize_input=registration.visualize_input,
+                               visualize_output=registration.visualize_output)
+            if self.record is not None:
+                entries = replay_entries(node, test, node_reports)
+                if entries:
+                    write_entries(self.record, entries)
+
+    def close(self) -> None:
+        """Writes the HTML report and closes the report stream."""
+        if self.html is not None:
+            self.html.write()
+        if self.stream is not None:
+            self.stream.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='metamorphic', description=__doc__.split('\n\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="run the metamorphic tests of modules")
+    run.add_argument('modules', nargs='+',
+                     help="module names, or paths of test files or directories")
+    run.add_argument('--test', action='append', dest='tests',
+                     help="run only this metamorphic test, may be repeated")
+    run.add_argument('--chunk-size', type=int, default=256,
+                     help="the number of inputs executed at once")
+    run.add_argument('--workers', type=int, default=0,
+                     help="run the follow-ups in a pool of worker processes")
+    run.add_argument('--seed', type=int, help="the seed of all random draws")
+    run.add_argument('--replay', help="run only the executions recorded in this file")
+    run.add_argument('--record', help="record the failed executions to this file")
+    run.add_argument('--html', help="write the session HTML report to this file")
+    run.add_argument('--stream', help="append the reports to this JSON Lines file")
+    run.add_argument('--verbose', '-v', action='store_true',
+                     help="log every execution, like the captured output of pytest")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logger.setLevel(logging.WARNING)
+
+    if args.seed is not None:
+        set_seed(args.seed)
+    if args.replay is not None:
+        decorator.suite.replay = Replay.load(args.replay)
+    # the reports are written chunk by chunk, so the tests need not keep them
+    decorator.suite.set_retention(RetentionPolicy(keep_last=0))
+    runner = Runner(
+        chunk_size=args.chunk_size,
+        executor=ProcessPoolExecutor(max_workers=args.workers) if args.workers else None,
+        html=args.html, stream=args.stream, record=args.record, tests=args.tests,
+    )
+    result = runner.run(runner.load(args.modules))
+    for node, reason in result.skipped.items():
+        logger.warning("skipped %s: %s", node, reason)
+    for entry in result.not_replayed:
+        logger.warning("recorded execution of %s %s in %s was not replayed",
+                       entry.test_id, entry.stream_key, entry.nodeid)
+    for test, failed in sorted(result.failed.items()):
+        print(f"{test}: {failed} failed executions")
+    print(f"{result.executions} executions, {sum(result.failed.values())} failed, "
+          f"random seed: {get_seed()}")
+    for label, path in (('report', args.html), ('stream', args.stream),
+                        ('failed executions recorded to', args.record)):
+        if path is not None:
+            print(f"{label}: {path}")
+    sys.exit(0 if result.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Lazy inputs for systems under test, see the source option of decorator.system.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+from typing import (
+    Any, Callable, Dict, Generic, Iterable, Optional, Sequence, Tuple, TypeVar, Union, overload
+)
+
+K = TypeVar('K')
+T = TypeVar('T')
+
+
+class Dataset(Sequence[T], Generic[K, T]):
+    """
+    A sequence which loads each item from its key when it is accessed, e.g. an
+    image from its file name. Only the keys are held in memory.
+
+    Examples
+    --------
+    images = Dataset(sorted(Path('data').glob('*.png')), plt.imread)
+
+    @system(brightness, source=images)
+    def test_classifier(image):
+        return classifier.predict(image)
+    """
+
+    def __init__(self, keys: Iterable[K], load: Callable[[K], T]) -> None:
+        self.keys: Sequence[K] = keys if isinstance(keys, Sequence) else list(keys)
+        """
+        keys : Sequence[K]
+            The keys of the items, in order.
+        """
+        self.load = load
+        """
+        load : Callable[[K], T]
+            Loads the item of a key.
+        """
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'Dataset[K, T]': ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, 'Dataset[K, T]']:
+        if isinstance(index, slice):
+            return Dataset(self.keys[index], self.load)
+        return self.load(self.keys[index])
+
+
+class DataSource:
+    """
+    The inputs of a system under test, read from a dataset by index.
+
+    The dataset is any object with __len__ and __getitem__, e.g. a Dataset, a
+    torch dataset or a list. Other iterables are read into a list when the source
+    is created, so they should yield cheap items, e.g. file names for a Dataset.
+
+    Items are only read when they are accessed. Reading item i starts reading the
+    next prefetch items in background threads, so the items of sequential
+    executions are ready when they are needed, and drops the prefetched items
+    outside this window. At most the current item and the prefetched ones are
+    kept in memory.
+    """
+
+    def __init__(
+            self,
+            dataset: Iterable,
+            arity: int = 1,
+            prefetch: int = 4,
+            workers: int = 1) -> None:
+        """
+        Parameters
+        ----------
+        dataset : Iterable
+            the dataset, indexable with __len__ or an iterable
+        arity : int
+            the number of arguments of the system. With more than one, every item
+            is a tuple of the arguments. Default: 1
+        prefetch : int
+            the number of items read ahead, 0 disables prefetching. Default: 4
+        workers : int
+            the number of threads reading ahead. Default: 1
+        """
+        if prefetch < 0:
+            raise ValueError(f"prefetch must not be negative, got {prefetch}.")
+        if workers < 1:
+            raise ValueError(f"workers must be positive, got {workers}.")
+        if not (hasattr(dataset, '__len__') and hasattr(dataset, '__getitem__')):
+            dataset = list(dataset)
+        self.dataset: Any = dataset
+        """
+        dataset : Any
+            The dataset the items are read from.
+        """
+        self.arity = arity
+        self.prefetch = prefetch
+        self.workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[int, Future] = {}
+        self._current: Optional[Tuple[int, Any]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.dataset)
+
+    def __getitem__(self, index: int) -> Any:
+        with self._lock:
+            # e.g. the same input of several metamorphic tests in a row
+            if self._current is not None and self._current[0] == index:
+                return self._current[1]
+            future = self._pending.pop(index, None)
+            self._prefetch(index)
+        item = self.dataset[index] if future is None else future.result()
+        with self._lock:
+            self._current = (index, item)
+        return item
+
+    def _prefetch(self, index: int) -> None:
+        if not self.prefetch:
+            return
+        window = range(index + 1, min(index + 1 + self.prefetch, len(self)))
+        for stale in [i for i in self._pending if i not in window]:
+            self._pending.pop(stale).cancel()
+        if self._pool is None:
+            # created on first use, e.g. in the process forked by a warm runner
+            self._pool = ThreadPoolExecutor(
+                self.workers, thread_name_prefix='metamorphic-source'
+            )
+        for i in window:
+            if i not in self._pending:
+                self._pending[i] = self._pool.submit(self.dataset.__getitem__, i)
+
+    def args(self, index: int) -> tuple:
+        """Returns the arguments of the system for the item at index."""
+        item = self[index]
+        return (item,) if self.arity == 1 else tuple(item)
+
+    def close(self) -> None:
+        """Drops the prefetched items and stops the background threads."""
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+            self._current = None
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
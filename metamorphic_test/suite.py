@@ -1,23 +1,72 @@
-from functools import wraps
-import inspect
-from typing import Dict, TypeVar, Callable, Hashable, Tuple
+from functools import lru_cache
+import sys
+from types import FrameType
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Callable,
+    Hashable,
+    Tuple,
+)
 from pathlib import Path
 
+from .binding import ParameterBinding
+from .cache import SourceOutputCache, TransformCache
+from .executor import Executor, SerialExecutor
 from .metamorphic import MetamorphicTest
 from .generator import MetamorphicGenerator
 from .logger import logger
+from .report.execution_report import MetamorphicExecutionReport
+from .replay import Replay
+from .report.store import ReportStore, RetentionPolicy
 from .transform import Transform
 from .rel import Relation
+from .system import System, SystemID, SystemRegistration, system_id
 
 A = TypeVar('A')
 
 TestID = Hashable  # only guarantee made for outside use
 
+
+class MetamorphicTestsFailed(AssertionError):
+    """Raised by Suite.execute_collapsed if some of the metamorphic tests failed."""
+
+    def __init__(self, failures: Dict[TestID, Exception], total: int) -> None:
+        self.failures = failures
+        """
+        failures : Dict[TestID, Exception]
+            The error raised by each failed metamorphic test.
+        """
+        lines = [f"{test_id}: {type(e).__name__}: {e}" for test_id, e in failures.items()]
+        super().__init__(
+            f"{len(failures)} of {total} metamorphic tests failed:\n" + "\n".join(lines)
+        )
+
+
 # This relies on the fact that suite.py is in the root directory
 # of the metamorphic_test package.
 METAMORHIC_TEST_PACKAGE_PATH = Path(__file__).parent
 
 
+@lru_cache(maxsize=None)
+def _in_package(filename: str) -> bool:
+    return METAMORHIC_TEST_PACKAGE_PATH in Path(filename).parents
+
+
+def _caller_frames() -> Iterator[FrameType]:
+    # sys._getframe only links the frames, unlike inspect.stack() it neither
+    # builds frame records nor reads source files
+    frame: Optional[FrameType] = sys._getframe(1)  # pylint: disable=protected-access
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
 class Suite:
     """
     This class holds all the metamorphic tests along with corresponding
@@ -40,6 +89,52 @@ class Suite:
             A dictionary with keys as test_ids and values as metamorphic_tests
             to hold all the metamorphic tests within a single data structure.
         """
+        self.module_tests: Dict[str, List[TestID]] = {}
+        """
+        module_tests : Dict[str, List[TestID]]
+            The ids of the metamorphic tests registered by each module, in the
+            order of registration.
+        """
+        self.source_cache = SourceOutputCache()
+        """
+        source_cache : SourceOutputCache
+            Session wide cache of the outputs of the systems under test on their
+            source inputs, shared by all metamorphic tests listed for a system.
+        """
+        self.transform_cache = TransformCache()
+        """
+        transform_cache : TransformCache
+            The cache for the results of deterministic transformations, shared by
+            all metamorphic tests applying them to the same input.
+        """
+        self.retention = RetentionPolicy()
+        """
+        retention : RetentionPolicy
+            The policy deciding which execution reports the metamorphic tests keep.
+        """
+        self.replay: Optional[Replay] = None
+        """
+        replay : Optional[Replay]
+            The failed executions to run again with their recorded random draws,
+            e.g. read from the file given by --metamorphic-replay.
+        """
+        self.systems: Dict[SystemID, System] = {}
+        """
+        systems : Dict[SystemID, System]
+            A dictionary with keys as system ids and values as the registered
+            systems under test.
+        """
+        self.module_systems: Dict[str, List[SystemRegistration]] = {}
+        """
+        module_systems : Dict[str, List[SystemRegistration]]
+            The systems registered with decorator.system by each module, with
+            their metamorphic tests and options, in the order of registration.
+        """
+        self.executor: Executor = SerialExecutor()
+        """
+        executor : Executor
+            The executor running the follow-up part of all executions.
+        """
 
     def get_test(self, test_id: TestID) -> MetamorphicTest:
         """
@@ -75,12 +170,93 @@ class Suite:
         test_id_list : Tuple[Hashable, ...]
             a list of test ids for the corresponding test module
         """
-        module = self.get_caller_module()
-        test_id_list = [
-            k for k, _ in self.tests.items()
-            if str(k).startswith(module)
-        ]
-        return tuple(test_id_list)
+        return tuple(self.module_tests.get(self.get_caller_module(), ()))
+
+    def add_system(self, system: System) -> SystemID:
+        """
+        This method is internally called by decorator.system to register a
+        system under test, so that it can be looked up by its id, e.g. in a
+        worker process.
+
+        Parameters
+        ----------
+        system : System
+            the system under test
+
+        Returns
+        -------
+        system_id : SystemID
+            the identifier of the system
+        """
+        key = system_id(system)
+        self.systems[key] = system
+        return key
+
+    def register_system(self, registration: SystemRegistration) -> SystemID:
+        """
+        Registers a system under test along with the metamorphic tests listed
+        for it, e.g. for metamorphic_test.runner to execute them without pytest.
+
+        Parameters
+        ----------
+        registration : SystemRegistration
+            the system, its metamorphic tests and options
+
+        Returns
+        -------
+        system_id : SystemID
+            the identifier of the system
+        """
+        module = registration.system.__module__
+        self.module_systems.setdefault(module, []).append(registration)
+        return self.add_system(registration.system)
+
+    def get_system(self, key: SystemID) -> System:
+        """
+        A method to get a registered system under test by its id.
+
+        Parameters
+        ----------
+        key : SystemID
+            the identifier of the system, see add_system
+
+        Returns
+        -------
+        system : System
+            the system under test
+        """
+        return self.systems[key]
+
+    def set_executor(self, executor: Executor) -> None:
+        """
+        Replaces the executor of the suite, shutting down the previous one.
+
+        Parameters
+        ----------
+        executor : Executor
+            the executor running the follow-up part of all executions
+
+        See Also
+        --------
+        executor.ProcessPoolExecutor : runs the follow-ups in worker processes
+        """
+        self.executor.shutdown()
+        self.executor = executor
+
+    def set_retention(self, policy: RetentionPolicy) -> None:
+        """
+        Sets the retention policy of the execution reports of all metamorphic tests,
+        including those registered later.
+
+        Parameters
+        ----------
+        policy : RetentionPolicy
+            decides how many reports are kept, whether passing ones are dropped and
+            whether older ones are spilled to disk
+        """
+        self.retention = policy
+        for test in self.tests.values():
+            test.reports.policy = policy
 
     @staticmethod
     def get_caller_module() -> str:
@@ -92,16 +268,14 @@ class Suite:
         module.__name__ : str
             the module name where the test is created
         """
-        # inspect.stack() returns a list of frame records for the caller's stack.
-        # The first entry in the returned list represents the caller.
-        for frame in inspect.stack():
-            test_module_path = Path(frame[1])
-            if METAMORHIC_TEST_PACKAGE_PATH not in test_module_path.parents:
+        # The frames are walked from the caller outwards.
+        for frame in _caller_frames():
+            if not _in_package(frame.f_code.co_filename):
                 # this file is not from our package
                 # => it is from the user's code
-                module = inspect.getmodule(frame[0])
-                if module is not None:
-                    return module.__name__
+                module = frame.f_globals.get('__name__')
+                if module in sys.modules:
+                    return module
         raise ValueError('Internal Error: no calling module found.')
 
     @staticmethod
@@ -125,24 +299,19 @@ class Suite:
 
         Returns
         -------
-        wrapper : callable
-            a function which modifies the original transformation function by setting a
-            given fixed value to one of its arguments.
+        wrapper : ParameterBinding
+            a picklable callable which modifies the original transformation function by
+            setting a given fixed value to one of its arguments.
             Please note: to set fixed values to multiple arguments of a transformation,
-            use the fixed decorator multiple times
+            use the fixed decorator multiple times. Stacked bindings collapse into
+            one binding of the original transformation
 
         See Also
         --------
         decorators.fixed : Fix the argument arg to the given value overriding the value
                            of arg in the given kwargs
         """
-
-        @wraps(transform)
-        def wrapper(*args, **kwargs):
-            kwargs[arg] = value
-            return transform(*args, **kwargs)
-
-        return wrapper
+        return ParameterBinding(transform, fixed={arg: value})
 
     @staticmethod
     def randomized_generator(
@@ -169,26 +338,21 @@ class Suite:
 
         Returns
         -------
-        wrapper : Transform
-            a function which modifies the original transformation function by setting a
-            randomized value to one of its arguments.
+        wrapper : ParameterBinding
+            a picklable callable which modifies the original transformation function by
+            setting a randomized value to one of its arguments.
             Please note: to set randomized values to multiple arguments of a transformation,
-            use the randomized decorator multiple times
+            use the randomized decorator multiple times. Stacked bindings collapse into
+            one binding of the original transformation
 
         See Also
         --------
         decorators.randomized : Randomize the argument arg by the value generated by
                                 the generator
         """
+        return ParameterBinding(transform, randomized={arg: generator})
 
-        @wraps(transform)
-        def wrapper(*args, **kwargs):
-            kwargs[arg] = generator.generate()
-            return transform(*args, **kwargs)
-
-        return wrapper
-
-    def metamorphic(self, name: str) -> TestID:
+    def metamorphic(self, name: str, *, samples: int = 1) -> TestID:
         """
         This method is internally called by decorator.metamorphic() to register a
         metamorphic test in self.tests attribute.
@@ -198,6 +362,10 @@ class Suite:
         name : str
             name of the metamorphic test
 
+        samples : int
+            Optional keyword argument for the number of follow-up inputs derived
+            from each source input. Default: 1
+
         Returns
         -------
         test_id : TestID
@@ -212,13 +380,20 @@ class Suite:
         test_id = f"{module}.{name}"
         if test_id in self.tests:
             raise ValueError(f"Test {test_id} already exists.")
-        self.tests[test_id] = MetamorphicTest(name=name)
+        self.tests[test_id] = MetamorphicTest(
+            name=name,
+            samples=samples,
+            test_id=test_id,
+            reports=ReportStore(self.retention)
+        )
+        self.module_tests.setdefault(module, []).append(test_id)
         return test_id
 
     def add_transform(self,
                       test_id: TestID,
                       transform: Transform, *,
-                      priority: int = 0) -> None:
+                      priority: int = 0,
+                      deterministic: bool = False) -> None:
         """
         This method is internally called by decorator.transformation to
         register a function as a transformation to a metamorphic test.
@@ -238,6 +413,10 @@ class Suite:
             transformation of interest in a multiple transformation chain
             scenario. Default: 0
 
+        deterministic : bool
+            Optional keyword argument marking the transformation as deterministic,
+            so that its results can be cached. Default: False
+
         See Also
         --------
         decorator.transformation : Registers a decorated function as a
@@ -245,7 +424,9 @@ class Suite:
         metamorphic.MetamorphicTest : A data class to hold a metamorphic test object
                                       along with its transformations and relation
         """
-        self.tests[test_id].add_transform(transform, priority)
+        self.tests[test_id].add_transform(
+            transform, priority, deterministic=deterministic
+        )
 
     def set_relation(self, test_id: TestID, relation: Relation) -> None:
         """
@@ -274,7 +455,15 @@ class Suite:
         """
         self.tests[test_id].set_relation(relation)
 
-    def execute(self, test_id: TestID, test_function: Callable, *args: tuple) -> None:
+    def execute(
+            self,
+            test_id: TestID,
+            test_function: Callable,
+            *args: Any,
+            cache_source: bool = False,
+            batch_size: Optional[int] = None,
+            samples: Optional[int] = None,
+            concurrency: Optional[int] = None) -> None:
         """
         Execute a metamorphic test identified by test_id on a system under test
         denoted by test_function
@@ -291,6 +480,25 @@ class Suite:
         args : tuple
             actual arguments for the system under test
 
+        cache_source : bool
+            Optional keyword argument to reuse the output of the system under test
+            on the source input across all metamorphic tests of the system. Enable
+            this for deterministic systems only, see decorator.system.
+            Default: False
+
+        batch_size : Optional[int]
+            Optional keyword argument marking test_function as batched, i.e. it
+            receives lists of arguments and returns a list of outputs.
+            Default: None
+
+        samples : Optional[int]
+            Optional keyword argument overriding the number of follow-up inputs
+            derived from the source input. Defaults to the samples of the test.
+
+        concurrency : Optional[int]
+            Optional keyword argument bounding the number of concurrent calls of an
+            asynchronous test_function. Default: None
+
         See Also
         --------
         decorator.system : Identifies the function decorated with this decorator as
@@ -305,4 +513,140 @@ class Suite:
             test_id=test_id,
             test_function=test_function.__module__
         )
-        self.tests[test_id].execute(test_function, *args)
+        self.tests[test_id].execute(
+            test_function,
+            *args,
+            cache=self.source_cache if cache_source else None,
+            batch_size=batch_size,
+            samples=samples,
+            executor=self.executor,
+            concurrency=concurrency,
+            transform_cache=self.transform_cache,
+            replay=self.replay
+        )
+
+    def execute_collapsed(
+            self,
+            test_ids: Sequence[TestID],
+            test_function: Callable,
+            *args: Any,
+            cache_source: bool = False,
+            batch_size: Optional[int] = None,
+            samples: Optional[int] = None,
+            concurrency: Optional[int] = None) -> None:
+        """
+        Execute all metamorphic tests identified by test_ids on one input of a
+        system under test, e.g. in a single pytest item.
+
+        Other than calling execute per test, every test is executed even if another
+        one failed. With cache_source, the output on the source input is computed
+        once and shared by all tests.
+
+        Parameters
+        ----------
+        test_ids : Sequence[TestID]
+            the identifiers of the metamorphic tests to execute
+
+        test_function : Callable
+            the system under test
+
+        args : tuple
+            actual arguments for the system under test
+
+        cache_source, batch_size, samples, concurrency
+            see execute
+
+        Raises
+        ------
+        MetamorphicTestsFailed
+            if any of the tests failed, with the error of each failed test
+
+        See Also
+        --------
+        decorator.system : with collapse=True, executes the tests this way
+        """
+        failures: Dict[TestID, Exception] = {}
+        for test_id in test_ids:
+            reports = self.execute_batch(
+                test_id, test_function, [args],
+                cache_source=cache_source,
+                batch_size=batch_size,
+                samples=samples,
+                concurrency=concurrency
+            )
+            try:
+                self.tests[test_id].check(reports)
+            except Exception as e:  # pylint: disable=broad-except
+                failures[test_id] = e
+        if failures:
+            raise MetamorphicTestsFailed(failures, len(test_ids))
+
+    def execute_batch(
+            self,
+            test_id: TestID,
+            test_function: Callable,
+            inputs: Sequence[tuple], *,
+            cache_source: bool = False,
+            batch_size: Optional[int] = None,
+            samples: Optional[int] = None,
+            concurrency: Optional[int] = None,
+            input_ids: Optional[Sequence[Optional[int]]] = None
+    ) -> List[MetamorphicExecutionReport]:
+        """
+        Execute a metamorphic test identified by test_id on many inputs of the
+        system under test at once.
+
+        Other than execute, this does not raise if an execution fails. The outcome
+        of each execution is recorded in its report instead.
+
+        Parameters
+        ----------
+        test_id : TestID
+            a hashable identifier for a metamorphic test which needs to be executed
+
+        test_function : Callable
+            the system under test
+
+        inputs : Sequence[tuple]
+            actual arguments for the system under test, one tuple per execution
+
+        cache_source : bool
+            see execute. Default: False
+
+        batch_size : Optional[int]
+            Optional keyword argument marking test_function as batched. Source and
+            follow-up inputs of all executions are then passed to it in chunks of
+            batch_size. Default: None
+
+        samples : Optional[int]
+            see execute. Defaults to the samples of the test.
+
+        concurrency : Optional[int]
+            see execute. Default: None
+
+        input_ids : Optional[Sequence[Optional[int]]]
+            The id of each input in the keys of its random streams, e.g. its index
+            in a dataset, see metamorphic.MetamorphicTest.execute_batch. Defaults
+            to the positions of the inputs.
+
+        Returns
+        -------
+        reports : List[MetamorphicExecutionReport]
+            one report per input and sample, in the order of the inputs
+
+        See Also
+        --------
+        metamorphic.MetamorphicTest.execute_batch : executes a test on many inputs
+        """
+        return self.tests[test_id].execute_batch(
+            test_function,
+            inputs,
+            cache=self.source_cache if cache_source else None,
+            batch_size=batch_size,
+            samples=samples,
+            executor=self.executor,
+            concurrency=concurrency,
+            transform_cache=self.transform_cache,
+            replay=self.replay,
+            input_ids=input_ids
+        )
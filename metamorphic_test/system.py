@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Hashable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .source import DataSource
+
+System = Callable
+"""
+The general type of a system under test. Since it can have an arbitrary number
+of arbitrary inputs and an arbitrary output, 'Callable' seems most appropriate.
+"""
+
+SystemID = str
+"""The identifier of a registered system under test."""
+
+
+def system_id(system: System) -> SystemID:
+    """
+    Returns the identifier of a system under test, i.e. its qualified name
+    prefixed by its module.
+    """
+    return f"{system.__module__}.{system.__qualname__}"
+
+
+@dataclass(frozen=True)
+class SystemRegistration:
+    """
+    A system under test registered by decorator.system, with the metamorphic tests
+    listed for it and the options they are executed with.
+    """
+    system: System
+    """
+    system : System
+        The system under test.
+    """
+    names: Tuple[Hashable, ...]
+    """
+    names : Tuple[Hashable, ...]
+        The ids of the metamorphic tests executed on the system.
+    """
+    test_function: Callable
+    """
+    test_function : Callable
+        The pytest test function returned by decorator.system, which carries the
+        marks of the decorators above it, e.g. pytest.mark.parametrize.
+    """
+    deterministic: bool = False
+    batch_size: Optional[int] = None
+    samples: Optional[int] = None
+    concurrency: Optional[int] = None
+    collapse: bool = False
+    """See decorator.system for the options."""
+    source: Optional['DataSource'] = None
+    """
+    source : Optional[DataSource]
+        The inputs of the system if given by the source option of decorator.system.
+    """
+    visualize_input: Optional[Callable[..., str]] = None
+    visualize_output: Optional[Callable[..., str]] = None
+    """The functions rendering inputs and outputs in the reports."""
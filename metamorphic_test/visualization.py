@@ -0,0 +1,195 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+import hashlib
+import os
+from pathlib import Path
+import pickle  # nosec
+import threading
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from .logger import logger
+
+Encoder = Callable[[str, Any], Any]
+"""Writes a value to the file at the given path, e.g. matplotlib.pyplot.imsave."""
+
+_services: List['VisualizationService'] = []
+
+# pyplot is not thread-safe: the encoders of all services share one thread
+_thread_executor: Optional[ThreadPoolExecutor] = None
+_thread_executor_lock = threading.Lock()
+
+
+def _shared_thread_executor() -> ThreadPoolExecutor:
+    global _thread_executor  # pylint: disable=global-statement
+    with _thread_executor_lock:
+        if _thread_executor is None:
+            _thread_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='metamorphic-visualize'
+            )
+        return _thread_executor
+
+
+def value_fingerprint(value: Any) -> str:
+    """
+    Returns a hex digest of the content of value: of the data, shape and dtype of
+    arrays (and anything convertible to one, e.g. tensors) or of the pickled value.
+    Unlike rng.content_digest, which identifies source inputs, it names the files
+    of rendered values.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if hasattr(value, '__array__') or isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.data if array.dtype != object else pickle.dumps(array))
+    else:
+        digest.update(pickle.dumps(value, protocol=4))
+    return digest.hexdigest()
+
+
+def _encode(encode: Encoder, path: Path, value: Any) -> None:
+    # write to a temporary file first, so that an asset which exists is complete
+    tmp = path.with_name(f".{path.stem}.{os.getpid()}.{threading.get_ident()}{path.suffix}")
+    try:
+        encode(str(tmp), value)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+class VisualizationService:
+    """
+    Writes the assets of visualizations, e.g. images or audio files shown in the
+    HTML reports, named by a digest of their content.
+
+    submit() returns the reference to an asset right away and encodes it in the
+    background, unless the same content was encoded with the same encoder before,
+    e.g. for another metamorphic test of the same source input. Visualizers thus
+    never wait for the encoding of PNG or WAV files.
+
+    Examples
+    --------
+    images = VisualizationService('assets/img', url_prefix='../img')
+
+    def visualize_input(image):
+        return f"<img src='{images.submit(image, '.png', plt.imsave)}'>"
+    """
+
+    def __init__(
+            self,
+            directory: Union[str, Path],
+            url_prefix: Optional[str] = None,
+            max_workers: int = 1,
+            processes: bool = False) -> None:
+        """
+        Parameters
+        ----------
+        directory : Union[str, Path]
+            the directory the assets are written to
+        url_prefix : Optional[str]
+            the prefix of the returned references, e.g. the directory relative to
+            the HTML report. Defaults to the directory.
+        max_workers : int
+            the number of worker processes encoding the assets, if processes.
+            Default: 1
+        processes : bool
+            whether the assets are encoded in worker processes instead of a
+            thread. The encoders and values must be picklable then. Without
+            processes, all services encode in one shared thread, since encoders
+            using pyplot must not run at the same time.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.url_prefix = str(self.directory) if url_prefix is None else url_prefix
+        self._max_workers = max_workers
+        self._processes = processes
+        self._executor: Optional[Executor] = None
+        self._pending: Dict[Path, Future] = {}
+        self._lock = threading.Lock()
+        self.encoded = 0
+        """
+        encoded : int
+            The number of assets submitted for encoding.
+        """
+        self.reused = 0
+        """
+        reused : int
+            The number of submissions which reused an existing asset.
+        """
+        _services.append(self)
+
+    def _get_executor(self) -> Executor:
+        if not self._processes:
+            return _shared_thread_executor()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def submit(self, value: Any, suffix: str, encode: Encoder, name: str = '') -> str:
+        """
+        Returns the reference to the asset of value and encodes it in the background
+        if it does not exist yet.
+
+        Parameters
+        ----------
+        value : Any
+            the content to encode, e.g. an image as an array
+        suffix : str
+            the file extension of the asset, e.g. '.png'
+        encode : Encoder
+            writes the value to a path, called as encode(path, value)
+        name : str
+            distinguishes different visualizations of the same value, e.g.
+            'spectrogram' and 'waveform'. Also the prefix of the file name.
+
+        Returns
+        -------
+        reference : str
+            the URL prefix followed by the file name of the asset
+        """
+        encoder = (
+            f"{getattr(encode, '__module__', '')}.{getattr(encode, '__qualname__', encode)}"
+        )
+        digest = value_fingerprint((name, encoder, suffix, value_fingerprint(value)))
+        file_name = f"{name}{'_' if name else ''}{digest}{suffix}"
+        path = self.directory / file_name
+        with self._lock:
+            if path in self._pending or path.exists():
+                self.reused += 1
+            else:
+                if isinstance(value, np.ndarray) and not self._processes:
+                    value = value.copy()  # the caller may change it while it is encoded
+                future = self._get_executor().submit(_encode, encode, path, value)
+                future.add_done_callback(self._log_error)
+                self._pending[path] = future
+                self.encoded += 1
+        return f"{self.url_prefix}/{file_name}"
+
+    @staticmethod
+    def _log_error(future: Future) -> None:
+        if future.exception() is not None:
+            logger.error("Failed to encode a visualization: %s", future.exception())
+
+    def wait(self) -> None:
+        """
+        Blocks until all submitted assets are written. Errors of encoders are
+        logged, not raised.
+        """
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            future.exception()
+
+    def shutdown(self) -> None:
+        """Writes all submitted assets and stops the worker processes."""
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def wait_all() -> None:
+    """Blocks until the assets submitted to all visualization services are written."""
+    for service in _services:
+        service.wait()
@@ -0,0 +1,299 @@
+"""
+A long-lived runner which imports the test modules once, e.g. with their models
+and datasets, and runs pytest in processes forked from it.
+
+Start it with ``python -m metamorphic_test.warm serve --address SOCKET PATH...``
+and run tests with ``python -m metamorphic_test.warm run --address SOCKET --
+PYTEST_ARGS...``. Every run is a fresh pytest session in its own process, which
+shares the memory of the imported modules with the runner copy-on-write, so runs
+are isolated from each other but skip the imports. The output of a run is sent
+back to the client which requested it.
+
+Only the user running the runner can connect: the socket is created with the
+permissions 0600, and clients authenticate with a key the runner writes to
+SOCKET.key, also with the permissions 0600.
+"""
+import argparse
+import importlib
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+import os
+from pathlib import Path
+import random
+import signal
+import sys
+import threading
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pytest
+
+from . import rng
+from .logger import logger
+
+TEST_FILE_PATTERNS = ('conftest.py', 'test_*.py', '*_test.py')
+"""The files imported by the runner, as pytest collects them by default."""
+
+
+def _module_name(path: Path) -> Tuple[Path, str]:
+    # like pytest's default "prepend" import mode: the module is named by its
+    # packages, and the directory above the top package is put on sys.path
+    parts = [path.stem]
+    directory = path.parent
+    while (directory / '__init__.py').exists():
+        parts.insert(0, directory.name)
+        directory = directory.parent
+    return directory, '.'.join(parts)
+
+
+def import_tests(paths: Iterable[Union[str, Path]]) -> List[str]:
+    """
+    Imports the test modules and conftest files in paths, directories or files.
+    Modules which fail to import are logged and skipped, pytest reports them when
+    it collects them.
+
+    Returns
+    -------
+    modules : List[str]
+        the names of the imported modules
+    """
+    files: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files += {f for pattern in TEST_FILE_PATTERNS for f in path.rglob(pattern)}
+        else:
+            files.append(path)
+    # conftest files first, outer ones before inner ones, as pytest imports them
+    files.sort(key=lambda f: (f.name != 'conftest.py', len(f.parts), str(f)))
+    modules = []
+    for file in files:
+        directory, name = _module_name(file.resolve())
+        if str(directory) not in sys.path:
+            sys.path.insert(0, str(directory))
+        try:
+            importlib.import_module(name)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("Failed to import %s: %s", file, e)
+            continue
+        modules.append(name)
+    return modules
+
+
+def _reseed() -> None:
+    # a forked process inherits the random state of the runner, so that every run
+    # would draw the same values. Draw new seeds like a new interpreter does, the
+    # plugin still sets --metamorphic-seed when it is given.
+    rng.set_seed(random.SystemRandom().getrandbits(64))
+    random.seed()
+    np.random.seed()
+
+
+def _run_pytest(args: Sequence[str], cwd: Optional[str] = None) -> int:
+    if cwd is not None:
+        os.chdir(cwd)
+    return int(pytest.main(list(args)))
+
+
+def key_path(address: str) -> Path:
+    """Returns the path of the authentication key of the runner at address."""
+    return Path(f"{address}.key")
+
+
+def _write_key(address: str) -> bytes:
+    key = os.urandom(32)
+    path = key_path(address)
+    path.unlink(missing_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+
+def _forward_output(connection: Connection, args: Sequence[str], cwd: Optional[str]) -> int:
+    # runs pytest with its output, also that of subprocesses, sent to the client
+    read_fd, write_fd = os.pipe()
+    os.dup2(write_fd, 1)
+    os.dup2(write_fd, 2)
+    os.close(write_fd)
+
+    def forward() -> None:
+        with os.fdopen(read_fd, 'rb', buffering=0) as output:
+            for chunk in iter(lambda: output.read(65536), b''):
+                connection.send(('output', chunk))
+
+    forwarder = threading.Thread(target=forward)
+    forwarder.start()
+    code = 1
+    try:
+        code = _run_pytest(args, cwd)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.close(1)
+        os.close(2)
+        forwarder.join()
+        connection.send(('exit', code))
+    return code
+
+
+def _exit_code(status: int) -> int:
+    if os.WIFEXITED(status):
+        return os.WEXITSTATUS(status)
+    return -os.WTERMSIG(status)
+
+
+class WarmRunner:
+    """
+    Keeps the test modules of paths imported and runs pytest sessions in processes
+    forked from the current one.
+
+    The modules are only imported once: the metamorphic tests they register and
+    the models or data they load at import time are shared by all runs. Each run
+    is a separate process, so it neither sees nor changes the state of other runs.
+    Forking requires a POSIX system, elsewhere every run starts a new interpreter.
+
+    Examples
+    --------
+    runner = WarmRunner(['examples/image_classifier'])
+    runner.run(['examples/image_classifier', '-k', 'brightness'])
+    """
+
+    def __init__(self, paths: Iterable[Union[str, Path]]) -> None:
+        self.modules = import_tests(paths)
+        """
+        modules : List[str]
+            The names of the imported test modules.
+        """
+
+    def run(self, args: Sequence[str], cwd: Optional[str] = None) -> int:
+        """
+        Runs pytest with the command line arguments args in a forked process and
+        returns its exit code.
+        """
+        if not hasattr(os, 'fork'):
+            import subprocess  # nosec
+            return subprocess.call([sys.executable, '-m', 'pytest', *args], cwd=cwd)  # nosec
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                _reseed()
+                code = _run_pytest(args, cwd)
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)  # pylint: disable=protected-access
+        _, status = os.waitpid(pid, 0)
+        return _exit_code(status)
+
+    def serve(self, address: str) -> None:
+        """
+        Runs the requests of request_run on the Unix socket at address until
+        interrupted. Each request is run in a forked process, which sends the
+        output and the exit code back, so requests run at the same time.
+
+        The socket and the key clients authenticate with, see key_path, are only
+        accessible by the current user.
+        """
+        # stop on SIGTERM like on an interrupt, so that the socket is removed
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        authkey = _write_key(address)
+        umask = os.umask(0o177)
+        try:
+            listener = Listener(address, family='AF_UNIX', authkey=authkey)
+        finally:
+            os.umask(umask)
+        try:
+            with listener:
+                logger.info("Warm runner with %d modules listening on %s",
+                            len(self.modules), address)
+                while True:
+                    try:
+                        connection = listener.accept()
+                    except (AuthenticationError, EOFError, OSError) as e:
+                        logger.warning("Rejected a connection to %s: %s", address, e)
+                        continue
+                    with connection:
+                        self._fork_run(connection)
+                    self._reap()
+        finally:
+            key_path(address).unlink(missing_ok=True)
+
+    @staticmethod
+    def _fork_run(connection: Connection) -> None:
+        args, cwd = connection.recv()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 1
+            try:
+                _reseed()
+                code = _forward_output(connection, args, cwd)
+            finally:
+                os._exit(code)  # pylint: disable=protected-access
+
+    @staticmethod
+    def _reap() -> None:
+        try:
+            while os.waitpid(-1, os.WNOHANG)[0]:
+                pass
+        except ChildProcessError:
+            pass
+
+
+def request_run(address: str, args: Sequence[str]) -> int:
+    """
+    Runs pytest with the command line arguments args in the runner serving at
+    address and returns its exit code. The output of pytest is written to
+    sys.stdout while it runs. If no runner serves at address, pytest is run in the
+    current process instead.
+    """
+    try:
+        connection = Client(address, family='AF_UNIX', authkey=key_path(address).read_bytes())
+    except (OSError, AuthenticationError) as e:
+        logger.warning("No warm runner at %s (%s), running the tests here.", address, e)
+        return _run_pytest(args)
+    output = getattr(sys.stdout, 'buffer', None)
+    with connection:
+        connection.send((list(args), os.getcwd()))
+        try:
+            while True:
+                kind, value = connection.recv()
+                if kind == 'exit':
+                    return value
+                if output is None:
+                    sys.stdout.write(value.decode(errors='replace'))
+                else:
+                    output.write(value)
+                sys.stdout.flush()
+        except EOFError:
+            logger.error("The warm runner at %s failed to run the tests.", address)
+            return int(pytest.ExitCode.INTERNAL_ERROR)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help="import the test modules and serve runs")
+    serve.add_argument('--address', required=True, help="the path of the Unix socket")
+    serve.add_argument('paths', nargs='+', help="the test directories or files to import")
+    run = commands.add_parser('run', help="run pytest in a serving runner")
+    run.add_argument('--address', required=True, help="the path of the Unix socket")
+    run.add_argument('args', nargs=argparse.REMAINDER, help="the arguments of pytest")
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        try:
+            WarmRunner(args.paths).serve(args.address)
+        except KeyboardInterrupt:
+            pass
+    else:
+        pytest_args = args.args[1:] if args.args[:1] == ['--'] else args.args
+        sys.exit(request_run(args.address, pytest_args))
+
+
+if __name__ == '__main__':
+    main()
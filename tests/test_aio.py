@@ -0,0 +1,117 @@
+import asyncio
+import sys
+
+import pytest
+
+from metamorphic_test.aio import evaluate_async, is_async
+from metamorphic_test.decorator import fixed
+from metamorphic_test.metamorphic import MetamorphicTest
+
+
+async def async_double(x):
+    await asyncio.sleep(0)
+    return x * 2
+
+
+@fixed('n', 1)
+async def async_add(x, n):
+    return x + n
+
+
+def test_is_async():
+    assert is_async(async_double)
+    assert is_async(async_add), 'bindings of coroutine functions are asynchronous'
+    assert not is_async(abs)
+
+
+class ConcurrencyProbe:
+    """An asynchronous system recording the maximum number of concurrent calls."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    async def system(self, x):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return x
+
+
+def test_evaluate_async():
+    outputs = asyncio.run(evaluate_async(async_double, [(1,), (2,), (3,)]))
+    assert [output.output for output in outputs] == [2, 4, 6]
+
+
+@pytest.mark.parametrize('concurrency', [1, 3])
+def test_evaluate_async_concurrency(concurrency):
+    probe = ConcurrencyProbe()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run():
+        inputs = [(x,) for x in range(10)]
+        return await evaluate_async(probe.system, inputs, semaphore=semaphore)
+
+    asyncio.run(run())
+    assert probe.max_running == concurrency
+
+
+def test_execute_async():
+    meta_test = MetamorphicTest()
+    meta_test.add_transform(async_add)
+
+    async def relation(x, y):
+        return y == x + 2
+
+    meta_test.set_relation(relation)
+    meta_test.execute(async_double, 3)
+    assert meta_test.last_reports[0].output_y.output == 8
+
+
+def test_execute_async_source_and_follow_up_concurrently():
+    probe = ConcurrencyProbe()
+    meta_test = MetamorphicTest()
+    meta_test.add_transform(async_add)
+    meta_test.set_relation(lambda x, y: y == x + 1)
+    meta_test.execute(probe.system, 3, samples=4, concurrency=2)
+    assert probe.max_running == 2
+    assert all(report.holds for report in meta_test.last_reports)
+
+
+def test_execute_async_failure():
+    meta_test = MetamorphicTest(name='async')
+    meta_test.add_transform(async_add)
+    meta_test.set_relation(lambda x, y: x == y)
+    with pytest.raises(AssertionError):
+        meta_test.execute(async_double, 3)
+
+
+def test_execute_async_in_running_loop():
+    meta_test = MetamorphicTest()
+    meta_test.add_transform(async_add)
+    meta_test.set_relation(lambda x, y: y == x + 2)
+
+    async def notebook_cell():
+        # like a Jupyter cell or a pytest-asyncio test, which runs in an event loop
+        meta_test.execute(async_double, 3)
+
+    asyncio.run(notebook_cell())
+    assert meta_test.last_reports[0].holds
+
+
+def test_is_async_cached(monkeypatch):
+    calls = []
+    monkeypatch.setattr(sys.modules['metamorphic_test.metamorphic'], 'is_async',
+                        lambda function: calls.append(function) or is_async(function))
+    meta_test = MetamorphicTest()
+    meta_test.add_transform(lambda x: x)
+    meta_test.set_relation(lambda x, y: x == y)
+    meta_test.execute(abs, 1)
+    meta_test.execute(abs, 2)
+    assert len(calls) == 3, 'the system, the transform and the relation are inspected once'
+
+    meta_test.add_transform(async_add)
+    reports = meta_test.execute_batch(abs, [(1,)])
+    assert reports[0].output_y.output == 2, \
+        'a newly registered asynchronous transform should be awaited'
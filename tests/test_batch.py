@@ -0,0 +1,44 @@
+import pytest
+
+from metamorphic_test.batch import evaluate
+
+
+def add(x, y):
+    return x + y
+
+
+def add_batched(xs, ys):
+    return [x + y for x, y in zip(xs, ys)]
+
+
+def test_evaluate():
+    outputs = evaluate(add, [(1, 2), (3, 4)])
+    assert [o.output for o in outputs] == [3, 7]
+
+
+def test_evaluate_batched():
+    inputs = [(i, i) for i in range(5)]
+    outputs = evaluate(add_batched, inputs, batch_size=2)
+    assert [o.output for o in outputs] == [0, 2, 4, 6, 8]
+
+
+def test_evaluate_batched_error():
+    def system(xs, ys):
+        if 3 in xs:
+            raise ValueError
+        return add_batched(xs, ys)
+
+    outputs = evaluate(system, [(i, i) for i in range(4)], batch_size=2)
+    assert [o.output for o in outputs[:2]] == [0, 2]
+    assert all(isinstance(o.error, ValueError) for o in outputs[2:]), \
+        'an error of a batched call belongs to all inputs of the chunk'
+
+
+def test_evaluate_batched_wrong_length():
+    outputs = evaluate(lambda xs: [0], [(1,), (2,)], batch_size=2)
+    assert all(isinstance(o.error, ValueError) for o in outputs)
+
+
+def test_evaluate_invalid_batch_size():
+    with pytest.raises(ValueError):
+        evaluate(add, [(1, 2)], batch_size=0)
@@ -0,0 +1,86 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from metamorphic_test.binding import ParameterBinding, draw_parameters
+from metamorphic_test.decorator import fixed, randomized
+from metamorphic_test.generators import RandInt
+
+
+@randomized('n', RandInt(1, 1))
+@fixed('c', 2)
+def shift(x, n, c):
+    """Shifts x."""
+    return x + n * c
+
+
+def scale(x, factor):
+    return x * factor
+
+
+def test_binding_looks_like_transform():
+    assert isinstance(shift, ParameterBinding)
+    assert shift.__name__ == 'shift'
+    assert shift.__qualname__ == 'shift'
+    assert shift.__doc__ == 'Shifts x.'
+    assert shift(1) == 3
+
+
+def test_pickle_by_qualified_name():
+    assert pickle.loads(pickle.dumps(shift)) is shift
+
+
+def test_pickle_by_value():
+    binding = ParameterBinding(scale, fixed={'factor': 3})
+    # the binding is not a module attribute, it is rebuilt from its parts
+    copy = pickle.loads(pickle.dumps(binding))
+    assert copy is not binding
+    assert copy(2) == 6
+
+
+def test_binding_as_method():
+    class Shifter:
+        offset = 5
+
+        @fixed('n', 2)
+        def shift(self, x, n):
+            return x + n + self.offset
+
+    assert Shifter().shift(1) == 8
+
+
+def test_stacked_bindings_collapse():
+    assert shift.__wrapped__ is shift.transform
+    assert not isinstance(shift.transform, ParameterBinding)
+    assert shift.fixed == {'c': 2}
+    assert list(shift.randomized) == ['n']
+
+
+def test_inner_binding_wins():
+    binding = ParameterBinding(ParameterBinding(scale, fixed={'factor': 3}),
+                               fixed={'factor': 5})
+    assert binding(2) == 6
+
+
+def test_unknown_argument():
+    with pytest.raises(ValueError):
+        ParameterBinding(scale, fixed={'offset': 1})
+
+
+def test_drawn_values_recorded():
+    with draw_parameters() as drawn:
+        shift(0)
+    assert drawn == {'n': 1}
+    with draw_parameters({'n': 4}) as drawn:
+        assert shift(0) == 8
+    assert drawn == {'n': 4}
+
+
+def test_draw_batch():
+    binding = ParameterBinding(scale, randomized={'factor': RandInt(0, 100)})
+    first = binding.draw_batch(5, np.random.default_rng(1))
+    assert first == binding.draw_batch(5, np.random.default_rng(1))
+    assert len(first) == 5 and all(isinstance(v['factor'], int) for v in first)
+    with draw_parameters(first[0]):
+        assert binding(1) == first[0]['factor'], 'drawn values should be replayable'
@@ -0,0 +1,175 @@
+import numpy as np
+import pytest
+
+from metamorphic_test.cache import SourceOutputCache, TransformCache, input_key
+from metamorphic_test.generators import RandInt
+from metamorphic_test.suite import Suite
+
+
+def add(x, y):
+    return x + y
+
+
+def identity(x):
+    return x
+
+
+def test_input_key_hashable():
+    assert input_key((1, 'a')) == input_key((1, 'a'))
+    assert input_key((1,)) != input_key((1.0,)), \
+        'equal values of different types should not share a key'
+
+
+def test_input_key_content():
+    assert input_key((np.arange(3),)) == input_key((np.arange(3),)), \
+        'unhashable inputs are identified by their content'
+    assert input_key((np.arange(3),)) != input_key((np.arange(4),))
+
+
+def test_input_key_uncacheable():
+    assert input_key(([lambda: None],)) is None
+
+
+def test_lookup_store():
+    cache = SourceOutputCache()
+    key = cache.key(identity, (2,))
+    assert cache.lookup(key) == (False, None)
+    cache.store(key, 4)
+    assert cache.lookup(key) == (True, 4)
+    assert cache.lookup(cache.key(add, (2,))) == (False, None), \
+        'outputs of different systems should not be shared'
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_uncacheable_input():
+    cache = SourceOutputCache()
+    key = cache.key(identity, ([lambda: None],))
+    cache.store(key, 0)
+    assert key is None and len(cache) == 0
+    assert cache.lookup(key) == (False, None)
+
+
+def test_max_size():
+    cache = SourceOutputCache(max_size=2)
+    for x in range(3):
+        cache.store(cache.key(identity, (x,)), x)
+    assert len(cache) == 2
+    assert cache.lookup(cache.key(identity, (0,))) == (False, None), \
+        'the oldest output should have been evicted'
+
+
+def test_suite_shares_source_output():
+    suite = Suite()
+    calls = []
+
+    def system(x):
+        calls.append(x)
+        return x
+
+    for name in ('a', 'b', 'c'):
+        test_id = suite.metamorphic(name)
+        suite.add_transform(test_id, identity)
+        suite.set_relation(test_id, lambda x, y: x == y)
+        suite.execute(test_id, system, 7, cache_source=True)
+
+    # one source evaluation and three follow-up evaluations
+    assert calls == [7] * 4
+    assert suite.source_cache.hits == 2
+
+    suite.execute(test_id, system, 7)
+    assert calls == [7] * 6, 'the source output should only be shared on request'
+
+
+def test_cached_source_output_copied():
+    suite = Suite()
+
+    def double(x):
+        return 2 * x
+
+    def relation_in_place(x, y):
+        x += 1
+        return np.array_equal(x, y + 1)
+
+    first = suite.metamorphic('first')
+    second = suite.metamorphic('second')
+    for test_id in (first, second):
+        suite.add_transform(test_id, identity)
+        suite.set_relation(test_id, relation_in_place)
+
+    x = np.arange(3)
+    suite.execute(first, double, x, cache_source=True)
+    suite.execute(second, double, x, cache_source=True)
+    suite.execute(second, double, x, cache_source=True)
+    assert suite.source_cache.hits == 2
+    for test_id in (first, second):
+        assert all(report.holds for report in suite.tests[test_id].reports)
+
+
+def test_transform_cache_prefix():
+    cache = TransformCache()
+    assert cache.lookup((1,), [identity]) == []
+    cache.store((1,), [identity, abs], [1, 1])
+    assert cache.lookup((1,), [identity, abs, str]) == [1, 1]
+    assert cache.lookup((1,), [abs]) == [], 'only prefixes of a stored chain are cached'
+    assert cache.lookup((2,), [identity]) == []
+    assert cache.hits == 2
+
+
+def test_suite_shares_deterministic_transforms():
+    suite = Suite()
+    calls = []
+
+    def negate(x):
+        calls.append(x)
+        return -x
+
+    single = suite.metamorphic('single')
+    suite.add_transform(single, negate, deterministic=True)
+    suite.set_relation(single, lambda x, y: x == -y)
+    chained = suite.metamorphic('chained')
+    suite.add_transform(chained, negate, priority=1, deterministic=True)
+    suite.add_transform(chained, identity, deterministic=True)
+    suite.set_relation(chained, lambda x, y: x == -y)
+
+    suite.execute(single, identity, 3)
+    suite.execute(chained, identity, 3)
+    suite.execute(chained, identity, 3)
+    assert calls == [3], 'negate(3) should be computed once and reused by the chain'
+    report = suite.tests[chained].last_reports[0]
+    assert [r.output for r in report.transform_results] == [-3, -3]
+
+
+def test_cached_transform_results_copied():
+    suite = Suite()
+
+    def negate(x):
+        return -x
+
+    def increment_in_place(x):
+        x += 1
+        return x
+
+    single = suite.metamorphic('single')
+    suite.add_transform(single, negate, deterministic=True)
+    suite.set_relation(single, lambda x, y: np.array_equal(x, -y))
+    mutating = suite.metamorphic('mutating')
+    suite.add_transform(mutating, negate, priority=1, deterministic=True)
+    suite.add_transform(mutating, increment_in_place)
+    suite.set_relation(mutating, lambda x, y: np.array_equal(x, 1 - y))
+
+    x = np.arange(3)
+    suite.execute(single, identity, x)
+    suite.execute(mutating, identity, x)
+    suite.execute(mutating, identity, x)
+    suite.execute(single, identity, x)
+    assert suite.transform_cache.hits == 3
+    for test_id in (single, mutating):
+        assert all(report.holds for report in suite.tests[test_id].reports)
+
+
+def test_randomized_transform_not_deterministic():
+    suite = Suite()
+    test_id = suite.metamorphic('randomized')
+    transform = suite.randomized_generator(add, 'y', RandInt(0, 1))
+    with pytest.raises(ValueError):
+        suite.add_transform(test_id, transform, deterministic=True)
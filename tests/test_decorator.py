@@ -1,3 +1,5 @@
+import inspect
+
 from hypothesis import given
 from hypothesis.strategies import integers
 
@@ -14,6 +16,7 @@ from metamorphic_test.suite import Suite
 from metamorphic_test.metamorphic import MetamorphicTest
 from metamorphic_test.prioritized_transform import PrioritizedTransform
 from metamorphic_test.generator import MetamorphicGenerator
+from metamorphic_test.source import Dataset
 
 
 NAME = 'test'
@@ -112,3 +115,31 @@ def test_system(x):
     meta = metamorphic(NAME, transform=identity, relation=equal)
 
     system(meta)(identity)(module_namify(NAME), x)  # system already asserts
+
+
+def test_system_collapse():
+    d.suite = Suite()
+
+    meta = metamorphic(NAME, transform=identity, relation=equal)
+
+    test_function = system(meta, collapse=True)(identity)
+    mark, = test_function.pytestmark
+    assert mark.name == 'metamorphic'
+    assert mark.kwargs['names'] == (meta,)
+    assert list(inspect.signature(test_function).parameters) == ['x']
+
+    test_function(INT)  # system already asserts
+
+
+def test_system_source():
+    d.suite = Suite()
+
+    meta = metamorphic(NAME, transform=identity, relation=equal)
+
+    test_function = system(meta, source=Dataset([1, 2, 3], identity))(identity)
+    assert list(inspect.signature(test_function).parameters) == ['name', 'index']
+    assert [m.args for m in test_function.pytestmark if m.name == 'parametrize'] == [
+        ('index', range(3)), ('name', (meta,))
+    ]
+
+    test_function(meta, 2)  # system already asserts
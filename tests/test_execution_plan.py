@@ -0,0 +1,62 @@
+import numpy as np
+
+from metamorphic_test.execution_plan import ExecutionPlan
+from metamorphic_test.metamorphic import MetamorphicTest
+from metamorphic_test.prioritized_transform import PrioritizedTransform
+
+
+def t1(x):
+    return x
+
+
+def t2(x):
+    return x
+
+
+def t3(x):
+    return x
+
+
+def t4(x):
+    return x
+
+
+TRANSFORMS = [
+    PrioritizedTransform(t1, 0),
+    PrioritizedTransform(t3, 1),
+    PrioritizedTransform(t2, 0),
+    PrioritizedTransform(t4, 2),
+]
+
+
+def test_build():
+    plan = ExecutionPlan.build(TRANSFORMS)
+    assert [[tp.transform for tp in bucket] for bucket in plan.buckets] == \
+        [[t4], [t3], [t1, t2]]
+
+
+def test_order():
+    plan = ExecutionPlan.build(TRANSFORMS)
+    rng = np.random.default_rng(0)
+    orders = {tuple(tp.transform for tp in plan.order(rng)) for _ in range(50)}
+    assert orders == {(t4, t3, t1, t2), (t4, t3, t2, t1)}, \
+        'higher priority first, equal priority in random order'
+
+
+def test_plan_rebuilt_after_add_transform():
+    meta_test = MetamorphicTest()
+    meta_test.add_transform(t1)
+    plan = meta_test.plan
+    assert meta_test.plan is plan, 'the plan should be built once'
+    meta_test.add_transform(t2, 1)
+    assert [tp.transform for tp in meta_test.plan.order(np.random.default_rng())] == [t2, t1]
+
+
+def test_execute_does_not_reorder_transforms():
+    meta_test = MetamorphicTest()
+    for tp in TRANSFORMS:
+        meta_test.add_transform(tp.transform, tp.priority)
+    meta_test.set_relation(lambda x, y: x == y)
+    registered = list(meta_test.transforms)
+    meta_test.execute(abs, 1, samples=5)
+    assert meta_test.transforms == registered
@@ -0,0 +1,117 @@
+from concurrent.futures.process import BrokenProcessPool
+import os
+
+from metamorphic_test.executor import (
+    FollowUpTask,
+    ProcessPoolExecutor,
+    SerialExecutor,
+    follow_up,
+)
+
+
+def add_one(x):
+    return x + 1
+
+
+def double(x):
+    return x * 2
+
+
+def fail(x):
+    raise ValueError(x)
+
+
+def identity(x):
+    return x
+
+
+class Unpicklable:
+    """An input which cannot be sent to worker processes"""
+
+    def __reduce__(self):
+        raise TypeError('cannot pickle Unpicklable')
+
+    def __mul__(self, other):
+        return self
+
+
+def test_follow_up():
+    tasks = [
+        FollowUpTask([add_one, double], (1,)),
+        FollowUpTask([fail, double], (2,)),
+    ]
+    results = follow_up(double, tasks)
+    assert [r.output for r in results[0].transform_results] == [2, 4]
+    assert results[0].output_y.output == 8
+    assert isinstance(results[1].transform_results[0].error, ValueError)
+    assert not results[1].transform_results[1].is_set
+    assert results[1].output_y is None
+
+
+def test_serial_executor_batched():
+    tasks = [FollowUpTask([add_one], (x,)) for x in range(5)]
+    results = SerialExecutor().run(lambda xs: [x * 2 for x in xs], tasks, batch_size=2)
+    assert [r.output_y.output for r in results] == [2, 4, 6, 8, 10]
+
+
+def test_process_pool_executor():
+    # double is not a registered system, it is looked up in this module
+    executor = ProcessPoolExecutor(max_workers=2)
+    try:
+        tasks = [FollowUpTask([add_one, double], (x,)) for x in range(10)]
+        results = executor.run(double, tasks)
+        assert [r.output_y.output for r in results] == [(x + 1) * 4 for x in range(10)], \
+            'results should be returned in the order of the tasks'
+    finally:
+        executor.shutdown()
+
+
+def test_process_pool_executor_fallback():
+    executor = ProcessPoolExecutor(max_workers=2)
+    tasks = [FollowUpTask([lambda x: x + 1], (x,)) for x in range(3)]
+    results = executor.run(double, tasks)
+    assert [r.output_y.output for r in results] == [2, 4, 6]
+    assert executor._pool is None, 'lambdas should run in the current process'
+
+
+def test_process_pool_executor_unpicklable_inputs():
+    executor = ProcessPoolExecutor(max_workers=2)
+    try:
+        tasks = [FollowUpTask([add_one], (x,)) for x in range(4)]
+        tasks.append(FollowUpTask([identity], (Unpicklable(),)))
+        results = executor.run(double, tasks)
+        assert [r.output_y.output for r in results[:4]] == [2, 4, 6, 8]
+        assert isinstance(results[4].output_y.output, Unpicklable), \
+            'inputs which cannot be pickled should run in the current process'
+        assert results[4].output_y.error is None
+    finally:
+        executor.shutdown()
+
+
+def test_process_pool_executor_picklable_cache():
+    executor = ProcessPoolExecutor(max_workers=2)
+    transforms = [lambda x: x, add_one]
+    assert not executor._can_send([FollowUpTask(transforms[:1], (1,))])
+    assert executor._can_send([FollowUpTask(transforms[1:], (1,))])
+    assert list(executor._picklable) == [
+        frozenset(transforms[:1]), frozenset(transforms[1:])
+    ], 'the cache should be keyed by the transformations, not by their ids'
+
+
+def crash(x):
+    if x < 0:
+        os._exit(1)
+    return x
+
+
+def test_process_pool_executor_crash():
+    executor = ProcessPoolExecutor(max_workers=2)
+    try:
+        results = executor.run(crash, [FollowUpTask([identity], (-1,))])
+        assert isinstance(results[0].output_y.error, BrokenProcessPool)
+        for _ in range(2):
+            results = executor.run(crash, [FollowUpTask([add_one], (x,)) for x in range(3)])
+            assert [r.output_y.output for r in results] == [1, 2, 3], \
+                'a crashed worker should not break later runs'
+    finally:
+        executor.shutdown()
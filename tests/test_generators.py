@@ -0,0 +1,59 @@
+import numpy as np
+
+from metamorphic_test.generator import MetamorphicGenerator
+from metamorphic_test.generators import RandFloat, RandInt
+from metamorphic_test.rng import current_rng, use_rng
+
+
+class Choice(MetamorphicGenerator[str]):
+    def generate(self) -> str:
+        return str(current_rng().choice(['a', 'b']))
+
+
+class Pair(MetamorphicGenerator[tuple]):
+    def generate(self) -> tuple:
+        return 1, 2
+
+
+def test_randint():
+    with use_rng(np.random.default_rng(0)):
+        values = [RandInt(-2, 2).generate() for _ in range(1000)]
+    assert all(isinstance(value, int) for value in values)
+    assert min(values) == -2 and max(values) == 2, 'both ends should be included'
+
+
+def test_randfloat():
+    with use_rng(np.random.default_rng(0)):
+        values = [RandFloat(0.5, 1.5).generate() for _ in range(1000)]
+    assert all(isinstance(value, float) and 0.5 <= value <= 1.5 for value in values)
+
+
+def test_reproducible():
+    with use_rng(np.random.default_rng(1)):
+        first = [RandInt(0, 100).generate() for _ in range(10)]
+    with use_rng(np.random.default_rng(1)):
+        assert [RandInt(0, 100).generate() for _ in range(10)] == first
+
+
+def test_randint_batch():
+    values = RandInt(-2, 2).generate_batch(1000, np.random.default_rng(0))
+    assert values.shape == (1000,)
+    assert values.min() == -2 and values.max() == 2, 'both ends should be included'
+
+
+def test_randfloat_batch():
+    with use_rng(np.random.default_rng(0)):
+        values = RandFloat(0.5, 1.5).generate_batch(1000)
+    assert values.shape == (1000,)
+    assert ((0.5 <= values) & (values <= 1.5)).all()
+
+
+def test_default_generate_batch():
+    first = Choice().generate_batch(5, np.random.default_rng(1))
+    assert first.shape == (5,)
+    assert set(first) <= {'a', 'b'}
+    assert (Choice().generate_batch(5, np.random.default_rng(1)) == first).all(), \
+        'the default implementation should draw from the given stream'
+    pairs = Pair().generate_batch(3)
+    assert pairs.shape == (3,) and pairs[0] == (1, 2), 'non-scalar values are kept whole'
+    assert Pair().generate_batch(0).shape == (0,)
@@ -1,6 +1,7 @@
 import pytest
 import inspect
 
+from metamorphic_test.benchmark import run
 from metamorphic_test.helper import change_signature
 
 
@@ -29,6 +30,16 @@ def test_change_signature_function():
     assert sig_to_tuple(function)[1:] == sig_to_tuple(prototype)
 
 
+def test_change_signature_without_name():
+    """The adapter keeps the arguments of the prototype only"""
+    @change_signature(prototype, with_name=False)
+    def function(*args):
+        return args
+
+    assert sig_to_tuple(function) == sig_to_tuple(prototype)
+    assert function(1, 2) == (1, 2)
+
+
 def test_change_signature_staticmethod():
     """Decorator was applied to a staticmethod"""
     class Class:
@@ -74,3 +85,23 @@ def test_change_signature_instancemethod_error():
     with pytest.raises(RuntimeError):
         c = Class()
         Class.function(c)
+
+
+def test_change_signature_passes_arguments_positionally():
+    """The adapter passes keyword arguments in the order of the signature"""
+    def system(x, y=3, *rest, z, **options):  # pylint: disable=unused-argument
+        pass
+
+    @change_signature(system)
+    def function(*args):
+        return args
+
+    assert function('a', 1, z=2) == ('a', 1, 3, 2)
+    assert function(z=2, y=1, x=0, name='a', w=4) == ('a', 0, 1, 2, 4)
+    assert function('a', 0, 1, 5, 6, z=2) == ('a', 0, 1, 5, 6, 2)
+
+
+def test_benchmark_runs():
+    timings = run(number=100)
+    assert set(timings) == {'direct call', 'change_signature adapter', 'Suite.execute'}
+    assert all(t > 0 for t in timings.values())
@@ -0,0 +1,41 @@
+import inspect
+from unittest.mock import patch
+
+from metamorphic_test.metamorphic import MetamorphicTest
+from metamorphic_test.report.html_generator import HTMLReportGenerator
+
+
+def negate(x):
+    return -x
+
+
+def equal(x, y):
+    return x == y
+
+
+def system(x):
+    return abs(x)
+
+
+def reports(n):
+    meta_test = MetamorphicTest()
+    meta_test.add_transform(negate)
+    meta_test.set_relation(equal)
+    return meta_test.execute_batch(system, [(x,) for x in range(n)])
+
+
+def test_assets_only_if_included():
+    report, = reports(1)
+    with_assets = HTMLReportGenerator(report).generate()
+    without = HTMLReportGenerator(report, include_js=False, include_css=False).generate()
+    assert '<script' in with_assets and '<style' in with_assets
+    assert '<script' not in without and '<style' not in without
+    assert with_assets == without + HTMLReportGenerator.inline_assets()
+
+
+def test_function_source_read_once():
+    generated = reports(3)
+    with patch('inspect.getsourcelines', wraps=inspect.getsourcelines) as mock:
+        tables = [HTMLReportGenerator(report).generate() for report in generated]
+    assert len(set(tables)) == 3
+    assert mock.call_count <= 3, 'each function should be rendered once'
@@ -0,0 +1,68 @@
+import json
+import sys
+
+import pytest
+
+from web_app.jobs import JobQueue
+
+
+def writer(stream, holds):
+    """Returns a command which writes a report stream, one report at a time."""
+    lines = [json.dumps({'function': 0, 'name': 'f'})] + [
+        json.dumps({'report': {'test': 't', 'node': 'n', 'sample': i, 'seed': i, 'holds': h}})
+        for i, h in enumerate(holds)
+    ]
+    script = (
+        "import sys, time\n"
+        f"with open({str(stream)!r}, 'w') as f:\n"
+        f"    for line in {lines!r}:\n"
+        "        f.write(line + '\\n'); f.flush(); time.sleep(0.05)\n"
+        f"sys.exit({int(not all(holds))})\n"
+    )
+    return [sys.executable, '-c', script]
+
+
+def test_job(tmp_path):
+    jobs = JobQueue(poll_interval=0.01)
+    stream = tmp_path / 'run.jsonl'
+    job = jobs.submit(writer(stream, [True, False, True]), stream)
+    assert jobs.get(job.id) is job
+    events = []
+    while not events or events[-1]['type'] != 'done':
+        events += job.wait_events(len(events), timeout=10)
+    assert [e['type'] for e in events] == ['status'] + ['report'] * 3 + ['done']
+    assert [e['holds'] for e in events[1:4]] == [True, False, True]
+    assert job.status == 'failed' and job.returncode == 1
+    assert job.wait_events(len(events), timeout=10) == [], 'a finished job has no new events'
+    jobs.shutdown()
+
+
+def test_job_queue(tmp_path):
+    jobs = JobQueue(workers=1, poll_interval=0.01, keep=1)
+    first = jobs.submit(writer(tmp_path / 'a.jsonl', [True] * 3), tmp_path / 'a.jsonl')
+    second = jobs.submit(writer(tmp_path / 'b.jsonl', [True]), tmp_path / 'b.jsonl')
+    assert second.status == 'queued', 'one worker should run one job at a time'
+    while not second.finished:
+        second.wait_events(len(second.events), timeout=10)
+    assert first.status == second.status == 'passed'
+    third = jobs.submit([sys.executable, '-c', ''], tmp_path / 'c.jsonl')
+    assert jobs.get(first.id) is None, 'only the latest finished jobs should be kept'
+    assert not (tmp_path / 'a.jsonl').exists(), 'the stream of a dropped job is deleted'
+    assert jobs.get(third.id) is third
+    jobs.shutdown()
+
+
+def test_job_id(tmp_path):
+    jobs = JobQueue(poll_interval=0.01)
+    job_id = jobs.new_id()
+    stream = tmp_path / f'{job_id}.jsonl'
+    assert jobs.submit([sys.executable, '-c', ''], stream, job_id).id == job_id
+    with pytest.raises(ValueError):
+        jobs.submit([sys.executable, '-c', ''], stream, job_id)
+    assert jobs.new_id() != job_id
+    jobs.shutdown()
+
+
+def test_job_queue_workers():
+    with pytest.raises(ValueError):
+        JobQueue(workers=0)
@@ -1,5 +1,7 @@
 import pytest
 
+from metamorphic_test.binding import ParameterBinding
+from metamorphic_test.generators import RandInt
 from metamorphic_test.metamorphic import MetamorphicTest
 from metamorphic_test.prioritized_transform import PrioritizedTransform
 
@@ -126,3 +128,102 @@ def test_execute_transform_raises():
     # a metamorphic test fails and propagates any exceptions of the transforms
     with pytest.raises(ValueError):
         meta_test.execute(lambda x: x, 42)
+
+
+# 'execute_batch':
+#   * one report per input, failures are recorded instead of raised
+#   * a batched system is called once per chunk
+def test_execute_batch():
+    meta_test = MetamorphicTest()
+    meta_test.set_relation(lambda x, y: y == 2 * x)
+    meta_test.add_transform(double)
+
+    def system(x):
+        if x == 0:
+            raise ValueError
+        return x
+
+    reports = meta_test.execute_batch(system, [(1,), (0,), (3,)])
+
+    assert [r.input_x for r in reports] == [1, 0, 3]
+    assert reports[0].holds and reports[2].holds
+    assert isinstance(reports[1].error, ValueError)
+    assert meta_test.reports == reports
+
+
+def test_execute_batched_system():
+    meta_test = MetamorphicTest()
+    meta_test.set_relation(lambda x, y: y == -x)
+    meta_test.add_transform(lambda x: -x)
+    calls = []
+
+    def system(xs):
+        calls.append(list(xs))
+        return [x * 10 for x in xs]
+
+    reports = meta_test.execute_batch(system, [(x,) for x in range(5)], batch_size=4)
+
+    assert all(r.holds for r in reports)
+    assert calls == [[0, 1, 2, 3], [4], [0, -1, -2, -3], [-4]], \
+        'source and follow-up inputs should be evaluated in chunks of the batch size'
+
+    meta_test.execute(system, 7, batch_size=4)  # execute already asserts
+
+
+# 'samples':
+#   * one source evaluation, one follow-up evaluation per sample
+#   * a single failing sample fails the execution
+def test_execute_samples():
+    meta_test = MetamorphicTest(samples=4)
+    meta_test.set_relation(equal)
+    shifts = iter(range(4))
+    meta_test.add_transform(lambda x: x + 0 * next(shifts))
+    calls = []
+
+    def system(x):
+        calls.append(x)
+        return x
+
+    meta_test.execute(system, 1)  # execute already asserts
+
+    assert calls == [1] * 5
+    assert [r.sample for r in meta_test.last_reports] == [0, 1, 2, 3]
+    assert all(r.output_x is meta_test.last_reports[0].output_x
+               for r in meta_test.last_reports), \
+        'all samples should share the source output'
+
+
+def test_execute_samples_failure():
+    meta_test = MetamorphicTest()
+    meta_test.set_relation(lambda x, y: y != 2)
+    ys = iter(range(5))
+    meta_test.add_transform(lambda _: next(ys))
+
+    with pytest.raises(AssertionError, match='1 of 5 samples'):
+        meta_test.execute(lambda x: x, 0, samples=5)
+    assert len(meta_test.reports) == 5
+
+
+class CountingRandInt(RandInt):
+    """Counts the calls of generate_batch"""
+    batches = []
+
+    def generate_batch(self, n, rng=None):
+        CountingRandInt.batches.append(n)
+        return super().generate_batch(n, rng)
+
+
+def test_execute_samples_draw_batch():
+    meta_test = MetamorphicTest(samples=8, test_id='shift')
+    meta_test.set_relation(lambda x, y: y >= x)
+    meta_test.add_transform(ParameterBinding(
+        lambda x, n: x + n, randomized={'n': CountingRandInt(0, 10 ** 6)}
+    ))
+    CountingRandInt.batches = []
+    first = meta_test.execute_batch(lambda x: x, [(0,), (1,)])
+    assert CountingRandInt.batches == [8, 8], \
+        'the arguments of all samples of an input should be drawn with one call'
+    assert len({r.parameters['<lambda>']['n'] for r in first}) == 16
+    alone = meta_test.execute_batch(lambda x: x, [(1,)], input_ids=[1])
+    assert [r.parameters for r in alone] == [r.parameters for r in first[8:]], \
+        'the drawn arguments should not depend on the other inputs of a batch'
@@ -0,0 +1,100 @@
+import subprocess
+import sys
+from pathlib import Path
+
+TEST_MODULE = """
+from metamorphic_test import metamorphic, system
+
+negate = metamorphic('negate', transform=lambda x: -x, relation=lambda x, y: x == y)
+
+
+@system(negate)
+def test_identity(x=1):
+    return x
+
+
+def test_unrelated():
+    pass
+"""
+
+
+def run_pytest(directory, *args):
+    return subprocess.run(
+        [sys.executable, '-m', 'pytest', '-p', 'metamorphic_test', '-q', *args],
+        cwd=directory, env={'PYTHONPATH': str(Path(__file__).parents[1])},
+        capture_output=True, check=False
+    )
+
+
+def test_record_kept_without_metamorphic_tests(tmp_path):
+    (tmp_path / 'test_module.py').write_text(TEST_MODULE)
+    record = tmp_path / 'replay.jsonl'
+
+    run_pytest(tmp_path, '--metamorphic-record', str(record))
+    recorded = record.read_text()
+    assert 'test_identity' in recorded
+
+    run_pytest(tmp_path, '--metamorphic-record', str(record), '-k', 'unrelated')
+    assert record.read_text() == recorded, \
+        'a session without metamorphic tests should keep the recorded executions'
+
+    run_pytest(tmp_path, '--metamorphic-record', str(record), '-k', 'missing')
+    assert record.read_text() == recorded
+
+    (tmp_path / 'test_module.py').write_text(TEST_MODULE.replace('return x', 'return 0'))
+    run_pytest(tmp_path, '--metamorphic-record', str(record))
+    assert record.read_text() == '', 'a passing metamorphic test should empty the record'
+
+
+def test_replay_fails_if_executions_are_missing(tmp_path):
+    module = TEST_MODULE.replace('@system(negate)', '@system(negate, samples=2)')
+    (tmp_path / 'test_module.py').write_text(module)
+    record = tmp_path / 'replay.jsonl'
+    run_pytest(tmp_path, '--metamorphic-record', str(record))
+    assert len(record.read_text().splitlines()) == 2
+
+    # the replayed execution of the first sample passes, the second one is missing
+    (tmp_path / 'test_module.py').write_text(TEST_MODULE.replace('return x', 'return 0'))
+    result = run_pytest(tmp_path, '--metamorphic-replay', str(record),
+                        '--metamorphic-record', str(tmp_path / 'again.jsonl'))
+    assert result.returncode != 0
+    assert b'1 recorded executions of test_module.py::test_identity' in result.stdout, \
+        'a replayed test should fail if a recorded execution did not run'
+
+
+PARAMETRIZED_MODULE = """
+import pytest
+from metamorphic_test import metamorphic, randomized, system
+from metamorphic_test.generators import RandInt
+
+
+@randomized('n', RandInt(0, 10 ** 6))
+def shift(x, y, n):
+    return x + n, y
+
+
+never = metamorphic('never', transform=shift, relation=lambda x, y: False)
+
+
+@pytest.mark.parametrize('y', [5, 6])
+@pytest.mark.parametrize('x', [1, 2, 3])
+@system(never)
+def test_sum(x, y):
+    return x + y
+"""
+
+
+def test_runner_draws_like_pytest(tmp_path):
+    (tmp_path / 'test_module.py').write_text(PARAMETRIZED_MODULE)
+    run_pytest(tmp_path, '--metamorphic-seed', '3',
+               '--metamorphic-record', str(tmp_path / 'pytest.jsonl'))
+    subprocess.run(
+        [sys.executable, '-m', 'metamorphic_test.runner', 'run', 'test_module.py',
+         '--seed', '3', '--record', str(tmp_path / 'runner.jsonl')],
+        cwd=tmp_path, env={'PYTHONPATH': str(Path(__file__).parents[1])},
+        capture_output=True, check=False
+    )
+    recorded = sorted((tmp_path / 'pytest.jsonl').read_text().splitlines())
+    assert len(recorded) == 6
+    assert sorted((tmp_path / 'runner.jsonl').read_text().splitlines()) == recorded, \
+        'the runner should key the inputs by their parameter set like pytest'
@@ -0,0 +1,105 @@
+from metamorphic_test.generators import RandInt
+from metamorphic_test.replay import Replay, ReplayEntry, replay_entries, write_entries
+from metamorphic_test.suite import Suite
+
+
+def shift(x, n):
+    return x + n
+
+
+def scale(x, factor):
+    return x * factor
+
+
+def identity(x):
+    return x
+
+
+def small(x, y):
+    return abs(y - x) < 50
+
+
+def make_suite(samples=4):
+    suite = Suite()
+    test_id = suite.metamorphic('shift', samples=samples)
+    suite.add_transform(test_id, suite.randomized_generator(shift, 'n', RandInt(0, 100)))
+    suite.add_transform(test_id, suite.randomized_generator(scale, 'factor', RandInt(1, 1)))
+    suite.set_relation(test_id, small)
+    return suite, test_id
+
+
+def test_drawn_parameters_recorded():
+    suite, test_id = make_suite()
+    for report in suite.execute_batch(test_id, identity, [(0,)]):
+        n = report.parameters['shift']['n']
+        assert report.parameters['scale'] == {'factor': 1}
+        assert report.output_y.output == n
+
+
+def test_replay_failed_executions_only(tmp_path):
+    suite, test_id = make_suite(samples=20)
+    reports = suite.execute_batch(test_id, identity, [(0,), (1,)])
+    failed = [r for r in reports if not r.holds]
+    assert failed, 'some of the drawn shifts should exceed the relation'
+    path = tmp_path / 'replay.jsonl'
+    write_entries(path, replay_entries('test_node', test_id, reports))
+
+    replay = Replay.load(path)
+    assert len(replay) == len(failed)
+    assert replay.nodeids() == {'test_node'}
+
+    suite.replay = replay
+    replayed = suite.execute_batch(test_id, identity, [(0,), (1,), (2,)])
+    assert [(r.input_x, r.sample) for r in replayed] == \
+        [(r.input_x, r.sample) for r in failed]
+    assert [r.output_y.output for r in replayed] == [r.output_y.output for r in failed]
+    assert [r.parameters for r in replayed] == [r.parameters for r in failed]
+
+
+def test_replay_recorded_values_and_order():
+    suite, test_id = make_suite(samples=1)
+    report, = suite.execute_batch(test_id, identity, [(1,)])
+    entry = ReplayEntry(
+        'test_node', test_id, report.seed, report.stream_key,
+        transforms=['scale', 'shift'],
+        parameters={'shift': {'n': 7}, 'scale': {'factor': 3}},
+    )
+
+    suite.replay = Replay([entry])
+    replayed, = suite.execute_batch(test_id, identity, [(1,)])
+    assert [t.get_name() for t in replayed.transforms] == ['scale', 'shift']
+    assert replayed.output_y.output == 1 * 3 + 7
+    assert replayed.parameters == entry.parameters
+
+
+def test_unmatched_entries():
+    suite, test_id = make_suite(samples=1)
+    report, = suite.execute_batch(test_id, identity, [(1,)])
+    entries = [
+        ReplayEntry('test_node', test_id, report.seed, report.stream_key),
+        ReplayEntry('other_node', test_id, report.seed, (0, 0, 0)),
+    ]
+    suite.replay = Replay(entries)
+    assert suite.replay.unmatched('test_node') == entries[:1]
+    suite.execute_batch(test_id, identity, [(1,)])
+    assert suite.replay.unmatched() == entries[1:], \
+        'entries should be matched by the executions which replay them'
+
+
+def test_same_named_transforms_recorded_apart(tmp_path):
+    suite = Suite()
+    test_id = suite.metamorphic('twice', samples=4)
+    suite.add_transform(test_id, suite.randomized_generator(shift, 'n', RandInt(0, 100)))
+    suite.add_transform(test_id, suite.randomized_generator(shift, 'n', RandInt(0, 100)))
+    suite.set_relation(test_id, lambda x, y: False)
+    reports = suite.execute_batch(test_id, identity, [(0,)])
+    assert sorted(p.key for p in reports[0].transforms) == ['shift', 'shift#2']
+    for report in reports:
+        assert report.output_y.output == \
+            report.parameters['shift']['n'] + report.parameters['shift#2']['n']
+
+    path = tmp_path / 'replay.jsonl'
+    write_entries(path, replay_entries('test_node', test_id, reports))
+    suite.replay = Replay.load(path)
+    replayed = suite.execute_batch(test_id, identity, [(0,)])
+    assert [r.parameters for r in replayed] == [r.parameters for r in reports]
@@ -0,0 +1,138 @@
+from metamorphic_test.decorator import randomized
+from metamorphic_test.executor import FollowUpTask, ProcessPoolExecutor, follow_up
+from metamorphic_test.generators import RandFloat, RandInt
+from metamorphic_test import rng
+from metamorphic_test.rng import (
+    current_rng, input_digest, stream, stream_key, use_input_index, use_rng
+)
+from metamorphic_test.suite import Suite
+
+
+def draw(x, n):
+    return x + n
+
+
+def identity(x):
+    return x
+
+
+@randomized('n', RandInt(0, 10 ** 6))
+def shift(x, n):
+    return x + n
+
+
+def test_stream_depends_on_key_only():
+    key = stream_key('test', 1, 0)
+    first = stream(key, seed=1).random()
+    assert first == stream(key, seed=1).random()
+    assert first != stream(key, seed=2).random()
+    assert first != stream(stream_key('test', 1, 1), seed=1).random()
+    assert first != stream(stream_key('test', 2, 0), seed=1).random()
+    assert first != stream(stream_key('other', 1, 0), seed=1).random()
+
+
+class Image:
+    """An unhashable input which counts how often it is pickled"""
+    pickled = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Image) and self.value == other.value
+
+    __hash__ = None
+
+    def __reduce__(self):
+        Image.pickled += 1
+        return Image, (self.value,)
+
+
+def test_input_pickled_once_per_execution():
+    suite = Suite()
+    test_id = suite.metamorphic('shift', samples=3)
+    suite.add_transform(test_id, lambda x: Image(x.value), deterministic=True)
+    suite.add_transform(test_id, suite.randomized_generator(
+        lambda x, n: Image(x.value + n), 'n', RandInt(0, 10)))
+    suite.set_relation(test_id, lambda x, y: True)
+    Image.pickled = 0
+    suite.execute(test_id, lambda x: x.value, Image(1))
+    assert Image.pickled == 1, \
+        'the random streams and the caches should share one digest of the input'
+
+
+def test_input_not_pickled_without_caches():
+    suite = Suite()
+    test_id = suite.metamorphic('shift', samples=3)
+    suite.add_transform(test_id, suite.randomized_generator(
+        lambda x, n: Image(x.value + n), 'n', RandInt(0, 10)))
+    suite.set_relation(test_id, lambda x, y: True)
+    Image.pickled = 0
+    suite.execute_batch(test_id, lambda x: x.value, [(Image(1),), (Image(2),)])
+    with use_input_index(5):
+        suite.execute(test_id, lambda x: x.value, Image(1))
+    assert Image.pickled == 0, 'inputs keyed by their index should not be pickled'
+
+
+def test_unpicklable_inputs_have_distinct_digests():
+    assert input_digest((lambda: 1,)) != input_digest((lambda: 2,))
+    assert input_digest(([lambda: 1],)) != input_digest(([lambda: 2],))
+
+
+def test_streams_created_on_first_draw(monkeypatch):
+    created = []
+    original = rng.stream
+    monkeypatch.setattr(rng, 'stream', lambda *args: created.append(args) or original(*args))
+    suite = Suite()
+    test_id = suite.metamorphic('negate', samples=2)
+    suite.add_transform(test_id, lambda x: -x)
+    suite.set_relation(test_id, lambda x, y: x == -y)
+    suite.execute(test_id, identity, 1)
+    assert not created, 'an execution which draws nothing should not create its stream'
+
+    suite.add_transform(test_id, identity)
+    suite.execute(test_id, identity, 1)
+    assert len(created) == 2, 'shuffling transforms of equal priority draws from the stream'
+
+
+def test_generators_draw_from_current_rng():
+    with use_rng(stream((1, 2, 3), seed=0)):
+        first = RandInt(0, 10 ** 6).generate(), RandFloat(0, 1).generate()
+    with use_rng(stream((1, 2, 3), seed=0)):
+        assert (RandInt(0, 10 ** 6).generate(), RandFloat(0, 1).generate()) == first
+    assert current_rng() is not None
+
+
+def execute(inputs):
+    # the inputs are keyed by their value, independent of their position
+    suite = Suite()
+    test_id = suite.metamorphic('shift', samples=3)
+    suite.add_transform(test_id, suite.randomized_generator(draw, 'n', RandInt(0, 10 ** 6)))
+    suite.add_transform(test_id, identity)
+    suite.set_relation(test_id, lambda x, y: True)
+    reports = suite.execute_batch(test_id, identity, [(x,) for x in inputs], input_ids=inputs)
+    return {
+        (r.input_x, r.sample): (r.output_y.output, [t.get_name() for t in r.transforms])
+        for r in reports
+    }
+
+
+def test_execution_independent_of_order(monkeypatch):
+    monkeypatch.setattr('metamorphic_test.rng._session_seed', 7)
+    forward = execute([1, 2, 3])
+    backward = execute([3, 2, 1])
+    assert forward == backward, 'each execution should draw from its own stream'
+    assert len({output for output, _ in forward.values()}) == 9
+
+
+def test_process_pool_reproducible():
+    def tasks():
+        return [FollowUpTask([shift], (0,), stream((0, 0, i), seed=3)) for i in range(4)]
+
+    executor = ProcessPoolExecutor(max_workers=2)
+    try:
+        in_pool = [r.output_y.output for r in executor.run(identity, tasks())]
+    finally:
+        executor.shutdown()
+    in_process = [r.output_y.output for r in follow_up(identity, tasks())]
+    assert in_pool == in_process, 'a stream should draw the same values in any process'
@@ -0,0 +1,135 @@
+import json
+import sys
+
+import pytest
+
+import metamorphic_test.decorator as d
+from metamorphic_test.runner import Runner, UnsupportedSystemError, system_inputs
+from metamorphic_test.replay import Replay
+from metamorphic_test.source import Dataset
+from metamorphic_test.suite import Suite
+
+TEST_MODULE = """
+import pytest
+from metamorphic_test import metamorphic, transformation, relation, system
+
+A = metamorphic('negate')
+B = metamorphic('shift', samples=2)
+
+
+@transformation(A)
+def negate(x):
+    return -x
+
+
+@transformation(B)
+def shift(x):
+    return x + 10
+
+
+@relation(A)
+def equal(x, y):
+    return x == y
+
+
+@relation(B)
+def greater(x, y):
+    return y > x
+
+
+@pytest.mark.parametrize('x', [1, -2, pytest.param(3, id='three'),
+                               pytest.param(4, marks=pytest.mark.skip)])
+@system(A, B)
+def test_abs(x):
+    return abs(x)
+
+
+@pytest.mark.parametrize('y', [0, 1])
+@pytest.mark.parametrize('x', [(1, 2)])
+@system(A)
+def test_pair(x, y, z=5):
+    return x[y] + z
+
+
+@system(A)
+def test_fixture(tmp_path):
+    return 0
+"""
+
+
+@pytest.fixture(scope='module')
+def registrations(tmp_path_factory):
+    # the metamorphic tests are registered in the global suite, once
+    path = tmp_path_factory.mktemp('runner') / 'test_runner_module.py'
+    path.write_text(TEST_MODULE)
+    yield Runner.load([str(path)])
+    sys.modules.pop('test_runner_module', None)
+
+
+def _report_nodes(path):
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    return [line['report']['node'].split('::')[-1] for line in lines if 'report' in line]
+
+
+def test_system_inputs(registrations):
+    abs_inputs, pair_inputs, fixture = registrations
+    assert system_inputs(abs_inputs) == [('1', (1,)), ('-2', (-2,)), ('three', (3,))]
+    assert system_inputs(pair_inputs) == [('x0-0', ((1, 2), 0, 5)), ('x0-1', ((1, 2), 1, 5))]
+    with pytest.raises(UnsupportedSystemError):
+        system_inputs(fixture)
+
+
+def test_run(registrations, tmp_path):
+    runner = Runner(chunk_size=2, stream=str(tmp_path / 'reports.jsonl'),
+                    record=str(tmp_path / 'failed.jsonl'))
+    result = runner.run(registrations)
+    # test_abs: 3 inputs for negate, 3 inputs with 2 samples for shift
+    # test_pair: 2 inputs for negate, which fails for both
+    assert result.executions == 3 + 6 + 2
+    assert result.failed == {'test_runner_module.negate': 2}
+    assert [node.split('::')[-1] for node in result.skipped] == ['test_fixture']
+    nodes = _report_nodes(tmp_path / 'reports.jsonl')
+    assert nodes[:6] == [
+        'test_abs[test_runner_module.negate-1]',
+        'test_abs[test_runner_module.negate--2]',
+        'test_abs[test_runner_module.shift-1]',
+        'test_abs[test_runner_module.shift-1]',
+        'test_abs[test_runner_module.shift--2]',
+        'test_abs[test_runner_module.shift--2]',
+    ], 'reports should be written per chunk with the node ids of pytest'
+    replay = Replay.load(tmp_path / 'failed.jsonl')
+    assert {nodeid.split('::')[-1] for nodeid in replay.nodeids()} == {
+        'test_pair[test_runner_module.negate-x0-0]',
+        'test_pair[test_runner_module.negate-x0-1]',
+    }
+
+
+def test_run_replay(registrations, tmp_path):
+    Runner(record=str(tmp_path / 'failed.jsonl')).run(registrations)
+    d.suite.replay = Replay.load(tmp_path / 'failed.jsonl')
+    try:
+        runner = Runner(stream=str(tmp_path / 'reports.jsonl'),
+                        tests=['test_runner_module.negate'])
+        result = runner.run(registrations)
+    finally:
+        d.suite.replay = None
+    assert result.executions == 2
+    assert _report_nodes(tmp_path / 'reports.jsonl') == [
+        'test_pair[test_runner_module.negate-x0-0]',
+        'test_pair[test_runner_module.negate-x0-1]',
+    ]
+
+
+def test_run_source(monkeypatch, tmp_path):
+    monkeypatch.setattr(d, 'suite', Suite())
+    test_id = d.metamorphic('negate', transform=lambda x: -x, relation=lambda x, y: x == -y)
+    d.system(test_id, source=Dataset([1, -2, 3], abs))(lambda x: x)
+    registration, = d.suite.module_systems[__name__]
+    assert system_inputs(registration)[1:] == [('1', (2,)), ('2', (3,))]
+
+    runner = Runner(chunk_size=2, stream=str(tmp_path / 'reports.jsonl'))
+    result = runner.run([registration])
+    assert result.executions == 3 and result.passed
+    assert _report_nodes(tmp_path / 'reports.jsonl') == [
+        f'<lambda>[{i}-{test_id}]' for i in range(3)
+    ], 'the index of a source input comes first, as in the pytest node id'
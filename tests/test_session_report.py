@@ -0,0 +1,88 @@
+import json
+import re
+
+from metamorphic_test.metamorphic import MetamorphicTest
+from metamorphic_test.report.json_generator import FunctionTable, JSONReportGenerator
+from metamorphic_test.report.session_report import SessionReportWriter, render_session_html
+from metamorphic_test.report.stream import ReportStream, read_stream
+
+
+def negate(x):
+    return -x
+
+
+def equal(x, y):
+    return x == y
+
+
+def system(x):
+    if x == 3:
+        raise ValueError('</script> in an error')
+    return abs(x)
+
+
+def reports(n):
+    meta_test = MetamorphicTest()
+    meta_test.add_transform(negate)
+    meta_test.set_relation(equal)
+    return meta_test.execute_batch(system, [(x,) for x in range(n)])
+
+
+def test_json_report():
+    report, = reports(1)
+    functions = FunctionTable()
+    data = JSONReportGenerator(report, functions, 'test', 'node').generate()
+    assert json.loads(json.dumps(data)) == data
+    assert data['holds'] and 'error' not in data
+    assert [functions.entries[data[key]]['name'] for key in ('system', 'relation')] \
+        == ['system', 'equal']
+    assert functions.entries[data['steps'][0][0]]['name'] == 'negate'
+    assert data['x'] == '0' and data['fy'] == '0'
+
+
+def test_json_report_error():
+    data = JSONReportGenerator(reports(4)[3]).generate()
+    assert not data['holds']
+    assert data['fx'] is None
+    assert 'ValueError' in data['error']['full']
+
+
+def test_session_report(tmp_path):
+    writer = SessionReportWriter(tmp_path / 'report.html')
+    writer.add(reports(5), 'mod.negate', 'test_node')
+    writer.add(reports(2), 'mod.negate', 'other_node', visualize_input=lambda x: f'<b>{x}</b>')
+    html = writer.write().read_text(encoding='utf-8')
+    assert html.count('<script type="text/javascript">') == 2, 'assets should be included once'
+    embedded = re.search(
+        r'<script type="application/json" id="metamorphic_data">(.*?)</script>', html, re.S
+    ).group(1)
+    data = json.loads(embedded)
+    assert len(data['rows']) == 7
+    assert len(data['functions']) == 3, 'each function should be stored once'
+    assert data['rows'][-1]['x'] == '<b>1</b>'
+
+
+def test_report_stream(tmp_path):
+    path = tmp_path / 'reports.jsonl'
+    stream = ReportStream(path)
+    stream.add(reports(2), 'mod.negate', 'test_node')
+    rows, functions = read_stream(path)  # readable while the stream is open
+    assert len(rows) == 2 and len(functions) == 3
+    stream.add(reports(3), 'mod.negate', 'other_node')
+    stream.close()
+    rows, functions = read_stream(path)
+    assert [row['node'] for row in rows] == ['test_node'] * 2 + ['other_node'] * 3
+    assert len(functions) == 3
+    assert stream.count == 5
+
+
+def test_report_stream_partial(tmp_path):
+    path = tmp_path / 'reports.jsonl'
+    stream = ReportStream(path)
+    stream.add(reports(2))
+    stream.close()
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('{"report": {"test": "crashed wh')  # a crash while writing
+    rows, functions = read_stream(path)
+    assert len(rows) == 2
+    assert 'metamorphic_data' in render_session_html(rows, functions)
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from metamorphic_test.source import Dataset, DataSource
+
+
+class CountingDataset:
+    """Records the indices read, like a dataset decoding files"""
+
+    def __init__(self, size):
+        self.size = size
+        self.reads = []
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        with self.lock:
+            self.reads.append(index)
+        return index * 10
+
+
+def test_dataset_loads_on_access():
+    loaded = []
+
+    def load(key):
+        loaded.append(key)
+        return key.upper()
+
+    dataset = Dataset(iter(['a', 'b', 'c']), load)
+    assert len(dataset) == 3 and not loaded
+    assert dataset[1] == 'B'
+    assert list(dataset[1:]) == ['B', 'C']
+    assert loaded == ['b', 'b', 'c']
+
+
+def test_data_source_prefetches():
+    dataset = CountingDataset(10)
+    source = DataSource(dataset, prefetch=2)
+    assert len(source) == 10 and not dataset.reads, 'nothing is read before an access'
+
+    assert source[0] == 0
+    assert source[0] == 0, 'the current item is kept'
+    assert source[1] == 10 and source[2] == 20
+    source.close()
+    assert dataset.reads.count(0) == 1
+    assert dataset.reads.count(1) == 1 and dataset.reads.count(2) == 1, \
+        'prefetched items should not be read again'
+    assert max(dataset.reads) <= 4, 'only the window after the current item is prefetched'
+
+
+def test_data_source_without_prefetch():
+    dataset = CountingDataset(3)
+    source = DataSource(dataset, prefetch=0)
+    assert [source[i] for i in (2, 0)] == [20, 0]
+    assert dataset.reads == [2, 0]
+
+
+def test_data_source_args():
+    assert DataSource(iter([1, 2]), prefetch=0).args(1) == (2,)
+    assert DataSource([(1, 'a'), (2, 'b')], arity=2, prefetch=0).args(1) == (2, 'b')
+
+
+@pytest.mark.parametrize('kwargs', [{'prefetch': -1}, {'workers': 0}])
+def test_data_source_error(kwargs):
+    with pytest.raises(ValueError):
+        DataSource([], **kwargs)
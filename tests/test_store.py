@@ -0,0 +1,61 @@
+from metamorphic_test.metamorphic import MetamorphicTest
+from metamorphic_test.report.store import ReportStore, RetentionPolicy
+
+
+def negate(x):
+    return -x
+
+
+def equal(x, y):
+    return x == y
+
+
+def execute(policy, inputs):
+    meta_test = MetamorphicTest(reports=ReportStore(policy))
+    meta_test.add_transform(negate)
+    meta_test.set_relation(equal)
+    meta_test.execute_batch(abs, [(x,) for x in inputs])
+    return meta_test.reports
+
+
+def test_keep_all():
+    reports = execute(RetentionPolicy(), range(5))
+    assert [r.input_x for r in reports] == list(range(5))
+
+
+def test_keep_last():
+    reports = execute(RetentionPolicy(keep_last=2), range(5))
+    assert [r.input_x for r in reports] == [3, 4]
+    assert reports.dropped == 3
+
+
+def test_keep_failures_only():
+    # abs(0) == abs(-0), while x != 0 fails for the identity system below
+    meta_test = MetamorphicTest(reports=ReportStore(RetentionPolicy(keep_failures_only=True)))
+    meta_test.add_transform(negate)
+    meta_test.set_relation(equal)
+    meta_test.execute_batch(lambda x: x, [(x,) for x in range(3)])
+    assert [r.input_x for r in meta_test.reports] == [1, 2]
+
+
+def test_spill_to(tmp_path):
+    reports = execute(RetentionPolicy(keep_last=1, spill_to=tmp_path), range(-2, 3))
+    assert len(reports) == 5
+    assert len(list(tmp_path.iterdir())) == 1
+    loaded = reports[0]
+    assert loaded.input_x == -2
+    assert loaded.output_x.output == 2 and loaded.output_y.output == 2
+    assert loaded.transforms[0].transform is negate
+    assert loaded.holds
+    assert [r.input_x for r in reports] == [-2, -1, 0, 1, 2]
+    reports.close()
+    assert not list(tmp_path.iterdir())
+    assert [r.input_x for r in reports] == [2], 'only reports in memory are left'
+
+
+def test_failures(tmp_path):
+    meta_test = MetamorphicTest(reports=ReportStore(RetentionPolicy(spill_to=tmp_path)))
+    meta_test.add_transform(negate)
+    meta_test.set_relation(equal)
+    meta_test.execute_batch(lambda x: x, [(x,) for x in range(3)])
+    assert [r.input_x for r in meta_test.reports.failures()] == [1, 2]
@@ -0,0 +1,73 @@
+import logging
+
+import numpy as np
+
+from metamorphic_test.logger import logger
+from metamorphic_test.generators import RandInt
+from metamorphic_test.metamorphic import MetamorphicTest
+from metamorphic_test.report.execution_report import SystemOutput
+from metamorphic_test.report.string_generator import (
+    StringReportGenerator, shorten, summarize
+)
+from metamorphic_test.suite import Suite
+
+
+class Unprintable:
+    """An output which fails the test if it is ever converted to a string."""
+    shape = (1000, 1000)
+    size = 10 ** 6
+
+    def __str__(self):
+        raise AssertionError('str() should not be called on large outputs')
+
+
+def test_summarize_array():
+    assert summarize(np.zeros((3, 32, 32), dtype=np.uint8)) == 'ndarray(3x32x32, uint8)'
+    assert summarize(np.arange(3)) == '[0 1 2]', 'small arrays show their values'
+
+
+def test_summarize_bounded():
+    assert summarize(Unprintable()) == 'Unprintable(1000x1000)'
+    assert len(summarize(list(range(10 ** 6)))) < 50
+    assert len(shorten('x' * 10 ** 6)) == 28
+
+
+def test_summarize_function_output():
+    output = SystemOutput()
+    assert summarize(output) == '(unset)'
+    output.error = ValueError('bad')
+    assert summarize(output) == 'error: bad'
+
+
+def test_log_is_lazy():
+    meta_test = MetamorphicTest()
+    meta_test.add_transform(lambda x: x)
+    meta_test.set_relation(lambda x, y: True)
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        # rendering the passing report would raise
+        meta_test.execute(lambda x: Unprintable(), 1)
+    finally:
+        logger.setLevel(level)
+
+
+def test_drawn_parameters_are_not_shortened():
+    def scale_brightness_of_the_image(x, brightness_factor, contrast_offset):
+        return x * brightness_factor + contrast_offset
+
+    suite = Suite()
+    test_id = suite.metamorphic('scale')
+    transform = suite.randomized_generator(
+        suite.randomized_generator(scale_brightness_of_the_image, 'brightness_factor',
+                                   RandInt(7, 7)),
+        'contrast_offset', RandInt(3, 3)
+    )
+    suite.add_transform(test_id, transform)
+    suite.set_relation(test_id, lambda x, y: True)
+    suite.execute(test_id, lambda x: x, 1)
+    report, = suite.get_test(test_id).last_reports
+    lines = StringReportGenerator(report).generate().splitlines()
+    assert lines[2].startswith('|   ')
+    assert 'brightness_factor=7' in lines[2] and 'contrast_offset=3' in lines[2], \
+        'the drawn parameters should be shown in full'
@@ -4,7 +4,7 @@ from unittest.mock import Mock, patch
 from hypothesis import given
 import hypothesis.strategies as st
 
-from metamorphic_test.suite import Suite
+from metamorphic_test.suite import MetamorphicTestsFailed, Suite
 from metamorphic_test.metamorphic import MetamorphicTest
 from metamorphic_test.transform import Transform
 
@@ -40,6 +40,13 @@ def test_get_test_id(current_module_name):
     assert f"{current_module_name}.{NAME}" in str(test_id)
 
 
+def test_get_test_id_own_module_only(current_module_name):
+    suite = Suite()
+    suite.module_tests[f"{current_module_name}_other"] = ['other']
+    suite.metamorphic(NAME)
+    assert suite.get_test_id() == (f"{current_module_name}.{NAME}",)
+
+
 def test_get_caller_module(current_module_name):
     suite = Suite()
     assert isinstance(suite.get_caller_module(), str)
@@ -48,7 +55,7 @@ def test_get_caller_module(current_module_name):
 
 def test_get_caller_module_error():
     suite = Suite()
-    with patch('inspect.stack', lambda: []):
+    with patch('metamorphic_test.suite._caller_frames', lambda: iter(())):
         with pytest.raises(ValueError):
             suite.get_caller_module()
 
@@ -142,3 +149,32 @@ def test_execute(args):
 
     suite.execute = Mock(return_value=None)
     assert suite.execute(test_id, system, args) is None
+
+
+def test_execute_collapsed():
+    suite = Suite()
+    calls = []
+
+    def system(x):
+        calls.append(x)
+        return abs(x)
+
+    negate = suite.metamorphic('negate')
+    suite.add_transform(negate, lambda x: -x)
+    suite.set_relation(negate, lambda x, y: x == y)
+    double = suite.metamorphic('double')
+    suite.add_transform(double, lambda x: 2 * x)
+    suite.set_relation(double, lambda x, y: x == y)
+    wrong = suite.metamorphic('wrong')
+    suite.add_transform(wrong, lambda x: x + 1)
+    suite.set_relation(wrong, lambda x, y: x == y)
+
+    suite.execute_collapsed([negate], system, 3)
+
+    calls.clear()
+    with pytest.raises(MetamorphicTestsFailed) as info:
+        suite.execute_collapsed([negate, double, wrong], system, 5, cache_source=True)
+    # every test was executed, the source output was computed once
+    assert sorted(calls) == [-5, 5, 6, 10]
+    assert set(info.value.failures) == {double, wrong}
+    assert str(info.value).startswith("2 of 3 metamorphic tests failed:")
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import numpy as np
+
+from metamorphic_test.visualization import VisualizationService, value_fingerprint, wait_all
+
+
+def write_text(path, value):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(repr(value))
+
+
+def write_upper(path, value):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(repr(value).upper())
+
+
+def test_content_digest():
+    a = np.arange(6)
+    assert value_fingerprint(a) == value_fingerprint(np.arange(6))
+    assert value_fingerprint(a) != value_fingerprint(a.reshape(2, 3))
+    assert value_fingerprint(a) != value_fingerprint(a.astype(np.float32))
+    assert value_fingerprint('abc') == value_fingerprint('abc') != value_fingerprint('abd')
+
+
+def test_submit(tmp_path):
+    service = VisualizationService(tmp_path, url_prefix='../img')
+    first = service.submit(np.arange(3), '.txt', write_text)
+    assert first == service.submit(np.arange(3), '.txt', write_text)
+    assert first.startswith('../img/') and first.endswith('.txt')
+    other = service.submit(np.arange(3), '.txt', write_upper, name='upper')
+    assert other != first and '/upper_' in other
+    service.wait()
+    assert (service.encoded, service.reused) == (2, 1)
+    assert (tmp_path / first.split('/')[-1]).read_text() == repr(np.arange(3))
+    assert sorted(p.name for p in tmp_path.iterdir()) \
+        == sorted(ref.split('/')[-1] for ref in (first, other))
+
+
+def test_submit_existing(tmp_path):
+    VisualizationService(tmp_path).submit('x', '.txt', write_text)
+    wait_all()
+    service = VisualizationService(tmp_path)
+    service.submit('x', '.txt', write_text)
+    assert (service.encoded, service.reused) == (0, 1), 'assets of earlier runs are kept'
+
+
+def test_submit_does_not_block(tmp_path):
+    release = threading.Event()
+
+    def slow(path, value):
+        release.wait(5)
+        write_text(path, value)
+
+    service = VisualizationService(tmp_path)
+    image = np.zeros(3)
+    reference = service.submit(image, '.txt', slow)
+    image[:] = 1  # changes after submit() are not encoded
+    assert not any(tmp_path.iterdir()), 'the encoding should not have finished'
+    release.set()
+    service.shutdown()
+    assert (tmp_path / reference.split('/')[-1]).read_text() == repr(np.zeros(3))
+
+
+def test_failed_encoding(tmp_path):
+    def fail(path, value):
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('partial')
+        raise OSError('disk full')
+
+    service = VisualizationService(tmp_path)
+    service.submit('x', '.txt', fail)
+    service.wait()
+    assert not any(tmp_path.iterdir()), 'a failed encoding should leave no asset'
+
+
+def test_services_encode_one_at_a_time(tmp_path):
+    lock = threading.Lock()
+    active, overlaps = [], []
+
+    def exclusive(path, value):
+        with lock:
+            active.append(value)
+            overlaps.append(len(active))
+        time.sleep(0.01)
+        write_text(path, value)
+        with lock:
+            active.remove(value)
+
+    services = [VisualizationService(tmp_path / name) for name in 'ab']
+    for i in range(5):
+        for service in services:
+            service.submit(i, '.txt', exclusive, name=str(id(service)))
+    wait_all()
+    assert len(overlaps) == 10
+    assert max(overlaps) == 1, 'encoders such as pyplot should not run at the same time'
@@ -0,0 +1,97 @@
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+import os
+import stat
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from metamorphic_test.warm import WarmRunner, import_tests, key_path, request_run
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires os.fork")
+
+TEST_MODULE = """
+import os
+from metamorphic_test.rng import get_seed
+with open({log!r}, 'a') as f:
+    f.write(str(os.getpid()) + '\\n')
+
+def test_one():
+    with open({seeds!r}, 'a') as f:
+        f.write(str(get_seed()) + '\\n')
+
+def test_two():
+    pass
+"""
+
+
+@pytest.fixture
+def tests_dir(tmp_path):
+    package = tmp_path / 'warm_package'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'test_loaded.py').write_text(TEST_MODULE.format(
+        log=str(tmp_path / 'imports'), seeds=str(tmp_path / 'seeds')
+    ))
+    yield package
+    sys.modules.pop('warm_package.test_loaded', None)
+    sys.modules.pop('warm_package', None)
+
+
+def imports(tests_dir):
+    return (tests_dir.parent / 'imports').read_text().split()
+
+
+def test_import_tests(tests_dir):
+    assert import_tests([tests_dir]) == ['warm_package.test_loaded']
+    assert import_tests([tests_dir / 'test_loaded.py']) == ['warm_package.test_loaded']
+    assert imports(tests_dir) == [str(os.getpid())], 'modules should be imported once'
+
+
+def test_run(tests_dir):
+    runner = WarmRunner([tests_dir])
+    args = [str(tests_dir), '-q', '-p', 'no:cacheprovider']
+    assert runner.run(args) == 0
+    assert runner.run(args + ['-k', 'missing']) == pytest.ExitCode.NO_TESTS_COLLECTED
+    assert imports(tests_dir) == [str(os.getpid())], 'runs should reuse the imported modules'
+
+
+def test_run_reseeds(tests_dir):
+    runner = WarmRunner([tests_dir])
+    args = [str(tests_dir), '-q', '-p', 'no:cacheprovider', '-k', 'one']
+    assert runner.run(args) == 0
+    assert runner.run(args) == 0
+    seeds = (tests_dir.parent / 'seeds').read_text().split()
+    assert len(seeds) == 2 and seeds[0] != seeds[1], 'every run should draw a new seed'
+
+
+def test_serve(tests_dir, capsys):
+    address = str(tests_dir.parent / 'runner.sock')
+    env = {**os.environ, 'PYTHONPATH': str(Path(__file__).parents[1])}
+    runner = subprocess.Popen(
+        [sys.executable, '-m', 'metamorphic_test.warm', 'serve', '--address', address,
+         str(tests_dir)], env=env
+    )
+    try:
+        for _ in range(100):
+            if os.path.exists(address):
+                break
+            time.sleep(0.1)
+        assert stat.S_IMODE(os.stat(address).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(key_path(address)).st_mode) == 0o600
+        with pytest.raises(AuthenticationError):
+            Client(address, family='AF_UNIX', authkey=b'guessed')
+
+        args = [str(tests_dir), '-q', '-p', 'no:cacheprovider']
+        assert request_run(address, args) == 0
+        assert '2 passed' in capsys.readouterr().out, 'the output should reach the client'
+        assert request_run(address, args + ['-k', 'one']) == 0
+        assert imports(tests_dir) == [str(runner.pid)]
+    finally:
+        runner.terminate()
+        runner.wait(10)
+    assert not os.path.exists(address), 'the socket should be removed on termination'
+    assert not key_path(address).exists()
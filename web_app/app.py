@@ -1,11 +1,38 @@
 from pathlib import Path
-from flask import Flask, render_template, request, send_from_directory
+from flask import (
+    Flask, Response, abort, jsonify, render_template, request, send_from_directory
+)
 from argparse import ArgumentParser
+import atexit
 import glob
+import json
 import os
+import subprocess  # nosec
+import sys
+import tempfile
+import threading
+from typing import Optional
+
+try:
+    from web_app.jobs import JobQueue
+except ImportError:  # run as a script, see README
+    from jobs import JobQueue  # type: ignore
 
 app = Flask(__name__)
 test_directory = "examples"  # can be changed by cmd args
+workers = 1  # can be changed by cmd args
+jobs: Optional[JobQueue] = None  # created on first use, see get_jobs
+jobs_lock = threading.Lock()
+pytest_command = [sys.executable, "-m", "pytest"]  # runs in the warm runner with --warm
+
+
+def get_jobs() -> JobQueue:
+    """Returns the queue of test runs, which is created with the workers on first use."""
+    global jobs
+    with jobs_lock:
+        if jobs is None:
+            jobs = JobQueue(workers=workers)
+        return jobs
 
 
 @app.route("/")
@@ -39,24 +66,83 @@ def run_test():
     dirs = glob.glob(f"{test_directory}/*/")
     report_name = request.form.get("report_name")
     selected_module = request.form.get("modules")
-    report_name = report_name.replace(".html", "") + ".html" if report_name \
+    report_name = Path(report_name).name.replace(".html", "") + ".html" if report_name \
         else f"report_{selected_module}_webapp.html"
 
+    job_id = None
     if not request.form.get('load_previous_report'):
-        command = f"poetry run pytest {test_directory}" if selected_module == "all" \
-            else f"poetry run pytest {test_directory}/{selected_module}"
-        command_args = f" --html=assets/reports/{report_name} --self-contained-html"
-        os.system(command + command_args)  # nosec
+        # the run is queued, its results are streamed by /jobs/<job_id>/events. The
+        # stream is named by the job, so jobs with the same report name do not share it
+        job_id = JobQueue.new_id()
+        stream = Path("assets/reports") / f"{Path(report_name).stem}-{job_id}.jsonl"
+        command = pytest_command + [
+            test_directory if selected_module == "all"
+            else f"{test_directory}/{selected_module}",
+            f"--html=assets/reports/{report_name}", "--self-contained-html",
+            f"--metamorphic-stream={stream}"]
+        get_jobs().submit(command, stream, job_id)
 
     return render_template(
         "index.html",
         report_file=f"reports/{report_name}",
+        job_id=job_id,
         module_list=["all"] + [d.split(os.sep)[-2] for d in dirs]
     )
 
 
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = get_jobs().get(job_id)
+    if job is None:
+        abort(404)
+    return jsonify(id=job.id, status=job.status, returncode=job.returncode,
+                   executions=sum(event["type"] == "report" for event in job.events))
+
+
+@app.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    """Streams the events of a job as server-sent events until it is done."""
+    job = get_jobs().get(job_id)
+    if job is None:
+        abort(404)
+    # a reconnecting EventSource continues after the last event it received
+    try:
+        start = int(request.headers.get("Last-Event-ID", -1)) + 1
+    except ValueError:
+        start = 0  # not sent by an EventSource, start from the first event
+
+    def stream():
+        index = start
+        while True:
+            events = job.wait_events(index, timeout=15)
+            if not events:
+                if job.finished:
+                    return
+                yield ": keep-alive\n\n"
+            for event in events:
+                yield f"id: {index}\ndata: {json.dumps(event)}\n\n"
+                index += 1
+
+    return Response(stream(), mimetype="text/event-stream",
+                    headers={"X-Accel-Buffering": "no"})
+
+
+def start_warm_runner() -> None:
+    """
+    Starts a runner which imports the tests, with their models, once and runs
+    pytest in processes forked from it.
+    """
+    global pytest_command
+    address = os.path.join(tempfile.gettempdir(), f"metamorphic-warm-{os.getpid()}.sock")
+    runner = subprocess.Popen([sys.executable, "-m", "metamorphic_test.warm",  # nosec
+                               "serve", "--address", address, test_directory])
+    atexit.register(runner.terminate)
+    pytest_command = [sys.executable, "-m", "metamorphic_test.warm",
+                      "run", "--address", address, "--"]
+
+
 def main():
-    global test_directory
+    global test_directory, workers
     # change directory
     if Path.cwd().name == "web_app":
         # we need to be in the root directory of the repository
@@ -75,11 +161,21 @@ def main():
     parser.add_argument("--port", "-p",
                         type=int, default=5000, help="port number where app needs to be run"
                         )
+    parser.add_argument("--workers", "-w",
+                        type=int, default=1, help="number of test runs at the same time"
+                        )
+    parser.add_argument("--warm",
+                        action="store_true",
+                        help="keep the tests and their models loaded between runs"
+                        )
     args = parser.parse_args()
     test_directory = args.test_directory
+    workers = args.workers
+    if args.warm:
+        start_warm_runner()
 
     # app trigger / start
-    app.run(port=args.port, debug=False)
+    app.run(port=args.port, debug=False, threaded=True)
 
 
 if __name__ == "__main__":
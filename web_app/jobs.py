@@ -0,0 +1,232 @@
+"""
+A queue of test runs in subprocesses, e.g. of the web app, whose results are
+published as events while the runs are in progress.
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import subprocess  # nosec
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Union
+import uuid
+
+from metamorphic_test.logger import logger
+
+QUEUED = 'queued'
+RUNNING = 'running'
+PASSED = 'passed'
+FAILED = 'failed'
+
+
+@dataclass
+class Job:
+    """
+    A test run. Its events are published as dicts with a 'type':
+
+    - 'status': the job started running, with the 'status'
+    - 'report': an execution finished, with its 'test', 'node', 'sample', 'seed',
+      'holds' and the short 'error' if any
+    - 'done': the run finished, with the final 'status' and 'returncode'
+    """
+    id: str
+    """
+    id : str
+        The id the job is looked up by.
+    """
+    command: List[str]
+    """
+    command : List[str]
+        The command running the tests, which writes the report stream.
+    """
+    stream: Path
+    """
+    stream : Path
+        The report stream written by the command, see --metamorphic-stream.
+    """
+    status: str = QUEUED
+    """
+    status : str
+        One of 'queued', 'running', 'passed' or 'failed'.
+    """
+    returncode: Optional[int] = None
+    """
+    returncode : Optional[int]
+        The exit code of the command once it finished.
+    """
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    """
+    events : List[Dict[str, Any]]
+        All events published so far, in order.
+    """
+    _changed: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (PASSED, FAILED)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Appends an event and wakes up the waiting followers."""
+        with self._changed:
+            self.events.append(event)
+            self._changed.notify_all()
+
+    def finish(self, returncode: int) -> None:
+        """Sets the final status and publishes the 'done' event."""
+        with self._changed:
+            self.returncode = returncode
+            self.status = PASSED if returncode == 0 else FAILED
+            self.publish({'type': 'done', 'status': self.status, 'returncode': returncode})
+
+    def wait_events(self, start: int, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the events from index start on, waiting up to timeout seconds for
+        new events if there are none. The list is empty on a timeout and once all
+        events of a finished job were returned.
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: len(self.events) > start or self.finished, timeout
+            )
+            return self.events[start:]
+
+
+class _StreamFollower:
+    """Reads the reports appended to a report stream since the last call."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._offset = 0
+
+    def read(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        with open(self.path, 'rb') as file:
+            file.seek(self._offset)
+            data = file.read()
+        complete = data[:data.rfind(b'\n') + 1]  # a line may still be written
+        self._offset += len(complete)
+        rows = []
+        for line in complete.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if 'report' in entry:
+                rows.append(entry['report'])
+        return rows
+
+
+def _report_event(row: Dict[str, Any]) -> Dict[str, Any]:
+    event = {'type': 'report', **{key: row.get(key) for key in
+                                  ('test', 'node', 'sample', 'seed', 'holds')}}
+    if row.get('error'):
+        event['error'] = row['error']['short']
+    return event
+
+
+class JobQueue:
+    """
+    Runs test commands in subprocesses, at most workers at a time. The others wait
+    in the queue.
+
+    While a command runs, the reports it appends to its report stream are
+    published as events of its job, e.g. to stream them to a browser.
+
+    Examples
+    --------
+    jobs = JobQueue(workers=2)
+    job = jobs.submit(['pytest', 'examples', '--metamorphic-stream', 'run.jsonl'],
+                      'run.jsonl')
+    for event in job.wait_events(0):
+        ...
+    """
+
+    def __init__(self, workers: int = 1, poll_interval: float = 0.5, keep: int = 100) -> None:
+        """
+        Parameters
+        ----------
+        workers : int
+            the number of commands run at the same time
+        poll_interval : float
+            the seconds between reads of the report stream of a running command
+        keep : int
+            the number of finished jobs which can still be looked up
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be positive, got {workers}.")
+        self.poll_interval = poll_interval
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='metamorphic-job'
+        )
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id() -> str:
+        """Returns a new job id, e.g. to name the report stream of a job by it."""
+        return uuid.uuid4().hex
+
+    def submit(
+            self,
+            command: Sequence[str],
+            stream: Union[str, Path],
+            job_id: Optional[str] = None) -> Job:
+        """
+        Queues a command which writes a report stream and returns its job.
+
+        The stream must not be written by other jobs, since it is followed from
+        its start. Name it by the job id, see new_id. The streams of the jobs
+        which are no longer kept are deleted.
+
+        Parameters
+        ----------
+        command : Sequence[str]
+            the command, run without a shell
+        stream : Union[str, Path]
+            the report stream the command writes
+        job_id : Optional[str]
+            the id of the job, from new_id. Default: a new id
+        """
+        job = Job(job_id or self.new_id(), list(command), Path(stream))
+        with self._lock:
+            if job.id in self._jobs:
+                raise ValueError(f"A job with the id {job.id} exists already.")
+            self._jobs[job.id] = job
+            finished = [j for j in self._jobs.values() if j.finished]
+            for old in finished[:max(0, len(finished) - self.keep)]:
+                del self._jobs[old.id]
+                old.stream.unlink(missing_ok=True)
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Returns the job with the given id, or None if it is unknown."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: Job) -> None:
+        job.status = RUNNING
+        job.publish({'type': 'status', 'status': RUNNING})
+        follower = _StreamFollower(job.stream)
+        try:
+            job.stream.unlink(missing_ok=True)  # not to publish the reports of an earlier run
+            process = subprocess.Popen(job.command)  # nosec
+            returncode = None
+            while returncode is None:
+                try:
+                    returncode = process.wait(self.poll_interval)
+                except subprocess.TimeoutExpired:
+                    pass
+                for row in follower.read():
+                    job.publish(_report_event(row))
+        except OSError as e:
+            logger.error("Failed to run job %s: %s", job.id, e)
+            returncode = -1
+        job.finish(returncode)
+
+    def shutdown(self) -> None:
+        """Waits for the queued jobs and stops the workers."""
+        self._executor.shutdown()